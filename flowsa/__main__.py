@@ -0,0 +1,96 @@
+# __main__.py (flowsa)
+# !/usr/bin/env python3
+# coding=utf-8
+"""
+Command line interface for batch FBA and FBS generation, installed as
+`flowsa` (or run with `python -m flowsa`)
+
+EX: flowsa backfill --workers 4 --sources USDA_CoA_Cropland
+EX: flowsa rebuild --stale
+EX: flowsa build Water_national_2015_m1 Employment_national_2015
+"""
+
+import argparse
+import sys
+
+
+def backfill(args):
+    """
+    Generate FBAs across sources and years, see backfill.py
+    :param args: list of str, command line arguments
+    """
+    from flowsa import backfill
+    backfill.main(**backfill.parse_args(args))
+
+
+def rebuild(args):
+    """
+    Regenerate datasets, see dependencies.rebuild_stale()
+    :param args: list of str, command line arguments
+    """
+    ap = argparse.ArgumentParser(prog='flowsa rebuild')
+    ap.add_argument("--stale", action='store_true', required=True,
+                    help="Regenerate the local FBAs and FBSs whose inputs "
+                         "changed since they were generated")
+    ap.add_argument("--dry_run", action='store_true',
+                    help="List the stale datasets without regenerating")
+    ap.add_argument("--include_untracked", action='store_true',
+                    help="Also regenerate datasets with no recorded "
+                         "dependencies")
+    kwargs = vars(ap.parse_args(args))
+    kwargs.pop('stale')
+
+    from flowsa import dependencies
+    stale = dependencies.rebuild_stale(**kwargs)
+    print('\n'.join(f'{name} {category}' for category, name in stale)
+          or 'No stale datasets')
+
+
+def build(args):
+    """
+    Generate several FBS methods, sharing their upstream datasets, see
+    buildplan.py
+    :param args: list of str, command line arguments
+    """
+    ap = argparse.ArgumentParser(prog='flowsa build')
+    ap.add_argument("methods", nargs='+', help="FBS methods to generate")
+    ap.add_argument("--share", choices=['memory', 'store'], default='memory',
+                    help="Hold shared datasets in memory, or only generate "
+                         "upstream FBSs once and load them from the store")
+    ap.add_argument("--regenerate_upstream", action='store_true',
+                    help="Regenerate upstream FBSs available locally")
+    ap.add_argument("-c", "--external_config_path",
+                    help="Path to method files outside flowsa")
+    ap.add_argument("--dry_run", action='store_true',
+                    help="List the datasets in the plan without generating")
+    kwargs = vars(ap.parse_args(args))
+
+    from flowsa import buildplan
+    plan = buildplan.build_plan(kwargs.pop('methods'),
+                                kwargs['external_config_path'])
+    if kwargs.pop('dry_run'):
+        for key in buildplan.plan_order(plan):
+            node = plan[key]
+            print(f'{key[1]} {key[0]}: {len(node["consumers"])} '
+                  f'consumer(s){" (requested)" if node["requested"] else ""}')
+        return
+    buildplan.run_plan(plan, **kwargs)
+
+
+COMMANDS = {'backfill': backfill, 'rebuild': rebuild, 'build': build}
+
+
+def main(args=None):
+    """
+    Run a flowsa command
+    :param args: list of str, command line arguments, defaults to sys.argv
+    """
+    args = sys.argv[1:] if args is None else args
+    if not args or args[0] not in COMMANDS:
+        print(f'usage: flowsa {{{",".join(COMMANDS)}}} ...')
+        sys.exit(2)
+    COMMANDS[args[0]](args[1:])
+
+
+if __name__ == '__main__':
+    main()
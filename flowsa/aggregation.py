@@ -0,0 +1,121 @@
+# aggregation.py (flowsa)
+# !/usr/bin/env python3
+# coding=utf-8
+"""
+Vectorized group kernels shared by the FlowBy aggregation functions.
+
+Group keys are factorized to integer ids once, and group sums and weighted
+means are computed with np.bincount over the ids, with no Python callbacks
+per group. Weighted means are sum(w * x) / sum(w), where rows with null x
+are excluded from both sums. Used by _FlowBy.aggregate_flowby(),
+flowbyfunctions.aggregator() and flowbyclean.weighted_average().
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _factorize(values, sort: bool = False) -> (np.ndarray, pd.Index):
+    """
+    Integer-encode values, with nulls as their own (last) code
+    :return: tuple, (codes, unique values)
+    """
+    codes, uniques = pd.factorize(values, sort=sort)
+    codes = np.where(codes < 0, len(uniques), codes)
+    return codes.astype(np.int64), pd.Index(uniques)
+
+
+def group_ids(
+        df: pd.DataFrame,
+        columns: list,
+        sort: bool = False
+) -> np.ndarray:
+    """
+    Integer group ids for the rows of df, one id per unique combination of
+    values in columns (nulls included, as with groupby(dropna=False))
+    :param df: df
+    :param columns: list, columns to group by
+    :param sort: bool, if True, ids are in the order of the sorted keys
+        (nulls last), as groupby() orders groups; otherwise in order of
+        first appearance
+    :return: array of int, ids 0 to n_groups - 1
+    """
+    ids = np.zeros(len(df), dtype=np.int64)
+    for column in columns:
+        codes, uniques = _factorize(df[column], sort=sort)
+        combined = ids * (len(uniques) + 1) + codes
+        if sort:
+            ids = np.unique(combined, return_inverse=True)[1]
+        else:
+            ids = pd.factorize(combined)[0]
+    return ids.astype(np.int64).reshape(-1)
+
+
+def weighted_aggregate(
+        df: pd.DataFrame,
+        by: list,
+        sums: list = None,
+        means: list = None,
+        weight: str = 'FlowAmount',
+        fill_value: float = np.nan
+) -> pd.DataFrame:
+    """
+    Equivalent of df.groupby(by, dropna=False) summing the sums columns and
+    taking the means columns as averages weighted by the weight column
+    :param df: df
+    :param by: list, columns to group by
+    :param sums: list, numeric columns to sum
+    :param means: list, numeric columns to average
+    :param weight: str, column of weights for means
+    :param fill_value: float, mean of groups where weights sum to 0
+    :return: df, one row per group sorted by the groupby columns, with
+        columns by, sums, means
+    """
+    sums = sums or []
+    means = means or []
+    ids = group_ids(df, by, sort=True)
+    n_groups = ids.max() + 1 if len(ids) > 0 else 0
+    # first row of each group, for the values of the groupby columns
+    first = np.unique(ids, return_index=True)[1]
+
+    aggregated = {c: np.bincount(ids,
+                                 weights=np.nan_to_num(
+                                     df[c].to_numpy(dtype=float)),
+                                 minlength=n_groups)
+                  for c in sums}
+    weights = df[weight].to_numpy(dtype=float)
+    for c in means:
+        values = df[c].to_numpy(dtype=float)
+        valid = ~np.isnan(values) & ~np.isnan(weights)
+        numerator = np.bincount(ids[valid],
+                                weights=values[valid] * weights[valid],
+                                minlength=n_groups)
+        denominator = np.bincount(ids[valid], weights=weights[valid],
+                                  minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            aggregated[c] = np.where(denominator != 0,
+                                     numerator / denominator, fill_value)
+
+    return (df[by].iloc[first]
+            .reset_index(drop=True)
+            .assign(**aggregated))
+
+
+def replace_values(df: pd.DataFrame, replacements: dict) -> pd.DataFrame:
+    """
+    Replace values in the object columns of df in a single mapped pass per
+    column, equivalent to df.replace(replacements) for string keys
+    :param df: df
+    :param replacements: dict, {original: replacement}
+    :return: df
+    """
+    if not replacements:
+        return df
+    keys = list(replacements)
+    replaced = {}
+    for column in df.columns[df.dtypes == object]:
+        hit = df[column].isin(keys)
+        if hit.any():
+            replaced[column] = df[column].mask(
+                hit, df[column].map(replacements))
+    return df.assign(**replaced)
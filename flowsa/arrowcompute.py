@@ -0,0 +1,148 @@
+# arrowcompute.py (flowsa)
+# !/usr/bin/env python3
+# coding=utf-8
+"""
+Arrow compute kernels for FlowBy group aggregation and joins.
+
+Grouping and joining on the object-dtype (string) columns of FlowBy
+datasets spends much of its time hashing Python objects. The "arrow" kernel
+path converts the key and value columns to an Arrow table once per
+operation and runs the group sums (used by aggregate_flowby(), including its
+weighted averages, and harmonize_geoscale()) and left joins (used by
+sector_aggregation()) with pyarrow.compute / Acero. Results are converted
+back to pandas and ordered as the equivalent pandas operation would order
+them.
+
+The kernel path is selected in the FBS method yaml and falls back to
+pandas if pyarrow is not installed or the data cannot be converted:
+
+    flowby_kernel: arrow
+
+See scripts/benchmark_arrow_kernels.py for a comparison of the two paths.
+"""
+
+import numpy as np
+import pandas as pd
+from flowsa.flowsa_log import log
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ModuleNotFoundError:
+    pa = None
+    pc = None
+
+FLOWBY_KERNELS = ['pandas', 'arrow']
+# stands in for null string keys in joins, as Arrow joins do not match nulls
+NULL_KEY = '\x00null'
+
+
+def use_arrow(config: dict) -> bool:
+    """
+    Determine if the arrow kernel path is selected and available
+    :param config: dict, FlowBy config
+    :return: bool
+    """
+    kernel = config.get('flowby_kernel', 'pandas')
+    if kernel not in FLOWBY_KERNELS:
+        log.error(f'FlowBy kernel {kernel} not recognized, options are '
+                  f'{FLOWBY_KERNELS}')
+        raise ValueError('FlowBy kernel not recognized')
+    if kernel == 'arrow' and pa is None:
+        log.warning('pyarrow is required for the arrow kernel path, using '
+                    'pandas')
+        return False
+    return kernel == 'arrow'
+
+
+def _to_table(df: pd.DataFrame) -> 'pa.Table' or None:
+    try:
+        return pa.Table.from_pandas(pd.DataFrame(df), preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        log.debug(f'Could not convert data to Arrow, using pandas: {e}')
+        return None
+
+
+def group_sum(
+        df: pd.DataFrame,
+        by: list,
+        columns: list,
+        dropna: bool = False
+) -> pd.DataFrame or None:
+    """
+    Equivalent of df.groupby(by, dropna=dropna)[columns].agg(sum)
+    .reset_index(), where the sum of all-null values is 0
+    :param df: df
+    :param by: list, columns to group by
+    :param columns: list, numeric columns to sum
+    :param dropna: bool, if True, drop rows with null keys
+    :return: df, sorted by the groupby columns, or None if df is empty or
+        the data cannot be converted to Arrow
+    """
+    if len(columns) == 0 or df.empty:
+        return None
+    df = df[[*by, *columns]]
+    if dropna:
+        df = df.dropna(subset=by)
+    table = _to_table(df)
+    if table is None:
+        return None
+    options = pc.ScalarAggregateOptions(min_count=0)
+    summed = (table
+              .group_by(by)
+              .aggregate([(c, 'sum', options) for c in columns])
+              .to_pandas()
+              .rename(columns={f'{c}_sum': c for c in columns}))
+    return (summed[[*by, *columns]]
+            .sort_values(by, kind='stable', na_position='last')
+            .reset_index(drop=True))
+
+
+def merge_left(
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        on: list
+) -> pd.DataFrame or None:
+    """
+    Equivalent of left.merge(right, how='left', on=on) where the only
+    columns shared by left and right are the join keys. Null string keys
+    match, as in pandas, and rows are returned in pandas order (left rows
+    in order, each followed by its matches in right order).
+    :param left: df
+    :param right: df
+    :param on: list, key columns
+    :return: df, or None if the join is not supported, either df is empty
+        (empty object columns have no Arrow type to join on) or the data
+        cannot be converted to Arrow
+    """
+    shared = set(left.columns) & set(right.columns)
+    if shared != set(on) or left.empty or right.empty:
+        return None
+    keys = {}
+    for c in on:
+        for df in (left, right):
+            if df[c].isna().any() and df[c].dtype != object:
+                return None
+        keys[c] = NULL_KEY if left[c].dtype == object else None
+
+    def prepare(df, row):
+        return df.assign(**{row: np.arange(len(df))},
+                         **{c: df[c].fillna(k) for c, k in keys.items()
+                            if k is not None})
+
+    left_table = _to_table(prepare(left, '_left_row'))
+    right_table = _to_table(prepare(right, '_right_row'))
+    if left_table is None or right_table is None:
+        return None
+    merged = (left_table
+              .join(right_table, keys=on, join_type='left outer',
+                    coalesce_keys=True)
+              .to_pandas()
+              .sort_values(['_left_row', '_right_row'], kind='stable',
+                           na_position='last')
+              .drop(columns=['_left_row', '_right_row'])
+              .replace({c: {k: np.nan} for c, k in keys.items()
+                        if k is not None})
+              .reset_index(drop=True))
+    return merged[[*left.columns,
+                   *[c for c in right.columns if c not in on]]]
@@ -0,0 +1,319 @@
+# attribution.py (flowsa)
+# !/usr/bin/env python3
+# coding=utf-8
+"""
+Sparse-matrix backend for the attribution methods of FlowBy datasets.
+
+The default ("merge") backend joins the data being attributed to the
+attribution source and computes denominators with groupby transforms. The
+"sparse" backend instead encodes the join keys of both datasets as integer
+codes, looks up attribution source flows by code, and builds denominators
+as a (group x attribution key) sparse matrix multiplied by the vector of
+attribution flows, so the exploded merge is never materialized.
+
+The backend is selected per attribution step in the FBS method yaml:
+
+    attribution_method: proportional
+    attribution_source: BLS_QCEW
+    attribution_backend: sparse
+
+Also includes the location partitioning used to bound the memory of
+proportional attribution, and the conservation diagnostics computed after
+each attribution step, which are attached to the attributed FlowBy as
+`diagnostics`.
+"""
+
+import numpy as np
+import pandas as pd
+from flowsa import geo, location
+from flowsa.flowsa_log import log
+
+try:
+    from scipy import sparse
+except ModuleNotFoundError:
+    sparse = None
+
+ATTRIBUTION_BACKENDS = ['merge', 'sparse']
+
+
+def use_sparse_backend(config: dict) -> bool:
+    """
+    Determine if an attribution step should use the sparse backend
+    :param config: dict, FlowBy config for the attribution step
+    :return: bool, True if the sparse backend is requested and available
+    """
+    backend = config.get('attribution_backend', 'merge')
+    if backend not in ATTRIBUTION_BACKENDS:
+        log.error(f'Attribution backend {backend} not recognized, options '
+                  f'are {ATTRIBUTION_BACKENDS}')
+        raise ValueError('Attribution backend not recognized')
+    if backend == 'sparse' and sparse is None:
+        log.warning('scipy is required for the sparse attribution backend, '
+                    'using the merge backend')
+        return False
+    return backend == 'sparse'
+
+
+def match_keys(
+        left_keys: pd.DataFrame,
+        right_keys: pd.DataFrame
+) -> np.ndarray or None:
+    """
+    Locate, for each row of left_keys, the row of right_keys with the same
+    key values, treating nulls as equal (as in pd.merge).
+    :param left_keys: df, key columns of the data being attributed
+    :param right_keys: df, key columns of the attribution source, in the
+        same order as left_keys
+    :return: array of positional indices into right_keys, -1 where there is
+        no match, or None if the right keys are not unique (in which case a
+        merge would duplicate rows and the sparse backend does not apply)
+    """
+    n_left = len(left_keys)
+    keys = pd.concat(
+        [pd.DataFrame(left_keys.to_numpy(dtype=object)),
+         pd.DataFrame(right_keys.to_numpy(dtype=object))],
+        ignore_index=True)
+    codes = (keys.groupby(list(keys.columns), dropna=False, sort=False)
+             .ngroup().to_numpy())
+    left_codes, right_codes = codes[:n_left], codes[n_left:]
+    if len(np.unique(right_codes)) < len(right_codes):
+        return None
+
+    position = np.full(codes.max() + 1 if len(codes) else 0, -1)
+    position[right_codes] = np.arange(len(right_codes))
+    return position[left_codes]
+
+
+def take_other(
+        fb: pd.DataFrame,
+        other: pd.DataFrame,
+        index: np.ndarray,
+        left_on: list,
+        right_on: list
+) -> dict:
+    """
+    Pull the columns of the attribution source for each row of fb, as a
+    left merge of fb with other on left_on and right_on would: keys of the
+    same name are not repeated, columns of other also in fb are suffixed
+    with '_other', and unmatched rows are null (0 for FlowAmount), with the
+    dtypes the merge would give.
+    :param fb: df, data being attributed
+    :param other: df, attribution source
+    :param index: array, output of match_keys()
+    :param left_on: list, key columns of fb
+    :param right_on: list, key columns of other
+    :return: dict, column name: values, one per row of fb
+    """
+    shared_keys = {r for l, r in zip(left_on, right_on) if l == r}
+    taken = (pd.DataFrame(other)
+             [[c for c in other.columns if c not in shared_keys]]
+             .reset_index(drop=True)
+             .reindex(index)
+             .fillna({'FlowAmount': 0}))
+    return {f'{c}_other' if c in fb.columns else c: taken[c].array
+            for c in taken.columns}
+
+
+def group_denominators(
+        group_id: pd.Series,
+        index: np.ndarray,
+        other_flows: np.ndarray,
+        distinct_keys: bool = True
+) -> np.ndarray:
+    """
+    Sum of attribution source flows for each group, returned per row.
+
+    Groups and attribution keys form a sparse (group x key) incidence matrix;
+    multiplying by the vector of attribution flows gives each group's
+    denominator, i.e. the row normalization of the weighted matrix.
+    :param group_id: series, group of each row being attributed
+    :param index: array, output of match_keys()
+    :param other_flows: array, FlowAmount of each attribution source row
+    :param distinct_keys: bool, if True, each attribution key counts once per
+        group, otherwise once per row
+    :return: array of denominators, one per row
+    """
+    group, groups = pd.factorize(group_id)
+    matched = index >= 0
+    incidence = sparse.csr_matrix(
+        (np.ones(matched.sum()), (group[matched], index[matched])),
+        shape=(len(groups), len(other_flows)))
+    if distinct_keys:
+        incidence.data[:] = 1
+    return (incidence @ other_flows)[group]
+
+
+def location_partitions(
+        fb: pd.DataFrame,
+        other: pd.DataFrame,
+        config: dict,
+        fb_geoscale: geo.scale,
+        other_geoscale: geo.scale
+) -> list or None:
+    """
+    Split the data being proportionally attributed and the attribution
+    source into location partitions which can be attributed independently,
+    as set by the following keys of the attribution step config:
+
+        attribution_partitions: state  # or an int number of state blocks
+        attribution_memory_budget: 500  # MB, optional
+        attribution_workers: 1  # optional
+
+    Partitions are states or, if an int is given, that many blocks of
+    states. The out-of-core FlowBy backend partitions by state by default.
+    With a memory budget, partitions are combined in order while the
+    estimated size of their merge stays within the budget, where the
+    merge size is the sum over (PrimarySector, location) keys of the
+    number of matching rows on each side.
+
+    Partitioning requires both datasets to be at the state or county
+    geoscale, and that locations are matched rather than filled from the
+    attribution source (except for filling county data within states).
+    :param fb: df, data being attributed, after harmonize_geoscale()
+    :param other: df, attribution source, after harmonize_geoscale()
+    :param config: dict, FlowBy config for the attribution step
+    :param fb_geoscale: geo.scale of fb
+    :param other_geoscale: geo.scale of other
+    :return: list of tuples of positional indices (fb rows, other rows), or
+        None if the data should not be partitioned
+    """
+    partitions = config.get('attribution_partitions')
+    budget = config.get('attribution_memory_budget')
+    if partitions is None and config.get('flowby_backend') == 'outofcore':
+        partitions = 'state'
+    if partitions is None and budget is None:
+        return None
+    fill_location = 'Location' in config.get('fill_columns', [])
+    if (max(fb_geoscale, other_geoscale) > geo.scale.STATE
+            or (fill_location and not (fb_geoscale == geo.scale.STATE and
+                                       other_geoscale == geo.scale.COUNTY))):
+        log.info('Location partitions require subnational data matched on '
+                 'location, attributing without partitions')
+        return None
+
+    fb_state = location.fips_to_int(location.fips_to_state(fb['Location']))
+    other_state = location.fips_to_int(
+        location.fips_to_state(other['Location']))
+    if partitions is None or partitions == 'state':
+        fb_key, other_key = fb_state.to_numpy(), other_state.to_numpy()
+    else:
+        fb_key = (fb_state // 1000 % int(partitions)).to_numpy()
+        other_key = (other_state // 1000 % int(partitions)).to_numpy()
+    keys = np.unique(fb_key)
+
+    batches = [[k] for k in keys]
+    if budget is not None:
+        # estimated merge rows and bytes per row for each partition
+        merge_location = 'temp_location' if 'temp_location' in fb \
+            else 'Location'
+        fb_counts = (pd.DataFrame(fb).assign(_key=fb_key)
+                     .groupby(['_key', 'PrimarySector', merge_location],
+                              dropna=False)
+                     .size().rename('n_fb').reset_index()
+                     .rename(columns={merge_location: 'Location'}))
+        other_counts = (pd.DataFrame(other).assign(_key=other_key)
+                        .groupby(['_key', 'PrimarySector', 'Location'],
+                                 dropna=False)
+                        .size().rename('n_other').reset_index())
+        merged_rows = (fb_counts
+                       .merge(other_counts, how='left')
+                       .fillna({'n_other': 1})
+                       .assign(rows=lambda x: x.n_fb * x.n_other.clip(lower=1))
+                       .groupby('_key')['rows'].sum())
+        row_bytes = (fb.memory_usage(index=False).sum() / max(len(fb), 1)
+                     + other.memory_usage(index=False).sum()
+                     / max(len(other), 1))
+        size = (merged_rows.reindex(keys, fill_value=0) * row_bytes
+                / 2 ** 20).to_numpy()
+
+        batches, batch_size = [], budget
+        for k, k_size in zip(keys, size):
+            if k_size > budget:
+                log.warning(f'Location partition {k} is estimated to need '
+                            f'{k_size:.0f} MB, above the attribution memory '
+                            f'budget of {budget} MB')
+            if batch_size + k_size > budget or not batches:
+                batches.append([])
+                batch_size = 0
+            batches[-1].append(k)
+            batch_size += k_size
+
+    return [(np.flatnonzero(np.isin(fb_key, batch)),
+             np.flatnonzero(np.isin(other_key, batch)))
+            for batch in batches]
+
+
+def conservation_diagnostics(
+        fb: pd.DataFrame,
+        attributed: pd.DataFrame,
+        **labels
+) -> tuple:
+    """
+    Conservation metrics for one attribution step. Group totals before and
+    after attribution are single segmented sums (np.bincount) over the
+    factorized group_id of the data being attributed.
+    :param fb: df, data before attribution, with group_id and group_total
+    :param attributed: df, data after attribution, with group_id
+    :param labels: columns to add to the diagnostics, such as FullName,
+        Step, AttributionMethod and AttributionSource
+    :return: tuple of (df with one row of metrics, array of the group_ids
+        whose attributed total does not equal group_total)
+    """
+    group, groups = pd.factorize(fb['group_id'])
+    n_groups = len(groups)
+    group_total = np.zeros(n_groups)
+    group_total[group] = fb['group_total'].to_numpy(dtype=float)
+
+    attributed_group = groups.get_indexer(attributed['group_id'])
+    in_fb = attributed_group >= 0
+    attributed_total = np.bincount(
+        attributed_group[in_fb],
+        weights=attributed['FlowAmount'].to_numpy(dtype=float)[in_fb],
+        minlength=n_groups)
+    attributed_rows = np.bincount(attributed_group[in_fb],
+                                  minlength=n_groups)
+
+    # groups with no attributed rows, for proportional attribution these are
+    # the groups with a denominator of 0
+    dropped = attributed_rows == 0
+    unconserved = ~dropped & ~np.isclose(group_total, attributed_total,
+                                         equal_nan=True)
+
+    input_total = group_total.sum()
+    output_total = attributed_total.sum()
+    metrics = pd.DataFrame({
+        **{k: [v] for k, v in labels.items()},
+        'Rows': [len(fb)],
+        'AttributedRows': [len(attributed)],
+        'Groups': [n_groups],
+        'InputTotal': [input_total],
+        'AttributedTotal': [output_total],
+        'PercentChange': [round((output_total - input_total)
+                                / input_total * 100, 3)
+                          if input_total != 0 else np.nan],
+        'UnconservedGroups': [int(unconserved.sum())],
+        'ZeroDenominatorGroups': [int(dropped.sum())],
+        'UnattributableRows': [int(dropped[group].sum())],
+    })
+    return metrics, np.asarray(groups[unconserved])
+
+
+def conservation_errors(
+        attributed: pd.DataFrame,
+        group_ids: np.ndarray
+) -> pd.DataFrame:
+    """
+    Render the rows of attributed groups whose totals do not equal the
+    original group_total, see conservation_diagnostics()
+    :param attributed: df, data after attribution
+    :param group_ids: array of group_ids, from conservation_diagnostics()
+    :return: df of offending rows with group_total and validation_total
+    """
+    errors = attributed[attributed['group_id'].isin(group_ids)]
+    errors = errors.assign(validation_total=(errors.groupby('group_id')
+                                             ['FlowAmount'].transform('sum')))
+    return errors[[c for c in ['group_id', 'ActivityProducedBy',
+                               'ActivityConsumedBy', 'SectorProducedBy',
+                               'SectorConsumedBy', 'Location', 'FlowAmount',
+                               'group_total', 'validation_total']
+                   if c in errors]]
@@ -0,0 +1,348 @@
+# backfill.py (flowsa)
+# !/usr/bin/env python3
+# coding=utf-8
+"""
+Batch generation of Flow-By-Activity datasets across sources and years.
+
+generateflowbyactivity.main() generates a single source for a year or range
+of years, in series. To refresh many FBAs, the (source, year) jobs are run
+here in a pool of worker processes, with a limit on the number of jobs of
+any one source running at once (to avoid overloading a single data
+provider), and the largest jobs scheduled first.
+
+The outcome of each job (status, duration, hash of the parquet(s) written
+and any error) is recorded in a JSON manifest, updated as each job
+finishes. Rerunning the backfill with the same manifest skips completed
+jobs, so an interrupted or partially failed backfill resumes where it
+stopped. Sources with an active entry in method_status.yaml are skipped.
+
+EX: flowsa backfill --workers 4 --sources USDA_CoA_Cropland
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from esupy.processed_data_mgmt import mkdir_if_missing
+from flowsa.common import check_method_status, load_yaml_dict, \
+    seeAvailableFlowByModels
+from flowsa.flowsa_log import log
+from flowsa.settings import fbaoutputpath, sourceconfigpath, WRITE_FORMAT
+
+DEFAULT_MANIFEST = fbaoutputpath / 'backfill_manifest.json'
+
+
+def job_name(source, year):
+    """
+    Name of a job, the FBA name for single years
+    :param source: str, FBA source
+    :param year: str, year or range of years (e.g., '2012-2017')
+    :return: str
+    """
+    return f'{source}_{year}'
+
+
+def backfill_jobs(sources: list = None, years: list = None) -> list:
+    """
+    List the (source, year) jobs to generate. Sources that call all years
+    at once (call_all_years: True) are a single job over the range of years.
+    :param sources: list, FBA sources to include, defaults to all sources
+        returned by seeAvailableFlowByModels('FBA')
+    :param years: list, years to include, defaults to all years listed in
+        each source's method yaml
+    :return: list of dictionaries, 'source' and 'year'
+    """
+    available = seeAvailableFlowByModels('FBA', print_method=False)
+    method_status = check_method_status() or {}
+    jobs = []
+    for source in sources or available:
+        source_years = available.get(source)
+        if not isinstance(source_years, list):
+            log.warning(f'No FBA method yaml with years for {source}, '
+                        f'skipping')
+            continue
+        status = method_status.get(source)
+        if status is not None and status.get('Active', True):
+            log.info(f'Skipping {source}, listed in method_status.yaml: '
+                     f'{status.get("Status", "Unknown")}')
+            continue
+        if years is not None:
+            source_years = [y for y in source_years if int(y) in
+                            {int(x) for x in years}]
+        if not source_years:
+            continue
+        if load_yaml_dict(source, 'FBA').get('call_all_years'):
+            jobs.append({'source': source,
+                         'year': f'{min(source_years)}-{max(source_years)}'})
+        else:
+            jobs.extend({'source': source, 'year': str(y)}
+                        for y in source_years)
+    return jobs
+
+
+def job_years(year: str) -> list:
+    """
+    Years generated by a job
+    :param year: str, year or range of years (e.g., '2012-2017')
+    :return: list of str
+    """
+    if '-' in year:
+        first, last = year.split('-')
+        return [str(y) for y in range(int(first), int(last) + 1)]
+    return [year]
+
+
+def output_source(name: str, sources: list) -> str or None:
+    """
+    Source of a local FBA. Sources which parse to multiple FBAs save each
+    under its own name, which starts with the name of the source (e.g.,
+    EPA_GHGI_T_2_1), so the FBA is assigned to the longest source its name
+    equals or starts with, e.g. USDA_CoA_Cropland_NAICS rather than
+    USDA_CoA_Cropland.
+    :param name: str, FBA name without year and version
+    :param sources: list of str, FBA sources
+    :return: str, or None if no source matches
+    """
+    return max((s for s in sources
+                if name == s or name.startswith(f'{s}_')),
+               key=len, default=None)
+
+
+def local_outputs(source: str, year: str, since: float = None,
+                  sources: list = None) -> list:
+    """
+    Local FBA parquet(s) of a job, see output_source()
+    :param source: str, FBA source
+    :param year: str, year or range of years
+    :param since: float, only include files modified at or after this time
+        (seconds since epoch)
+    :param sources: list of str, FBA sources whose outputs to tell apart,
+        defaults to the FBA methods in flowsa
+    :return: list of paths, sorted by name
+    """
+    if sources is None:
+        sources = [p.stem for p in sourceconfigpath.glob('*.yaml')]
+    sources = [*sources, source]
+    files = set()
+    for y in job_years(year):
+        files.update(
+            f for f in fbaoutputpath.glob(f'{source}*_{y}_v*.{WRITE_FORMAT}')
+            if output_source(f.name[:f.name.index(f'_{y}_v')],
+                             sources) == source)
+    if since is not None:
+        files = {f for f in files if f.stat().st_mtime >= since}
+    return sorted(files)
+
+
+def hash_files(files: list) -> str or None:
+    """
+    sha256 of the contents of the files, in order
+    :param files: list of paths
+    :return: str, hex digest, None if there are no files
+    """
+    if not files:
+        return None
+    digest = hashlib.sha256()
+    for f in files:
+        with open(f, 'rb') as fh:
+            for block in iter(lambda: fh.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def job_size(job: dict, manifest: dict) -> int:
+    """
+    Estimated size of a job, for scheduling: bytes of output recorded in
+    the manifest from a previous run, else bytes of any existing local
+    output, else 0
+    :param job: dict, 'source' and 'year'
+    :param manifest: dict, backfill manifest
+    :return: int, bytes
+    """
+    recorded = manifest.get(job_name(**job), {}).get('Bytes')
+    if recorded:
+        return recorded
+    return sum(f.stat().st_size
+               for f in local_outputs(job['source'], job['year']))
+
+
+def read_manifest(path=DEFAULT_MANIFEST) -> dict:
+    """
+    Load the backfill manifest
+    :param path: path to the manifest JSON
+    :return: dict, job name: job record, empty if the manifest is missing
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def write_manifest(manifest: dict, path=DEFAULT_MANIFEST):
+    """
+    Save the backfill manifest, replacing the file in a single step so an
+    interrupted write does not corrupt the existing manifest
+    :param manifest: dict, job name: job record
+    :param path: path to the manifest JSON
+    """
+    mkdir_if_missing(os.path.dirname(path))
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def run_job(source: str, year: str) -> dict:
+    """
+    Generate the FBA(s) of a job. Runs in a worker process, errors are
+    recorded rather than raised. Jobs that save no FBA are recorded as
+    'empty', and are rerun like failed jobs.
+    :param source: str, FBA source
+    :param year: str, year or range of years
+    :return: dict, job record
+    """
+    from flowsa import generateflowbyactivity
+
+    start = time.time()
+    try:
+        generateflowbyactivity.main(source=source, year=year)
+    except Exception as e:
+        log.error(f'Failed to generate {job_name(source, year)}: {e}')
+        return {'Status': 'failed',
+                'Seconds': round(time.time() - start, 1),
+                'Error': ''.join(traceback.format_exception_only(
+                    type(e), e)).strip()}
+    # whole seconds, for file systems with coarse modification times
+    outputs = local_outputs(source, year, since=int(start))
+    if not outputs:
+        log.error(f'No FBA saved locally for {job_name(source, year)}')
+        return {'Status': 'empty',
+                'Seconds': round(time.time() - start, 1),
+                'Outputs': [],
+                'Error': 'No FBA saved locally'}
+    return {'Status': 'complete',
+            'Seconds': round(time.time() - start, 1),
+            'Outputs': [f.name for f in outputs],
+            'Bytes': sum(f.stat().st_size for f in outputs),
+            'Hash': hash_files(outputs),
+            'Error': None}
+
+
+def run_backfill(
+        jobs: list,
+        manifest_path=DEFAULT_MANIFEST,
+        workers: int = 4,
+        source_limit: int = 1,
+        source_limits: dict = None,
+        rerun: bool = False
+) -> dict:
+    """
+    Run the jobs in a process pool, largest first, recording each outcome
+    in the manifest. Jobs already complete in the manifest are skipped
+    unless rerun is True.
+    :param jobs: list of dicts, 'source' and 'year', see backfill_jobs()
+    :param manifest_path: path to the manifest JSON
+    :param workers: int, number of worker processes
+    :param source_limit: int, maximum number of jobs of a single source
+        running at once
+    :param source_limits: dict, source: limit, overriding source_limit
+    :param rerun: bool, True to rerun completed jobs
+    :return: dict, the updated manifest
+    """
+    source_limits = source_limits or {}
+    manifest = read_manifest(manifest_path)
+    pending = [j for j in jobs if rerun or manifest.get(
+        job_name(**j), {}).get('Status') != 'complete']
+    log.info(f'{len(jobs) - len(pending)} of {len(jobs)} FBA jobs complete '
+             f'in {manifest_path}, running {len(pending)} with {workers} '
+             f'worker process(es)')
+    pending.sort(key=lambda j: job_size(j, manifest), reverse=True)
+
+    running = {}
+    active = Counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            for job in list(pending):
+                if len(running) >= workers:
+                    break
+                limit = max(source_limits.get(job['source'], source_limit),
+                            1)
+                if active[job['source']] >= limit:
+                    continue
+                pending.remove(job)
+                active[job['source']] += 1
+                running[executor.submit(run_job, **job)] = job
+                log.info(f'Started {job_name(**job)}')
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                active[job['source']] -= 1
+                try:
+                    record = future.result()
+                except Exception as e:
+                    # the worker process died, e.g. out of memory
+                    record = {'Status': 'failed', 'Error': repr(e)}
+                record.update({'Source': job['source'],
+                               'Year': job['year'],
+                               'Finished': time.strftime(
+                                   '%Y-%m-%d %H:%M:%S')})
+                manifest[job_name(**job)] = record
+                write_manifest(manifest, manifest_path)
+                log.info(f'{record["Status"].capitalize()} '
+                         f'{job_name(**job)} ({len(pending)} pending, '
+                         f'{len(running)} running)')
+
+    for status in ['failed', 'empty']:
+        names = [k for k, v in manifest.items() if v['Status'] == status]
+        if names:
+            log.warning(f'{status.capitalize()} FBA jobs: '
+                        f'{", ".join(sorted(names))}')
+    return manifest
+
+
+def parse_args(args=None):
+    """
+    Make backfill script parameters
+    :param args: list of str, command line arguments, defaults to sys.argv
+    :return: dictionary of arguments
+    """
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-s", "--sources", nargs='*',
+                    help="FBA sources to generate, defaults to all")
+    ap.add_argument("-y", "--years", nargs='*', type=int,
+                    help="Years to generate, defaults to all listed")
+    ap.add_argument("-w", "--workers", type=int, default=4,
+                    help="Number of worker processes")
+    ap.add_argument("--source_limit", type=int, default=1,
+                    help="Maximum concurrent jobs of a single source")
+    ap.add_argument("-m", "--manifest", default=str(DEFAULT_MANIFEST),
+                    help="Path to the backfill manifest")
+    ap.add_argument("--rerun", action='store_true',
+                    help="Rerun jobs already complete in the manifest")
+    return vars(ap.parse_args(args))
+
+
+def main(**kwargs):
+    """
+    Generate FBAs across sources and years
+    :param kwargs: see parse_args()
+    :return: dict, the updated manifest
+    """
+    if len(kwargs) == 0:
+        kwargs = parse_args()
+    jobs = backfill_jobs(kwargs.get('sources'), kwargs.get('years'))
+    return run_backfill(jobs,
+                        manifest_path=kwargs.get('manifest',
+                                                 DEFAULT_MANIFEST),
+                        workers=kwargs.get('workers', 4),
+                        source_limit=kwargs.get('source_limit', 1),
+                        rerun=kwargs.get('rerun', False))
+
+
+if __name__ == '__main__':
+    main()
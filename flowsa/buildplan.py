@@ -0,0 +1,265 @@
+# buildplan.py (flowsa)
+# !/usr/bin/env python3
+# coding=utf-8
+"""
+Generation of several FlowBySector methods together, sharing the upstream
+datasets they have in common.
+
+build_plan() parses the 'source_names', 'sources_to_cache',
+'attribution_source' and 'clean_source' of each method (including those in
+activity sets and attribution steps) into a DAG of the datasets to load or
+generate. Upstream FBS methods are parsed in turn. Nodes are keyed by the
+stored dataset they load, e.g. ('FlowByActivity', 'BLS_QCEW_2017') or
+('FlowBySector', 'Employment_national_2017'), so a dataset referenced by
+several methods, or several times in one method, is a single node. The rest
+of each reference's config (selection fields, geoscale, attribution
+method, ...) is applied by the consumer when preparing the dataset, so it
+is not part of the key.
+
+run_plan() then visits the nodes in topological order, running each once:
+
+- share='memory': each upstream dataset is loaded (FBAs) or loaded or
+  generated (FBSs) once and held in memory, and _getFlowBy() hands a copy
+  to every consumer instead of reading the local store. A dataset is
+  released after its last consumer is generated.
+- share='store': upstream FBSs missing locally are generated once, before
+  their consumers, which then load them from the local FBS store. FBAs are
+  already generated once and saved by the first consumer.
+
+EX: flowsa build Water_national_2015_m1 Employment_national_2015
+"""
+
+from collections import Counter
+from graphlib import TopologicalSorter
+import pandas as pd
+from flowsa.common import get_catalog_info, load_yaml_dict
+from flowsa.flowsa_log import log
+
+# config keys naming the datasets a method loads
+UPSTREAM_KEYS = ['source_names', 'sources_to_cache', 'attribution_source',
+                 'clean_source']
+
+# datasets held in memory for share='memory', see shared_dataset()
+_shared = {}
+
+
+def _as_sources(value) -> list:
+    """
+    Normalize the value of an upstream key to a list of (name, config),
+    from a dict of {name: config}, a name, or a list of either
+    """
+    if isinstance(value, dict):
+        return [(k, v if isinstance(v, dict) else {})
+                for k, v in value.items()]
+    if isinstance(value, str):
+        return [(value, {})]
+    if isinstance(value, list):
+        return [s for v in value for s in _as_sources(v)]
+    return []
+
+
+def upstream_sources(config: dict, year=None):
+    """
+    Datasets referenced in a method config. The year of each dataset is
+    the nearest 'year' in the config hierarchy, as it is passed down when
+    the method is generated.
+    :param config: dict, FBS method, or part of one
+    :param year: year of the enclosing config
+    :return: generator of (name, config, year)
+    """
+    year = config.get('year', year)
+    for key, value in config.items():
+        if key in UPSTREAM_KEYS:
+            for name, source_config in _as_sources(value):
+                source_year = source_config.get('year', year)
+                yield name, source_config, source_year
+                yield from upstream_sources(source_config, source_year)
+        elif isinstance(value, dict):
+            yield from upstream_sources(value, year)
+        elif isinstance(value, list):
+            for v in value:
+                if isinstance(v, dict):
+                    yield from upstream_sources(v, year)
+
+
+def node_key(name: str, config: dict, year=None) -> tuple or None:
+    """
+    Key of the stored dataset loaded for a source
+    :param name: str, source name
+    :param config: dict, source config
+    :param year: year of the source
+    :return: tuple, (category, dataset name, external data path), None for
+        sources not loaded from the FBA or FBS stores
+    """
+    data_format = (config.get('data_format')
+                   or get_catalog_info(name).get('data_format'))
+    if data_format == 'FBA':
+        dataset = name if year is None else f'{name}_{year}'
+        return 'FlowByActivity', dataset, config.get('external_data_path')
+    if data_format == 'FBS':
+        return 'FlowBySector', name, config.get('external_data_path')
+    return None
+
+
+def build_plan(methods: list, external_config_path: str = None) -> dict:
+    """
+    DAG of the datasets needed to generate the methods
+    :param methods: list of str, FBS methods
+    :param external_config_path: str, path to method files outside flowsa
+    :return: dict, node key: {'name', 'year', 'upstream' (Counter of
+        upstream keys and the number of references to each),
+        'consumers' (set of keys), 'requested' (bool)}
+    """
+    plan = {}
+
+    def add(key, name, year, requested=False):
+        node = plan.setdefault(key, {'name': name, 'year': year,
+                                     'upstream': Counter(),
+                                     'consumers': set(),
+                                     'requested': False})
+        node['requested'] |= requested
+        return node
+
+    to_parse = [(('FlowBySector', m, None), m) for m in methods]
+    for key, method in to_parse:
+        add(key, method, None, requested=True)
+    parsed = set()
+    while to_parse:
+        key, method = to_parse.pop()
+        if key in parsed:
+            continue
+        parsed.add(key)
+        try:
+            method_config = load_yaml_dict(method, 'FBS',
+                                           external_config_path)
+        except Exception as e:
+            # e.g., an FBS only available from the remote server
+            log.warning(f'Could not load FBS method {method}, it will be '
+                        f'loaded as stored: {e}')
+            continue
+        for name, config, year in upstream_sources(method_config):
+            upstream = node_key(name, config, year)
+            if upstream is None or upstream == key:
+                continue
+            add(upstream, name, year)
+            plan[key]['upstream'][upstream] += 1
+            plan[upstream]['consumers'].add(key)
+            if upstream[0] == 'FlowBySector':
+                to_parse.append((upstream, name))
+
+    shared = [k for k, v in plan.items() if len(v['consumers']) > 1]
+    log.info(f'Build plan for {len(methods)} method(s): {len(plan)} '
+             f'datasets, {len(shared)} shared by several methods')
+    return plan
+
+
+def plan_order(plan: dict) -> list:
+    """
+    Node keys in the order to run them, upstream datasets first
+    :param plan: dict, see build_plan()
+    :return: list of node keys
+    """
+    return list(TopologicalSorter(
+        {k: v['upstream'] for k, v in plan.items()}).static_order())
+
+
+def shared_dataset(category: str, name: str,
+                   external_data_path: str = None) -> pd.DataFrame or None:
+    """
+    A dataset held in memory by run_plan(), used by _FlowBy._getFlowBy()
+    in place of the local store
+    :param category: str, 'FlowByActivity' or 'FlowBySector'
+    :param name: str, dataset name
+    :param external_data_path: str, as passed to _getFlowBy()
+    :return: df, a copy, or None if the dataset is not shared. The copy is
+        shallow under pandas copy-on-write, so consumers do not copy the
+        data unless they modify it, and deep otherwise, so that in-place
+        changes by a consumer are not seen by later consumers.
+    """
+    from flowsa.flowby import copy_on_write_enabled
+
+    df = _shared.get((category, name, external_data_path))
+    if df is None:
+        return None
+    return df.copy(deep=not copy_on_write_enabled())
+
+
+def run_plan(
+        plan: dict,
+        share: str = 'memory',
+        regenerate_upstream: bool = False,
+        external_config_path: str = None,
+        download_sources_ok: bool = False
+) -> list:
+    """
+    Generate the requested methods of a plan, running each upstream dataset
+    once
+    :param plan: dict, see build_plan()
+    :param share: str, 'memory' or 'store', see module docstring
+    :param regenerate_upstream: bool, if True, generate upstream FBSs even
+        if available locally (still once per plan)
+    :param external_config_path: str, path to method files outside flowsa
+    :param download_sources_ok: bool, passed to the FBS generation and
+        loading functions
+    :return: list of str, FBS methods generated
+    """
+    from esupy.processed_data_mgmt import read_source_metadata
+    from flowsa.flowbyactivity import FlowByActivity
+    from flowsa.flowbysector import FlowBySector
+    from flowsa.metadata import set_fb_meta
+    from flowsa.settings import paths
+
+    if share not in ['memory', 'store']:
+        raise ValueError("share must be 'memory' or 'store'")
+    to_generate = {k for k, v in plan.items() if k[0] == 'FlowBySector' and
+                   (v['requested'] or regenerate_upstream or
+                    read_source_metadata(paths, set_fb_meta(
+                        k[1], 'FlowBySector')) is None)}
+    # consumers yet to be generated and references to each dataset, counting
+    # only the FBSs to generate (those loaded from the store need no inputs)
+    remaining = Counter()
+    references = Counter()
+    for key in to_generate:
+        for upstream, n in plan[key]['upstream'].items():
+            remaining[upstream] += 1
+            references[upstream] += n
+
+    generated = []
+    try:
+        for key in plan_order(plan):
+            category, name, external_data_path = key
+            node = plan[key]
+            df = None
+            if key in to_generate:
+                log.info(f'Generating {name} FBS for {remaining[key]} '
+                         f'consumer(s) in the plan')
+                df = FlowBySector.generateFlowBySector(
+                    name, external_config_path, download_sources_ok)
+                generated.append(name)
+            elif share == 'memory' and references[key] > 1:
+                log.info(f'Loading {name} {category} once for '
+                         f'{references[key]} references')
+                if category == 'FlowByActivity':
+                    df = FlowByActivity.return_FBA(
+                        full_name=node['name'], year=node['year'],
+                        config={}, download_ok=download_sources_ok,
+                        external_data_path=external_data_path)
+                else:
+                    df = FlowBySector.return_FBS(
+                        name, config={},
+                        external_config_path=external_config_path,
+                        download_sources_ok=download_sources_ok,
+                        download_fbs_ok=download_sources_ok,
+                        external_data_path=external_data_path)
+
+            if share == 'memory' and df is not None and remaining[key] > 0:
+                _shared[key] = pd.DataFrame(df)
+            if key in to_generate:
+                # release datasets with no consumers left
+                for upstream in node['upstream']:
+                    remaining[upstream] -= 1
+                    if remaining[upstream] <= 0:
+                        _shared.pop(upstream, None)
+    finally:
+        _shared.clear()
+    return generated
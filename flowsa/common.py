@@ -14,6 +14,7 @@ import numpy as np
 from copy import deepcopy
 from dotenv import load_dotenv
 import flowsa.flowsa_yaml as flowsa_yaml
+from flowsa import dependencies
 import flowsa.exceptions
 from flowsa.flowsa_log import log
 from flowsa.schema import flow_by_activity_fields, flow_by_sector_fields, \
@@ -82,6 +83,7 @@ def load_crosswalk(crosswalk_name):
     :return: df, NAICS crosswalk over the years
     """
 
+    dependencies.record_file('crosswalks', datapath / f'{crosswalk_name}.csv')
     cw = pd.read_csv(datapath / f'{crosswalk_name}.csv', dtype="str")
 
     return cw
@@ -16,6 +16,7 @@ import zipfile
 import io
 import pandas as pd
 import numpy as np
+from flowsa import suppression
 from flowsa.location import US_FIPS
 from flowsa.flowbyfunctions import assign_fips_location_system
 from flowsa.flowbyactivity import FlowByActivity
@@ -198,13 +199,11 @@ def clean_qcew_for_fbs(fba: FlowByActivity, **kwargs):
 def estimate_suppressed_qcew(fba: FlowByActivity) -> FlowByActivity:
     if fba.config.get('geoscale') == 'national':
         fba = fba.query('Location == "00000"')
-    else:
-        log.critical('At a subnational scale, this might take a long time.')
 
+    range_parents = {'31': '3X', '32': '3X', '33': '3X',
+                     '44': '4X', '45': '4X',
+                     '48': '4Y', '49': '4Y'}
     fba2 = (fba
-            .assign(Unattributed=fba.FlowAmount.copy(),
-                    Attributed=0)
-            .assign(descendants='')
             .replace({'ActivityProducedBy': {'31-33': '3X',
                                              '44-45': '4X',
                                              '48-49': '4Y'}})
@@ -224,105 +223,26 @@ def estimate_suppressed_qcew(fba: FlowByActivity) -> FlowByActivity:
         .reset_index(drop=True)
     )
 
-    for level in range(max_level-1, 1, -1):
-        log.info(f"Identifying sector descendants for NAICS {level}")
-        descendants = pd.DataFrame(
-            fba3
-            .drop(columns='descendants')
-            .query(f'ActivityProducedBy.str.len() > {level}')
-            .assign(
-                parent=lambda x: x.ActivityProducedBy.str.slice(stop=level)
-            )
-            # replace parent values if parent is a range
-            .replace({'parent': {'31': '3X',
-                                 '32': '3X',
-                                 '33': '3X',
-                                 '44': '4X',
-                                 '45': '4X',
-                                 '48': '4Y',
-                                 '49': '4Y'
-                                 }})
-            .groupby(['FlowName', 'Location', 'parent'])
-            .agg({'Unattributed': 'sum', 'ActivityProducedBy': ' '.join})
-            .reset_index()
-            .rename(columns={'ActivityProducedBy': 'descendants',
-                             'Unattributed': 'descendant_flows',
-                             'parent': 'ActivityProducedBy'})
-        )
-
-        fba3 = (
-            fba3
-            .merge(descendants,
-                   how='left',
-                   on=['FlowName', 'Location', 'ActivityProducedBy'],
-                   suffixes=(None, '_y'))
-            .fillna({'descendant_flows': 0, 'descendants_y': ''})
-            .assign(
-                descendants=lambda x: x.descendants.mask(x.descendants == '',
-                                                         x.descendants_y),
-                Unattributed=lambda x: (x.Unattributed -
-                                      x.descendant_flows).mask(
-                    x.Unattributed - x.descendant_flows < 0, 0),
-                Attributed=lambda x: (x.Attributed +
-                                      x.descendant_flows)
-            )
-            .drop(columns=['descendant_flows', 'descendants_y'])
-        )
-    fba3 = fba3.drop(columns=['descendants'])
+    log.info('Identifying sector descendants')
+    fba3 = suppression.subtract_descendants(
+        fba3, 'ActivityProducedBy', ['FlowName', 'Location'],
+        levels=range(max_level - 1, 1, -1), parent_map=range_parents)
 
-    indexed = (
+    hierarchy = {f'n{n}': fba3.ActivityProducedBy.str.slice(stop=n)
+                 for n in range(2, 7)}
+    hierarchy['n2'] = hierarchy['n2'].replace(range_parents)
+    unsuppressed = suppression.fill_suppressed(
         fba3
-        .assign(n2=fba3.ActivityProducedBy.str.slice(stop=2),
-                n3=fba3.ActivityProducedBy.str.slice(stop=3),
-                n4=fba3.ActivityProducedBy.str.slice(stop=4),
-                n5=fba3.ActivityProducedBy.str.slice(stop=5),
-                n6=fba3.ActivityProducedBy.str.slice(stop=6),
-                location=fba3.Location,
-                category=fba3.FlowName)
-        .replace({'FlowAmount': {0: np.nan},
-                  'n2': {'31': '3X', '32': '3X', '33': '3X',
-                         '44': '4X', '45': '4X',
-                         '48': '4Y', '49': '4Y'}})
-        .set_index(['n2', 'n3', 'n4', 'n5', 'n6', 'location', 'category'],
-                   verify_integrity=True)
-    )
-
-    def fill_suppressed(
-        flows, level: int, activity
-    ):
-        parent = flows[flows[activity].str.len() == level]
-        children = flows[flows[activity].str.len() == level + 1]
-        null_children = children[children['FlowAmount'].isna()]
-
-        if null_children.empty or parent.empty:
-            return flows
-        else:
-            value = max(parent['Unattributed'][0] / len(null_children), 0)
-            # update the null children by adding the unattributed data to
-            # the attributed data
-            null_children = (
-                null_children
-                .assign(FlowAmount=value+null_children['Attributed'])
-                .assign(Unattributed=value)
-            )
-            flows.update(null_children)
-
-            return flows
-
-    unsuppressed = indexed.copy()
-    for level in range(2, max_level, 1):
-        log.info(f"Estimating suppressed NAICS {level + 1}")
-        groupcols = ["{}{}".format("n", i) for i in range(2, level+1)] + [
-            'location', 'category']
-        unsuppressed = unsuppressed.groupby(
-            level=groupcols).apply(
-            fill_suppressed, level, 'ActivityProducedBy')
+        .assign(**hierarchy)
+        .replace({'FlowAmount': {0: np.nan}}),
+        'ActivityProducedBy', hierarchy=list(hierarchy),
+        group_cols=['Location', 'FlowName'], levels=range(2, max_level))
 
     aggregated = (
         unsuppressed
         .reset_index(drop=True)
         .fillna({'FlowAmount': 0})
-        .drop(columns=['Unattributed', 'Attributed'])
+        .drop(columns=[*hierarchy, 'Unattributed', 'Attributed'])
         .assign(FlowName='Number of employees')
         .replace({'ActivityProducedBy': {'3X': '31-33',
                                          '4X': '44-45',
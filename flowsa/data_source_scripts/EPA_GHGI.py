@@ -44,6 +44,85 @@ DROP_COLS = ["Unnamed: 0"] + list(pd.date_range(
 
 YEARS = list(pd.date_range(start="2010", end="2024", freq='Y').year.astype(str))
 
+# Footnote characters removed from table text by strip_char()
+FOOTNOTE_MARKS = ["f, g", " a ", " b ", " c ", " d ", " e ", " f ", " g ",
+                  " h ", " i ", " j ", " k ", " l ", " b,c ", " h,i ",
+                  " f,g ", ")a", ")b", ")f", ")k", "b,c", "h,i"]
+
+FOOTNOTES = {'Gasolineb': 'Gasoline',
+             'Trucksc': 'Trucks',
+             'Boatsd': 'Boats',
+             'Boatse': 'Boats',
+             'Fuelsb': 'Fuels',
+             'Fuelsf': 'Fuels',
+             'Consumptiona': 'Consumption',
+             'Aircraftg': 'Aircraft',
+             'Pipelineh': 'Pipeline',
+             'Electricityh': 'Electricity',
+             'Electricityl': 'Electricity',
+             'Ethanoli': 'Ethanol',
+             'Biodieseli': 'Biodiesel',
+             'Changee': 'Change',
+             'Emissionsc': 'Emissions',
+             'Equipmentd': 'Equipment',
+             'Equipmente': 'Equipment',
+             'Totalf': 'Total',
+             'Roadg': 'Road',
+             'Otherf': 'Other',
+             'Railc': 'Rail',
+             'Usesb': 'Uses',
+             'Substancesd': 'Substances',
+             'Territoriesa': 'Territories',
+             'Roadb': 'Road',
+             'Raile': 'Rail',
+             'LPGf': 'LPG',
+             'Gasf': 'Gas',
+             'Gasolinec': 'Gasoline',
+             'Gasolinef': 'Gasoline',
+             'Fuelf': 'Fuel',
+             'Amendmenta': 'Amendment',
+             'Residue Nb': 'Residue N',
+             'Residue Nd': 'Residue N',
+             'Landa': 'Land',
+             'Landb': 'Land',
+             'landb': 'land',
+             'landc': 'land',
+             'landd': 'land',
+             'Settlementsc': 'Settlements',
+             'Wetlandse': 'Wetlands',
+             'Settlementsf': 'Settlements',
+             'Totali': 'Total',
+             'Othersa': 'Others',
+             'N?O': 'N2O',
+             'Distillate Fuel Oil (Diesel)': 'Distillate Fuel Oil',
+             'Distillate Fuel Oil (Diesel': 'Distillate Fuel Oil',
+             'Natural gas': 'Natural Gas', # Fix capitalization inconsistency
+             'HGLb': 'HGL',
+             'Biofuels-Biodieselh' : 'Biofuels-Biodiesel',
+             'Biofuels-Ethanolh' : 'Biofuels-Ethanol',
+             'Commercial Aircraftf' : 'Commercial Aircraft',
+             'Electricityk': 'Electricity',
+             'Gasolinea' : 'Gasoline',
+             'International Bunker Fuelse' : 'International Bunker Fuel',
+             'Medium- and Heavy-Duty Trucksb' : 'Medium- and Heavy-Duty Trucks',
+             'Pipelineg' : 'Pipeline',
+             'Recreational Boatsc' :'Recreational Boats',
+             'Construction/Mining Equipmentf' : 'Construction/Mining Equipment',
+             'Non-Roadc' : 'Non-Road',
+             'HFCsa': 'HFCs',
+             'HFOsb': 'HFOs',
+             'CO_{2}': 'CO2',
+             'CH?^{c}': 'CH4',
+             'N_{2} O^{c}': 'N2O',
+             'N_{2} O': 'N2O',
+             'SF?': 'SF6',
+             'NF?': 'NF3',
+             'CH_{4}': 'CH4',
+             'Total e,j': 'Total',
+             'Naphtha (<401Â° F)': 'Naphtha (<401° F)',
+             'Other Oil (>401Â° F)': 'Other Oil (>401° F)',
+             }
+
 
 def ghg_url_helper(*, build_url, config, **_):
     """
@@ -109,14 +188,45 @@ def series_separate_name_and_units(series, default_flow_name, default_units):
     """
     Given a series (such as a df column), split the contents' strings into a name and units.
     An example might be converting "Carbon Stored (MMT C)" into ["Carbon Stored", "MMT C"].
+    Vectorized equivalent of applying cell_get_name() and cell_get_units()
+    to each value.
 
     :param series: df column
     :param default_flow_name: df column for flow name to be modified
     :param default_units: df column for units to be modified
     :return: str, flowname and units for each row in df
     """
-    names = series.apply(lambda x: cell_get_name(x, default_flow_name))
-    units = series.apply(lambda x: cell_get_units(x, default_units))
+    has_units = series.str.contains('(', regex=False).to_numpy(dtype=bool)
+
+    # names without units replace '__type__' in the default flow name
+    stripped = series.str.strip()
+    parts = default_flow_name.split('__type__')
+    default_names = pd.Series(parts[0], index=series.index, dtype=object)
+    for part in parts[1:]:
+        default_names = default_names + stripped + part
+    # otherwise the words preceding the word with the first '('
+    names = (series
+             .str.extract(r'^(?:([^(]*) )?[^ (]*\(', expand=False)
+             .fillna('')
+             .str.replace(r'\s* ', ' ', regex=True)
+             .str.strip())
+    names = names.where(has_units, default_names)
+
+    # units are the words from each word with '(' until a word with ')'
+    units = pd.Series('', index=series.index, dtype=object)
+    found = np.zeros(len(series), dtype=bool)
+    words = series.str.split(' ', expand=True)
+    for i in words.columns:
+        word = words[i]
+        opens = word.str.contains('(', regex=False, na=False)
+        closes = word.str.contains(')', regex=False, na=False)
+        found = opens.to_numpy(dtype=bool) | (
+            found & ~closes.to_numpy(dtype=bool))
+        word = word.str.replace('(', '', regex=False).str.replace(
+            ')', '', regex=False)
+        units = units + (' ' + word + ' ').where(found & word.notna(), '')
+    units = units.str.strip().where(has_units, default_units)
+
     return {'names': names, 'units': units}
 
 
@@ -322,95 +432,42 @@ def strip_char(text):
     Removes the footnote chars from the text
     """
     text = text + " "
-    notes = ["f, g", " a ", " b ", " c ", " d ", " e ", " f ", " g ",
-             " h ", " i ", " j ", " k ", " l ", " b,c ", " h,i ", " f,g ",
-             ")a", ")b", ")f", ")k", "b,c", "h,i"]
-    for i in notes:
+    for i in FOOTNOTE_MARKS:
         if i in text:
             text_split = text.split(i)
             text = text_split[0]
 
-    footnotes = {'Gasolineb': 'Gasoline',
-                 'Trucksc': 'Trucks',
-                 'Boatsd': 'Boats',
-                 'Boatse': 'Boats',
-                 'Fuelsb': 'Fuels',
-                 'Fuelsf': 'Fuels',
-                 'Consumptiona': 'Consumption',
-                 'Aircraftg': 'Aircraft',
-                 'Pipelineh': 'Pipeline',
-                 'Electricityh': 'Electricity',
-                 'Electricityl': 'Electricity',
-                 'Ethanoli': 'Ethanol',
-                 'Biodieseli': 'Biodiesel',
-                 'Changee': 'Change',
-                 'Emissionsc': 'Emissions',
-                 'Equipmentd': 'Equipment',
-                 'Equipmente': 'Equipment',
-                 'Totalf': 'Total',
-                 'Roadg': 'Road',
-                 'Otherf': 'Other',
-                 'Railc': 'Rail',
-                 'Usesb': 'Uses',
-                 'Substancesd': 'Substances',
-                 'Territoriesa': 'Territories',
-                 'Roadb': 'Road',
-                 'Raile': 'Rail',
-                 'LPGf': 'LPG',
-                 'Gasf': 'Gas',
-                 'Gasolinec': 'Gasoline',
-                 'Gasolinef': 'Gasoline',
-                 'Fuelf': 'Fuel',
-                 'Amendmenta': 'Amendment',
-                 'Residue Nb': 'Residue N',
-                 'Residue Nd': 'Residue N',
-                 'Landa': 'Land',
-                 'Landb': 'Land',
-                 'landb': 'land',
-                 'landc': 'land',
-                 'landd': 'land',
-                 'Settlementsc': 'Settlements',
-                 'Wetlandse': 'Wetlands',
-                 'Settlementsf': 'Settlements',
-                 'Totali': 'Total',
-                 'Othersa': 'Others',
-                 'N?O': 'N2O',
-                 'Distillate Fuel Oil (Diesel)': 'Distillate Fuel Oil',
-                 'Distillate Fuel Oil (Diesel': 'Distillate Fuel Oil',
-                 'Natural gas': 'Natural Gas', # Fix capitalization inconsistency
-                 'HGLb': 'HGL',
-                 'Biofuels-Biodieselh' : 'Biofuels-Biodiesel',
-                 'Biofuels-Ethanolh' : 'Biofuels-Ethanol',
-                 'Commercial Aircraftf' : 'Commercial Aircraft',
-                 'Electricityk': 'Electricity',
-                 'Gasolinea' : 'Gasoline',
-                 'International Bunker Fuelse' : 'International Bunker Fuel',
-                 'Medium- and Heavy-Duty Trucksb' : 'Medium- and Heavy-Duty Trucks',
-                 'Pipelineg' : 'Pipeline',
-                 'Recreational Boatsc' :'Recreational Boats',
-                 'Construction/Mining Equipmentf' : 'Construction/Mining Equipment',
-                 'Non-Roadc' : 'Non-Road',
-                 'HFCsa': 'HFCs',
-                 'HFOsb': 'HFOs',
-                 'CO_{2}': 'CO2',
-                 'CH?^{c}': 'CH4',
-                 'N_{2} O^{c}': 'N2O',
-                 'N_{2} O': 'N2O',
-                 'SF?': 'SF6',
-                 'NF?': 'NF3',
-                 'CH_{4}': 'CH4',
-                 'Total e,j': 'Total',
-                 'Naphtha (<401Â° F)': 'Naphtha (<401° F)',
-                 'Other Oil (>401Â° F)': 'Other Oil (>401° F)',
-                 }
     text = re.sub(r"\^\{[a-zA-Z]\}", "", text)
 
-    for key in footnotes:
-        text = text.replace(key, footnotes[key])
+    for key in FOOTNOTES:
+        text = text.replace(key, FOOTNOTES[key])
 
     return ' '.join(text.split()) # remove extra spaces between words
 
 
+def series_strip_char(series):
+    """
+    Removes the footnote chars from each value in a series, equivalent to
+    series.apply(strip_char). The string operations run once per unique
+    value.
+    :param series: df column of str
+    :return: series of str
+    """
+    codes, uniques = pd.factorize(series)
+    text = pd.Series(uniques, dtype=object) + " "
+    for i in FOOTNOTE_MARKS:
+        text = text.str.split(i, n=1, regex=False).str[0]
+
+    text = text.str.replace(r"\^\{[a-zA-Z]\}", "", regex=True)
+
+    for key, value in FOOTNOTES.items():
+        text = text.str.replace(key, value, regex=False)
+
+    text = text.str.split().str.join(' ')
+    # codes of -1 (null values) are not in the index and return NaN
+    return pd.Series(text.reindex(codes).to_numpy(), index=series.index,
+                     dtype=object)
+
 
 def ghg_parse(*, df_list, year, config, **_):
     """
@@ -464,29 +521,29 @@ def ghg_parse(*, df_list, year, config, **_):
             df = df.melt(id_vars=id_vars, var_name="FlowName",
                          value_name="FlowAmount")
             df["Year"] = year
-            for index, row in df.iterrows():
-                col_name = row['FlowName']
-                acb = row['ActivityConsumedBy'].strip()
-                name_split = col_name.split(" (")
-                source = name_split[1].split('- ')[1]
-                # Append column name after dash to activity
-                activity = f"{acb.strip()} {name_split[1].split('- ')[1]}"
-
-                df.loc[index, 'Description'] = meta['desc']
-                if name_split[0] == "Emissions":
-                    df.loc[index, 'FlowName'] = meta['emission']
-                    df.loc[index, 'Unit'] = meta['emission_unit']
-                    df.loc[index, 'Class'] = meta['emission_class']
-                    df.loc[index, 'Compartment'] = meta['emission_compartment']
-                    df.loc[index, 'ActivityProducedBy'] = activity
-                    df.loc[index, 'ActivityConsumedBy'] = "None"
-                else: # "Consumption"
-                    df.loc[index, 'FlowName'] = acb
-                    df.loc[index, 'FlowType'] = "TECHNOSPHERE_FLOW"
-                    df.loc[index, 'Unit'] = meta['unit']
-                    df.loc[index, 'Class'] = meta['class']
-                    df.loc[index, 'ActivityProducedBy'] = "None"
-                    df.loc[index, 'ActivityConsumedBy'] = source
+            acb = df['ActivityConsumedBy'].str.strip()
+            name_split = df['FlowName'].str.split(" (", regex=False)
+            source = name_split.str[1].str.split('- ', regex=False).str[1]
+            # Append column name after dash to activity
+            activity = acb + ' ' + source
+            emissions = name_split.str[0] == "Emissions"
+            consumption = ~emissions
+
+            df['Description'] = meta['desc']
+            if emissions.any():
+                df.loc[emissions, 'FlowName'] = meta['emission']
+                df.loc[emissions, 'Unit'] = meta['emission_unit']
+                df.loc[emissions, 'Class'] = meta['emission_class']
+                df.loc[emissions, 'Compartment'] = meta['emission_compartment']
+                df.loc[emissions, 'ActivityProducedBy'] = activity
+                df.loc[emissions, 'ActivityConsumedBy'] = "None"
+            if consumption.any():
+                df.loc[consumption, 'FlowName'] = acb
+                df.loc[consumption, 'FlowType'] = "TECHNOSPHERE_FLOW"
+                df.loc[consumption, 'Unit'] = meta['unit']
+                df.loc[consumption, 'Class'] = meta['class']
+                df.loc[consumption, 'ActivityProducedBy'] = "None"
+                df.loc[consumption, 'ActivityConsumedBy'] = source
 
         else:
             # Standard years (one or more) as column headers
@@ -546,71 +603,54 @@ def ghg_parse(*, df_list, year, config, **_):
         source_activity_2 = config.get('source_activity_2')
         rows_as_flows = config.get('rows_as_flows')
 
+        # Header rows (e.g., a chemical or sector) apply to the rows that
+        # follow them: header values are masked in, forward filled to the
+        # rows below and reassigned by mask
         if table_name in multi_chem_names:
-            bool_apb = False
-            bool_LULUCF = False
-            apbe_value = ""
             flow_name_list = ["CO2", "CH4", "N2O", "NF3", "HFCs", "PFCs",
                               "SF6", "NF3", "CH4 a", "N2O b", "CO", "NOx"]
-            for index, row in df.iterrows():
-                apb_value = strip_char(row["ActivityProducedBy"])
-                if "CH4" in apb_value:
-                    apb_value = "CH4"
-                elif "N2O" in apb_value and apb_value != "N2O from Product Uses":
-                    apb_value = "N2O"
-                elif "CO2" in apb_value:
-                    apb_value = "CO2"
-
-                if apb_value in flow_name_list:
-                    if bool_LULUCF:
-                        df = df.drop(index)
-                    else:
-                        apbe_value = apb_value
-                        df.loc[index, 'FlowName'] = apbe_value
-                        df.loc[index, 'ActivityProducedBy'] = "All activities"
-                        bool_apb = True
-                elif apb_value.startswith('LULUCF'):
-                    df.loc[index, 'FlowName'] = 'CO2e'
-                    df.loc[index, 'ActivityProducedBy'] = strip_char(apb_value)
-                    bool_LULUCF = True
-                elif apb_value.startswith(('Total', 'Net')):
-                    df = df.drop(index)
-                else:
-                    apb_txt = df.loc[index, 'ActivityProducedBy']
-                    apb_txt = strip_char(apb_txt)
-                    df.loc[index, 'ActivityProducedBy'] = apb_txt
-                    if bool_apb == True:
-                        df.loc[index, 'FlowName'] = apbe_value
+            apb_txt = series_strip_char(df["ActivityProducedBy"])
+            apb_value = pd.Series(np.select(
+                [apb_txt.str.contains("CH4", regex=False),
+                 apb_txt.str.contains("N2O", regex=False) &
+                 (apb_txt != "N2O from Product Uses"),
+                 apb_txt.str.contains("CO2", regex=False)],
+                ["CH4", "N2O", "CO2"], apb_txt), index=df.index)
+
+            is_flow = apb_value.isin(flow_name_list)
+            lulucf = ~is_flow & apb_value.str.startswith('LULUCF')
+            # chemicals following LULUCF rows are dropped
+            after_lulucf = lulucf.shift(fill_value=False).cummax()
+            header = is_flow & ~after_lulucf
+            apbe_value = apb_value.where(header).ffill()
+            other = ~is_flow & ~lulucf
+            drop = ((is_flow & after_lulucf) |
+                    (other & apb_value.str.startswith(('Total', 'Net'))))
+
+            df.loc[header, 'FlowName'] = apbe_value
+            df.loc[header, 'ActivityProducedBy'] = "All activities"
+            df.loc[lulucf, 'FlowName'] = 'CO2e'
+            df.loc[lulucf, 'ActivityProducedBy'] = series_strip_char(
+                apb_value[lulucf])
+            df.loc[other, 'ActivityProducedBy'] = apb_txt
+            df.loc[other & apbe_value.notna(), 'FlowName'] = apbe_value
+            df = df[~drop]
 
         elif table_name in source_No_activity:
-            apbe_value = ""
             flow_name_list = ["Industry", "Transportation", "U.S. Territories"]
-            for index, row in df.iterrows():
-                unit = row["Unit"]
-                if unit.strip() == "MMT  CO2":
-                    df.loc[index, 'Unit'] = "MMT CO2e"
-                if df.loc[index, 'Unit'] != "MMT CO2e":
-                    df = df.drop(index)
-                else:
-                    df.loc[index, 'FlowName'] = meta.get('flow')
-                    # use .join and split to remove interior spaces
-                    apb_value = " ".join(row["ActivityProducedBy"].split())
-                    apb_value = apb_value.replace("°", "")
-                    if apb_value in flow_name_list:
-                        # set header
-                        apbe_value = apb_value
-                        df.loc[index, 'ActivityProducedBy'
-                               ] = f"{apbe_value} All activities"
-                    else:
-                        # apply header
-                        apb_txt = strip_char(apb_value)
-                        df.loc[index, 'ActivityProducedBy'
-                               ] = f"{apbe_value} {apb_txt}"
-                    if "Total" == apb_value or "Total " == apb_value:
-                        df = df.drop(index)
+            df.loc[df['Unit'].str.strip() == "MMT  CO2", 'Unit'] = "MMT CO2e"
+            df = df[df['Unit'] == "MMT CO2e"]
+            df['FlowName'] = meta.get('flow')
+            # use .join and split to remove interior spaces
+            apb_value = (df["ActivityProducedBy"].str.split().str.join(" ")
+                         .str.replace("°", "", regex=False))
+            header = apb_value.isin(flow_name_list)
+            apbe_value = apb_value.where(header).ffill().fillna("")
+            df['ActivityProducedBy'] = (apbe_value + " " + series_strip_char(
+                apb_value).where(~header, "All activities"))
+            df = df[~apb_value.isin(["Total", "Total "])]
 
         elif table_name in (source_activity_1 + source_activity_1_fuel) :
-            apbe_value = ""
             activity_subtotal_sector = ["Electric Power", "Industrial", "Commercial",
                                  "Residential", "U.S. Territories",
                                  "Transportation",
@@ -630,31 +670,23 @@ def ghg_parse(*, df_list, year, config, **_):
                 activity_subtotal = activity_subtotal_sector
             else:
                 activity_subtotal = activity_subtotal_fuel
-            after_Total = False
-            for index, row in df.iterrows():
-                apb_value = strip_char(row["ActivityProducedBy"])
-                if apb_value in activity_subtotal or after_Total:
-                    # set the header
-                    apbe_value = apb_value
-                    df.loc[index, 'ActivityProducedBy'
-                           ] = f"All activities {apbe_value}"
-                else:
-                    # apply the header
-                    apb_txt = apb_value
-                    if table_name == "3-10":
-                        # Separate Flows and activities for this table
-                        df.loc[index, 'ActivityProducedBy'] = apbe_value
-                        df.loc[index, 'FlowName'] = apb_txt
-                    else:
-                        df.loc[index, 'ActivityProducedBy'
-                               ] = f"{apb_txt} {apbe_value}"
-                if apb_value.startswith("Total"):
-                    df = df.drop(index)
-                    after_Total = True
+            apb_value = series_strip_char(df["ActivityProducedBy"])
+            total = apb_value.str.startswith("Total")
+            # all rows following a total are headers
+            after_total = total.shift(fill_value=False).cummax()
+            header = apb_value.isin(activity_subtotal) | after_total
+            apbe_value = apb_value.where(header).ffill().fillna("")
+            if table_name == "3-10":
+                # Separate Flows and activities for this table
+                df.loc[~header, 'FlowName'] = apb_value
+                df['ActivityProducedBy'] = apbe_value.where(
+                    ~header, "All activities " + apbe_value)
+            else:
+                df['ActivityProducedBy'] = (apb_value + " " + apbe_value).where(
+                    ~header, "All activities " + apbe_value)
+            df = df[~total]
 
         elif table_name in source_activity_2:
-            bool_apb = False
-            apbe_value = ""
             flow_name_list = ["Explorationb", "Production", "Processing",
                               "Transmission and Storage", "Distribution",
                               "Post-Meter",
@@ -662,52 +694,35 @@ def ghg_parse(*, df_list, year, config, **_):
                               "Exploration", "Mobile AC",
                               "Refrigerated Transport",
                               "Comfort Cooling for Trains and Buses"]
-            for index, row in df.iterrows():
-                apb_value = row["ActivityProducedBy"]
-                start_activity = row["FlowName"]
-                if apb_value.strip() in flow_name_list:
-                    apbe_value = apb_value
-                    if apbe_value == "Explorationb":
-                        apbe_value = "Exploration"
-                    df.loc[index, 'FlowName'] = start_activity
-                    df.loc[index, 'ActivityProducedBy'] = apbe_value
-                    bool_apb = True
-                else:
-                    if bool_apb == True:
-                        df.loc[index, 'FlowName'] = start_activity
-                        apb_txt = df.loc[index, 'ActivityProducedBy']
-                        apb_txt = strip_char(apb_txt)
-                        if apb_txt == "Gathering and Boostingc":
-                            apb_txt = "Gathering and Boosting"
-                        df.loc[index, 'ActivityProducedBy'
-                               ] = f"{apbe_value} - {apb_txt}"
-                    else:
-                        apb_txt = df.loc[index, 'ActivityProducedBy']
-                        apb_txt = strip_char(apb_txt)
-                        df.loc[index, 'ActivityProducedBy'
-                               ] = f"{apb_txt} {apbe_value}"
-                if "Total" == apb_value or "Total " == apb_value:
-                    df = df.drop(index)
+            apb_value = df["ActivityProducedBy"]
+            header = apb_value.str.strip().isin(flow_name_list)
+            apbe_value = (apb_value.where(header)
+                          .replace("Explorationb", "Exploration").ffill())
+            apb_txt = series_strip_char(apb_value).replace(
+                "Gathering and Boostingc", "Gathering and Boosting")
+            # rows before the first header keep their activity name
+            before_header = apbe_value.isna()
+            apbe_value = apbe_value.fillna("")
+            df['ActivityProducedBy'] = (
+                (apbe_value + " - " + apb_txt)
+                .where(~before_header, series_strip_char(apb_value) + " ")
+                .where(~header, apbe_value))
+            df = df[~apb_value.isin(["Total", "Total "])]
 
         elif table_name == "A-69":
-            fuel_name = ""
             A_79_unit_dict = {'Natural Gas': 'trillion cubic feet',
                               'Electricity': 'million kilowatt-hours'}
             df.loc[:, 'FlowType'] = 'TECHNOSPHERE_FLOW'
-            for index, row in df.iterrows():
-                if row["ActivityConsumedBy"].startswith(' '):
-                    # indicates subcategory
-                    df.loc[index, 'ActivityConsumedBy'] = strip_char(
-                        df.loc[index, 'ActivityConsumedBy'])
-                    df.loc[index, 'FlowName'] = fuel_name
-                else:
-                    # fuel header
-                    fuel_name = df.loc[index, 'ActivityConsumedBy']
-                    fuel_name = strip_char(fuel_name.split('(')[0])
-                    df.loc[index, 'ActivityConsumedBy'] = "All activities"
-                    df.loc[index, 'FlowName'] = fuel_name
-                if fuel_name in A_79_unit_dict.keys():
-                    df.loc[index, 'Unit'] = A_79_unit_dict[fuel_name]
+            # rows starting with a space are subcategories of a fuel header
+            subcategory = df["ActivityConsumedBy"].str.startswith(' ')
+            fuel_name = (series_strip_char(
+                df["ActivityConsumedBy"].str.split('(', regex=False).str[0])
+                         .where(~subcategory).ffill().fillna(""))
+            df['ActivityConsumedBy'] = series_strip_char(
+                df['ActivityConsumedBy']).where(subcategory, "All activities")
+            df['FlowName'] = fuel_name
+            has_unit = fuel_name.isin(A_79_unit_dict.keys())
+            df.loc[has_unit, 'Unit'] = fuel_name[has_unit].map(A_79_unit_dict)
 
         else:
             if table_name in ["4-55"]:
@@ -716,35 +731,31 @@ def ghg_parse(*, df_list, year, config, **_):
                 df.loc[:, 'FlowName'] = df.loc[:, 'ActivityProducedBy']
 
             elif table_name in ["4-118", "4-132"]:
-                df = df.iloc[::-1] # reverse the order for assigning APB
-                for index, row in df.iterrows():
-                    apb_value = strip_char(row["ActivityProducedBy"])
-                    if apb_value.startswith('Total'):
-                        # set the header
-                        apbe_value = apb_value.replace('Total ','')
-                        df = df.drop(index)
-                    else:
-                        if apbe_value == 'N2O':
-                            df.loc[index, 'ActivityProducedBy'] = (
-                                re.findall(r'\(.*?\)', apb_value)[0][1:-1])
-                            df.loc[index, 'FlowName'] = 'N2O'
-                        else:
-                            df.loc[index, 'ActivityProducedBy'] = apbe_value
-                            df.loc[index, 'FlowName'] = apb_value
-                df = df.iloc[::-1] # revert the order
+                apb_value = series_strip_char(df["ActivityProducedBy"])
+                total = apb_value.str.startswith('Total')
+                # total rows are headers for the rows above them
+                apbe_value = (apb_value.where(total)
+                              .str.replace('Total ', '', regex=False).bfill())
+                n2o = ~total & (apbe_value == 'N2O')
+                other = ~total & ~n2o
+                df.loc[n2o, 'ActivityProducedBy'] = apb_value[n2o].str.extract(
+                    r'\((.*?)\)', expand=False)
+                df.loc[n2o, 'FlowName'] = 'N2O'
+                df.loc[other, 'ActivityProducedBy'] = apbe_value
+                df.loc[other, 'FlowName'] = apb_value
+                df = df[~total]
 
             elif table_name in rows_as_flows:
                 # Table with flow names as Rows
-                df.loc[:, 'FlowName'] = (df.loc[:, 'ActivityProducedBy']
-                                         .apply(lambda x: strip_char(x)))
+                df.loc[:, 'FlowName'] = series_strip_char(
+                    df.loc[:, 'ActivityProducedBy'])
                 df = df[~df['FlowName'].str.contains("Total")]
                 df.loc[:, 'ActivityProducedBy'] = meta.get('activity')
 
             elif table_name in ["4-16", "4-124"]:
                 # Remove notes from activity names
-                for index, row in df.iterrows():
-                    apb_value = strip_char(row["ActivityProducedBy"].split("(")[0])
-                    df.loc[index, 'ActivityProducedBy'] = apb_value
+                df['ActivityProducedBy'] = series_strip_char(
+                    df["ActivityProducedBy"].str.split("(", regex=False).str[0])
 
         df['ActivityProducedBy'] = df['ActivityProducedBy'].str.strip()
         df['ActivityConsumedBy'] = df['ActivityConsumedBy'].str.strip()
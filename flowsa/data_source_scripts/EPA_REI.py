@@ -121,7 +121,8 @@ def primary_factors_parse(*, df_list, year, **_):
                   .reset_index(drop=True)
                   )
             # Assign final row as Post-consumer
-            df['ActivityProducedBy'].iloc[-1] = 'Estimate from Post-Consumer Waste'
+            df.loc[df.index[-1], 'ActivityProducedBy'] = \
+                'Estimate from Post-Consumer Waste'
             df = (df
                   .melt(id_vars=['Description', 'ActivityProducedBy'],
                         var_name='FlowName',
@@ -6,21 +6,32 @@ Functions to access data from stewi and stewicombo for use in flowbysector
 
 These functions are called if referenced in flowbysectormethods as
 data_format FBS_outside_flowsa with the function specified in FBS_datapull_fxn
+
+Facility locations (FIPS) and NAICS are read from a facility index shared by
+all stewi based methods: one parquet per inventory and year of facilities
+with their NAICS and FIPS, and one per inventory of the primary NAICS of
+each FRS facility, saved in facilityindexpath on first use. Index files are
+versioned by the flowsa and stewi versions that built them, delete them to
+rebuild the index after regenerating stewi inventories locally.
 """
 
 import sys
 import os
+from importlib import metadata
 import pandas as pd
 import numpy as np
-from esupy.processed_data_mgmt import read_source_metadata
+from esupy.processed_data_mgmt import read_source_metadata, find_file, \
+    mkdir_if_missing
 
 import flowsa.flowbysector
+from flowsa import dependencies
 from flowsa.flowbysector import FlowBySector
 from flowsa.flowbyactivity import FlowByActivity
 from flowsa.flowbyfunctions import assign_fips_location_system
 from flowsa.flowsa_log import log
 from flowsa.location import apply_county_FIPS, update_geoscale
-from flowsa.settings import process_adjustmentpath
+from flowsa.settings import process_adjustmentpath, facilityindexpath, \
+    PKG_VERSION_NUMBER, WRITE_FORMAT
 from flowsa.naics import convert_naics_year
 import stewicombo
 import stewi
@@ -28,6 +39,16 @@ from stewicombo.globals import addChemicalMatches, compile_metadata,\
     set_stewicombo_meta
 import facilitymatcher
 
+try:
+    import pyarrow.parquet as pq
+except ModuleNotFoundError:
+    pq = None
+
+# rows of a local stewicombo inventory read at once
+INVENTORY_CHUNK_ROWS = 1_000_000
+# stewicombo inventory columns not used in the FBS
+STEWICOMBO_DROP_COLUMNS = ['SRS_CAS', 'SRS_ID', 'FacilityIDs_Combined']
+
 
 def stewicombo_to_sector(
         config,
@@ -55,34 +76,31 @@ def stewicombo_to_sector(
     inventory_name = config.get('local_inventory_name')
     config['full_name'] = full_name
 
-    df = None
+    facility_mapping = extract_facility_data(config['inventory_dict'])
+    all_NAICS = obtain_NAICS_from_facility_matcher(
+        list(config['inventory_dict'].keys()))
+
+    # assign facility information and NAICS based on facility IDs, one chunk
+    # of the inventory at a time
+    df_list = []
     if inventory_name is not None:
-        df = stewicombo.getInventory(inventory_name,
-                                     download_if_missing=True)
-    if df is None:
+        df_list = [assign_naics_to_stewicombo(df, all_NAICS, facility_mapping)
+                   for df in stewicombo_inventory_chunks(inventory_name)]
+    if not df_list:
         # run stewicombo to combine inventories, filter for LCI, remove overlap
         log.info('generating inventory in stewicombo')
         df = stewicombo.combineFullInventories(
             config['inventory_dict'], filter_for_LCI=True,
             remove_overlap=True, compartments=config.get('compartments'))
+        if df is not None:
+            df_list = [assign_naics_to_stewicombo(
+                df.drop(columns=STEWICOMBO_DROP_COLUMNS),
+                all_NAICS, facility_mapping)]
 
-    if df is None:
+    if not df_list:
         # Inventories not found for stewicombo, return empty FBS
         return
-
-    facility_mapping = extract_facility_data(config['inventory_dict'])
-
-    # merge dataframes to assign facility information based on facility IDs
-    df = (df.drop(columns=['SRS_CAS', 'SRS_ID', 'FacilityIDs_Combined'])
-            .merge(facility_mapping.loc[:, facility_mapping.columns != 'NAICS'],
-                   how='inner',
-                   on='FacilityID')
-          )
-
-    all_NAICS = obtain_NAICS_from_facility_matcher(
-        list(config['inventory_dict'].keys()))
-
-    df = assign_naics_to_stewicombo(df, all_NAICS, facility_mapping)
+    df = pd.concat(df_list, ignore_index=True)
 
     if 'reassign_process_to_sectors' in config:
         df = reassign_process_to_sectors(
@@ -190,8 +208,9 @@ def reassign_process_to_sectors(df, year, file_list, external_config_path):
                     .drop(columns=['_CompartmentPrimary'], errors='ignore')
                     )
 
-    # merge in NAICS data
-    facility_df = (df.filter(['FacilityID', 'NAICS', 'Location'])
+    # merge in NAICS data of the facilities with adjusted processes
+    facility_df = (df.loc[df['FacilityID'].isin(df_fbp['FacilityID']),
+                          ['FacilityID', 'NAICS', 'Location']]
                      .reset_index(drop=True)
                      .drop_duplicates(keep='first'))
     df_fbp = df_fbp.merge(facility_df, how='left', on='FacilityID')
@@ -224,18 +243,85 @@ def reassign_process_to_sectors(df, year, file_list, external_config_path):
     return df
 
 
-def extract_facility_data(inventory_dict):
+def stewicombo_inventory_chunks(inventory_name,
+                                chunk_rows=INVENTORY_CHUNK_ROWS):
     """
-    Returns df of facilities from each inventory in inventory_dict,
-    including FIPS code
-    :param inventory_dict: a dictionary of inventory types and years (e.g.,
-                {'NEI':'2017', 'TRI':'2017'})
+    Yields a stewicombo inventory in chunks of rows, without the columns
+    not used in the FBS. Locally stored parquet inventories are read chunk
+    by chunk (requires pyarrow), others are loaded whole with
+    stewicombo.getInventory(), downloading them if missing.
+    :param inventory_name: str, name of the stewicombo inventory file (e.g.,
+        'CAP_HAP_national_2017_v0.9.7_5cf36c0.parquet' or
+        'CAP_HAP_national_2017')
+    :param chunk_rows: int, rows per chunk
+    :return: generator of df, empty if the inventory is not found
+    """
+    path = find_file(set_stewicombo_meta(inventory_name),
+                     stewicombo.globals.paths)
+    if pq is not None and path and str(path).endswith('.parquet'):
+        log.info(f'Reading {inventory_name} in chunks of {chunk_rows} rows')
+        file = pq.ParquetFile(path)
+        columns = [c for c in file.schema_arrow.names
+                   if c not in STEWICOMBO_DROP_COLUMNS]
+        for batch in file.iter_batches(batch_size=chunk_rows,
+                                       columns=columns):
+            yield batch.to_pandas()
+        return
+    df = stewicombo.getInventory(inventory_name, download_if_missing=True)
+    if df is not None:
+        yield df.drop(columns=STEWICOMBO_DROP_COLUMNS, errors='ignore')
+
+
+def _stewi_version():
+    """Installed version of stewi, for the facility index file names"""
+    try:
+        return metadata.version('StEWI')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def facility_index_path(name):
+    """
+    Path of a facility index file
+    :param name: str, e.g., 'TRI_2017_facilities'
+    :return: Path
+    """
+    return facilityindexpath / (f'{name}_v{PKG_VERSION_NUMBER}_stewi'
+                                f'{_stewi_version()}.{WRITE_FORMAT}')
+
+
+def _load_facility_index(name, build):
+    """
+    Load a facility index file, building and saving it if missing
+    :param name: str, name of the index file, see facility_index_path()
+    :param build: function returning the index df
     :return: df
     """
-    facilities_list = []
-    # load facility data from stewi output directory, keeping only the
-    # facility IDs, and geographic information
-    for database, year in inventory_dict.items():
+    path = facility_index_path(name)
+    if path.exists():
+        log.debug(f'Loading {name} from {path}')
+        df = pd.read_parquet(path)
+    else:
+        df = build()
+        mkdir_if_missing(facilityindexpath)
+        df.to_parquet(path, index=False)
+        log.info(f'Saved {name} to {path}')
+    dependencies.record_file('facility_index', path)
+    return df
+
+
+@dependencies.cached
+def _inventory_facilities(database, year):
+    """
+    Facilities of an inventory year with their NAICS and FIPS code, from
+    the facility index
+    :param database: str, inventory (e.g., 'TRI')
+    :param year: str, inventory year
+    :return: df, FacilityID, State, County, NAICS and Location
+    """
+    def build():
+        # load facility data from stewi output directory, keeping only the
+        # facility IDs, and geographic information
         facilities = stewi.getInventoryFacilities(database, year,
                                                   download_if_missing=True)
         facilities = facilities[['FacilityID', 'State', 'County', 'NAICS']]
@@ -245,50 +331,81 @@ def extract_facility_data(inventory_dict):
                       'keeping first listed')
             facilities = facilities.drop_duplicates(subset='FacilityID',
                                                     keep='first')
-        facilities_list.append(facilities)
+        return (facilities.reset_index(drop=True)
+                .pipe(apply_county_FIPS))
+
+    return _load_facility_index(f'{database}_{year}_facilities', build)
+
+
+@dependencies.cached
+def _inventory_FRS_NAICS(database):
+    """
+    Primary NAICS of the FRS facilities of an inventory, from the facility
+    index, excluding FRS facilities with more than one primary NAICS
+    :param database: str, inventory (e.g., 'TRI')
+    :return: df, FRS_ID, Source and NAICS
+    """
+    def build():
+        # Access NAICS From facility matcher and assign based on FRS_ID
+        all_NAICS = \
+            facilitymatcher.get_FRS_NAICSInfo_for_facility_list(
+                frs_id_list=None, inventories_of_interest_list=[database],
+                download_if_missing=True)
+        all_NAICS = (all_NAICS
+                     .query('PRIMARY_INDICATOR == "PRIMARY"')
+                     .drop(columns=['PRIMARY_INDICATOR']))
+        # keep only FRS with a single NAICS
+        return (all_NAICS[~all_NAICS.duplicated(subset=['FRS_ID', 'Source'],
+                                                keep=False)]
+                .reset_index(drop=True))
+
+    return _load_facility_index(f'{database}_FRS_NAICS', build)
+
 
-    facility_mapping = pd.concat(facilities_list, ignore_index=True)
-    return facility_mapping.pipe(apply_county_FIPS)
+def extract_facility_data(inventory_dict):
+    """
+    Returns df of facilities from each inventory in inventory_dict,
+    including FIPS code
+    :param inventory_dict: a dictionary of inventory types and years (e.g.,
+                {'NEI':'2017', 'TRI':'2017'})
+    :return: df
+    """
+    return pd.concat([_inventory_facilities(database, str(year))
+                      for database, year in inventory_dict.items()],
+                     ignore_index=True)
 
 
 def obtain_NAICS_from_facility_matcher(inventory_list):
     """
     Returns dataframe of all facilities with included in inventory_list with
-    their first or primary NAICS.
+    their primary NAICS, excluding facilities with more than one primary
+    NAICS.
     :param inventory_list: a list of inventories (e.g., ['NEI', 'TRI'])
     :return: df
     """
-    # Access NAICS From facility matcher and assign based on FRS_ID
-    all_NAICS = \
-        facilitymatcher.get_FRS_NAICSInfo_for_facility_list(
-            frs_id_list=None, inventories_of_interest_list=inventory_list,
-            download_if_missing=True)
-    all_NAICS = (all_NAICS
-                 .query('PRIMARY_INDICATOR == "PRIMARY"')
-                 .drop(columns=['PRIMARY_INDICATOR']))
-    return all_NAICS
+    return pd.concat([_inventory_FRS_NAICS(database)
+                      for database in inventory_list],
+                     ignore_index=True)
 
 
 def assign_naics_to_stewicombo(df, all_NAICS, facility_mapping):
     """
-    Apply naics to combined inventory preferentially using FRS_ID.
-    When FRS_ID does not provide unique NAICS, then use NAICS assigned by
-    inventory source
+    Apply facility information and naics to combined inventory, keeping
+    only facilities in facility_mapping. NAICS are assigned preferentially
+    using FRS_ID. When FRS_ID does not provide unique NAICS, then use NAICS
+    assigned by inventory source
     :param df: combined inventory from stewicombo
-    :param all_NAICS: df of NAICS by FRS_ID
-    :param facility_mapping: df of NAICS by Facility_ID
+    :param all_NAICS: df of NAICS by FRS_ID, see
+        obtain_NAICS_from_facility_matcher()
+    :param facility_mapping: df of location and NAICS by Facility_ID, see
+        extract_facility_data()
     """
-    # first merge in NAICS by FRS, but only where the FRS has a single NAICS
-    df = df.merge(all_NAICS[~all_NAICS.duplicated(subset=['FRS_ID', 'Source'],
-                                                  keep=False)],
-                  how='left',
-                  on=['FRS_ID', 'Source'])
-
-    # next use NAICS from inventory sources
-    df = (df.merge(facility_mapping[['FacilityID', 'NAICS']],
-                   how='left',
-                   on='FacilityID',
-                   suffixes=(None, "_y"))
+    # merge in facility information and NAICS by FRS, then fill with NAICS
+    # from inventory sources
+    df = (df.merge(facility_mapping.rename(columns={'NAICS': 'NAICS_y'}),
+                   how='inner',
+                   on='FacilityID')
+            .merge(all_NAICS, how='left', on=['FRS_ID', 'Source'])
             .assign(NAICS = lambda x: x['NAICS'].fillna(x['NAICS_y']))
             .drop(columns=['NAICS_y'])
             .query('NAICS != "None"')
@@ -7,7 +7,7 @@ Common functions to clean and harmonize dataframes
 
 import pandas as pd
 import numpy as np
-from flowsa import (literature_values, settings, flowsa_log)
+from flowsa import (literature_values, settings, flowsa_log, dependencies)
 
 
 def clean_df(df, flowbyfields, drop_description=True):
@@ -86,6 +86,8 @@ def standardize_units(df):
         .get_Canadian_to_USD_exchange_rate(year)
     )
 
+    dependencies.record_file('crosswalks',
+                             settings.datapath / 'unit_conversion.csv')
     conversion_table = pd.concat([
         pd.read_csv(settings.datapath / 'unit_conversion.csv'),
         pd.Series({'old_unit': 'Canadian Dollar',
@@ -0,0 +1,360 @@
+# dependencies.py (flowsa)
+# !/usr/bin/env python3
+# coding=utf-8
+"""
+Content hashes of the inputs of FBA and FBS datasets, and rebuilding of the
+datasets whose inputs changed.
+
+While an FBA or FBS is generated, the files it reads are recorded with
+their sha256 in a tracking scope:
+
+- 'yaml': method yaml files, including !include'd files and activity set
+  indices
+- 'scripts': data_source_scripts and other modules referenced with
+  !script_function: and !clean_function:
+- 'crosswalks': crosswalks and other csv files in flowsa/data
+- 'facility_index': stewi facility index files, see stewiFBS.py
+- 'FlowByActivity' and 'FlowBySector': upstream datasets, with the output
+  hash recorded in their metadata (or the hash of the loaded data, when
+  the metadata has none)
+
+metadata.write_metadata() stores the recorded inputs under 'dependencies'
+and the hash of the dataset itself under 'output_hash'. rebuild_stale()
+compares the recorded hashes with the files and datasets currently on disk
+and regenerates the stale datasets, upstream datasets first:
+
+    flowsa rebuild --stale
+
+Results of cached functions (see cached()) replay the files read on the
+first call, so datasets generated later in the same session record them
+too.
+"""
+
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from functools import lru_cache, wraps
+from graphlib import TopologicalSorter
+from pathlib import Path
+import pandas as pd
+from flowsa.settings import MODULEPATH
+
+FILE_KINDS = ['yaml', 'scripts', 'crosswalks', 'facility_index']
+DATASET_KINDS = ['FlowByActivity', 'FlowBySector']
+
+# stack of open tracking scopes, inputs are recorded in the innermost scope.
+# A tuple in the context of each thread, so that threads generating datasets
+# at once do not push and pop each other's scopes
+_scopes = ContextVar('dependency_scopes', default=())
+
+
+@contextmanager
+def tracking():
+    """
+    Open a scope recording the inputs read while generating a dataset.
+    Scopes nest, so the inputs of an upstream dataset generated within the
+    scope are recorded in the upstream dataset's own scope.
+    :return: dict, kind: {name: hash}, filled as inputs are read
+    """
+    inputs = {}
+    token = _scopes.set((*_scopes.get(), inputs))
+    try:
+        yield inputs
+    finally:
+        _scopes.reset(token)
+
+
+def tracked(func):
+    """
+    Decorator running a function that generates a dataset in its own
+    tracking scope
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with tracking():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _innermost() -> dict or None:
+    scopes = _scopes.get()
+    return scopes[-1] if scopes else None
+
+
+def in_context(func):
+    """
+    Wrap a function run in worker threads, which start with an empty
+    context, to run in a copy of the calling thread's context, so that the
+    inputs read are recorded in the caller's scope
+    """
+    context = copy_context()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+    return wrapper
+
+
+def current() -> dict:
+    """
+    Inputs recorded so far in the innermost open scope
+    :return: dict, kind: {name: hash}, empty if no scope is open
+    """
+    scope = _innermost()
+    if scope is None:
+        return {}
+    return {k: dict(v) for k, v in scope.items()}
+
+
+def merge(inputs: dict):
+    """
+    Record inputs collected elsewhere (e.g., in a worker process) in the
+    innermost open scope
+    :param inputs: dict, kind: {name: hash}
+    """
+    scope = _innermost()
+    if scope is not None:
+        for kind, hashes in (inputs or {}).items():
+            scope.setdefault(kind, {}).update(hashes)
+
+
+def file_key(path) -> str:
+    """
+    Name of a file in the dependencies, relative to the flowsa package
+    where possible so that hashes compare across installations
+    :param path: str or Path
+    :return: str
+    """
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(MODULEPATH).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def file_path(key: str) -> Path:
+    """
+    Inverse of file_key()
+    :param key: str
+    :return: Path
+    """
+    path = Path(key)
+    return path if path.is_absolute() else MODULEPATH / path
+
+
+def file_hash(path) -> str or None:
+    """
+    sha256 of the contents of a file
+    :param path: str or Path
+    :return: str, hex digest, None if the file does not exist
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """
+    sha256 of the contents of a df (column names and values)
+    :param df: df
+    :return: str, hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update('|'.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy()
+                  .tobytes())
+    return digest.hexdigest()
+
+
+def record_file(kind: str, path):
+    """
+    Record a file read while generating a dataset
+    :param kind: str, one of FILE_KINDS
+    :param path: str or Path
+    """
+    scope = _innermost()
+    if scope is not None:
+        scope.setdefault(kind, {})[file_key(path)] = file_hash(path)
+
+
+def record_dataset(category: str, name: str, output_hash: str):
+    """
+    Record an upstream dataset loaded while generating a dataset
+    :param category: str, 'FlowByActivity' or 'FlowBySector'
+    :param name: str, name of the dataset (e.g., 'USDA_CoA_Cropland_2017')
+    :param output_hash: str, hash of the upstream dataset
+    """
+    scope = _innermost()
+    if scope is not None:
+        scope.setdefault(category, {})[name] = output_hash
+
+
+def cached(func):
+    """
+    Equivalent of lru_cache(maxsize=None) for functions that read inputs:
+    the inputs recorded on the first call with given arguments are recorded
+    again on each later call
+    """
+    inputs = {}
+
+    @lru_cache(maxsize=None)
+    def first_call(*args, **kwargs):
+        with tracking() as recorded:
+            result = func(*args, **kwargs)
+        inputs[(args, tuple(sorted(kwargs.items())))] = recorded
+        return result
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        result = first_call(*args, **kwargs)
+        merge(inputs.get((args, tuple(sorted(kwargs.items())))))
+        return result
+
+    wrapper.cache_clear = first_call.cache_clear
+    wrapper.cache_info = first_call.cache_info
+    return wrapper
+
+
+def changed_inputs(meta: dict, output_hashes: dict) -> list:
+    """
+    Inputs of a dataset that differ from those recorded in its metadata
+    :param meta: dict, metadata of the dataset
+    :param output_hashes: dict, (category, name): current output hash of
+        upstream datasets, None where unknown
+    :return: list of str, changed inputs
+    """
+    recorded = meta.get('tool_meta', {}).get('dependencies', {})
+    changed = []
+    for kind in FILE_KINDS:
+        for key, digest in recorded.get(kind, {}).items():
+            if file_hash(file_path(key)) != digest:
+                changed.append(key)
+    for kind in DATASET_KINDS:
+        for name, digest in recorded.get(kind, {}).items():
+            current_hash = output_hashes.get((kind, name))
+            if current_hash is not None and current_hash != digest:
+                changed.append(name)
+    return changed
+
+
+def local_fba_names() -> dict:
+    """
+    FBAs saved locally for the FBA methods in flowsa. Sources which parse to
+    multiple FBAs save each under its own name starting with the source
+    name (e.g., EPA_GHGI_T_2_1_2020), and each is assigned to the longest
+    matching source, see backfill.output_source().
+    :return: dict, FBA name: (source, year)
+    """
+    from flowsa.backfill import local_outputs
+    from flowsa.common import seeAvailableFlowByModels
+
+    available = seeAvailableFlowByModels('FBA', print_method=False)
+    names = {}
+    for source, years in available.items():
+        for year in years if isinstance(years, list) else []:
+            year = str(year)
+            for path in local_outputs(source, year, sources=list(available)):
+                name = path.name[:path.name.index(f'_{year}_v')]
+                names[f'{name}_{year}'] = (source, year)
+    return names
+
+
+def local_datasets() -> dict:
+    """
+    Locally generated datasets of the FBA and FBS methods in flowsa, with
+    their metadata
+    :return: dict, (category, name): (metadata, kwargs to regenerate)
+    """
+    from esupy.processed_data_mgmt import read_source_metadata
+    from flowsa.common import seeAvailableFlowByModels
+    from flowsa.metadata import set_fb_meta
+    from flowsa.settings import paths
+
+    datasets = {}
+    for name, (source, year) in local_fba_names().items():
+        meta = read_source_metadata(paths,
+                                    set_fb_meta(name, 'FlowByActivity'))
+        if meta is not None:
+            datasets[('FlowByActivity', name)] = (
+                meta, {'source': source, 'year': year})
+    for method in seeAvailableFlowByModels('FBS', print_method=False):
+        meta = read_source_metadata(paths, set_fb_meta(method, 'FlowBySector'))
+        if meta is not None:
+            datasets[('FlowBySector', method)] = (meta, {'method': method})
+    return datasets
+
+
+def regenerate(category: str, kwargs: dict):
+    """
+    Generate a dataset
+    :param category: str, 'FlowByActivity' or 'FlowBySector'
+    :param kwargs: dict, see local_datasets()
+    """
+    if category == 'FlowByActivity':
+        from flowsa import generateflowbyactivity
+        generateflowbyactivity.main(**kwargs)
+    else:
+        from flowsa.flowbysector import FlowBySector
+        FlowBySector.generateFlowBySector(**kwargs)
+
+
+def rebuild_stale(dry_run: bool = False,
+                  include_untracked: bool = False) -> list:
+    """
+    Regenerate the local datasets whose recorded inputs changed, in
+    topological order, so that each dataset is checked against its
+    upstream datasets after they are rebuilt
+    :param dry_run: bool, if True, report the stale datasets without
+        regenerating them. Downstream datasets are only reported if their
+        own inputs changed.
+    :param include_untracked: bool, if True, also regenerate datasets whose
+        metadata has no recorded dependencies (generated before inputs were
+        tracked, or downloaded)
+    :return: list of (category, name) of the stale datasets
+    """
+    from esupy.processed_data_mgmt import read_source_metadata
+    from flowsa.flowsa_log import log
+    from flowsa.metadata import set_fb_meta
+    from flowsa.settings import paths
+
+    datasets = local_datasets()
+    graph = {node: {(kind, name) for kind in DATASET_KINDS
+                    for name in meta.get('tool_meta', {})
+                    .get('dependencies', {}).get(kind, {})
+                    if (kind, name) in datasets}
+             for node, (meta, _) in datasets.items()}
+    output_hashes = {node: meta.get('tool_meta', {}).get('output_hash')
+                     for node, (meta, _) in datasets.items()}
+
+    stale = []
+    # FBAs parsed from the same source and year are regenerated together
+    regenerated = []
+    for node in TopologicalSorter(graph).static_order():
+        meta, kwargs = datasets[node]
+        category, name = node
+        if 'dependencies' not in meta.get('tool_meta', {}):
+            if not include_untracked:
+                log.info(f'No dependencies recorded for {name}, skipping')
+                continue
+            reason = 'no recorded dependencies'
+        else:
+            changed = changed_inputs(meta, output_hashes)
+            if not changed:
+                continue
+            reason = ', '.join(changed)
+        stale.append(node)
+        log.info(f'{name} {category} is stale: {reason}')
+        if dry_run:
+            continue
+        if (category, kwargs) not in regenerated:
+            regenerate(category, kwargs)
+            regenerated.append((category, kwargs))
+        meta = read_source_metadata(paths, set_fb_meta(name, category))
+        output_hashes[node] = (meta or {}).get('tool_meta', {}).get(
+            'output_hash')
+    return stale
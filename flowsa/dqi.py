@@ -1,11 +1,86 @@
 """
 Functions associated with data quality scoring
+
+Scores are assigned through lookups on precomputed keys (sector code to
+sector length and FIPS to FIPS scale), rather than by merging crosswalks
+onto the data, so that each score is computed in a single vectorized pass
+without copying the frame being scored.
 """
 import numpy as np
 import re
 import pandas as pd
+from flowsa import dependencies
+from flowsa.common import load_sector_length_cw_melt, load_crosswalk
+
+
+@dependencies.cached
+def sector_length_key(sector_source_year=None) -> pd.Series:
+    """
+    Lookup of sector code to sector length. Household and government codes
+    appear at several lengths and are assigned the shortest.
+    :param sector_source_year: str or int, NAICS year of the sector length
+        crosswalk, or None to use the year-agnostic Sector_Levels crosswalk
+    :return: pd.Series of int sector lengths, indexed by sector
+    """
+    if sector_source_year is None:
+        cw = load_crosswalk('Sector_Levels')[['Sector', 'SectorLength']]
+    else:
+        cw = load_sector_length_cw_melt(sector_source_year)
+    cw = cw.drop_duplicates(subset='Sector', keep='first')
+    return pd.Series(pd.to_numeric(cw['SectorLength']).to_numpy(),
+                     index=cw['Sector'].to_numpy())
+
+
+def sector_length_difference(source, target, sector_source_year=None):
+    """
+    Difference in sector length between source and target sectors
+    :param source: pd.Series, source sectors
+    :param target: pd.Series, target sectors
+    :param sector_source_year: see sector_length_key()
+    :return: np.array, target length minus source length (NaN if either
+        sector is not in the sector length crosswalk)
+    """
+    key = sector_length_key(sector_source_year)
+    return (target.map(key).to_numpy(dtype=float)
+            - source.map(key).to_numpy(dtype=float))
+
 
-from flowsa.common import load_sector_length_cw_melt
+def score_reliability_collection(reliability, collection, length_difference):
+    """
+    Data Reliability and Data Collection scores after mapping source sectors
+    to target sectors.
+
+    Data Reliability: If value maps to a different sector level than what
+    the data set provides (maps down), then change all 1/2 values to 3
+    because no longer direct representation (Non-verified data based on a
+    calculation). Leave values alone if maps up or no change.
+
+    Data Collection: If NAICS level drops, NAICS4 -> NAICS6, assign a score
+    of 5 because no longer know if % of establishments/activities
+    represented
+
+    :param reliability: pd.Series, DataReliability scores
+    :param collection: pd.Series, DataCollection scores
+    :param length_difference: np.array, target minus source sector length
+    :return: tuple of np.arrays, (DataReliability, DataCollection)
+    """
+    maps_down = length_difference > 0
+    return (np.where(maps_down & reliability.isin([1, 2]), 3, reliability),
+            np.where(maps_down, 5, collection))
+
+
+def score_technological_correlation(length_difference):
+    """
+    Technological correlation based on the difference between source and
+    target sector lengths, using
+    https://github.com/USEPA/esupy/blob/main/DataQualityPedigreeMatrix.md
+    as a guideline: 1 if the target is the same length or more aggregated
+    than the source, increasing by 1 for each additional digit up to 5.
+    :param length_difference: np.array, target minus source sector length
+    :return: np.array of int scores
+    """
+    # cast through pandas so that sectors missing from the crosswalk raise
+    return pd.Series(np.clip(length_difference + 1, 1, 5)).astype(int).to_numpy()
 
 
 def adjust_dqi_reliability_collection_scores(df, sector_source_year):
@@ -20,39 +95,9 @@ def adjust_dqi_reliability_collection_scores(df, sector_source_year):
     :param df:
     :return:
     """
+    reliability, collection = score_reliability_collection(
+        df['DataReliability'], df['DataCollection'],
+        sector_length_difference(df['source_naics'], df['target_naics'],
+                                 sector_source_year))
 
-    # assign two new columns to df, sector length for source and target naics
-    cw = load_sector_length_cw_melt(sector_source_year)
-    df2 = df.copy()
-    for c in ["source", "target"]:
-        df2 = (df2.merge(cw,
-                         how = "left",
-                         left_on = f"{c}_naics",
-                         right_on = "Sector"
-                         )
-               .drop(columns="Sector")
-               .rename(columns={"SectorLength": f"{c}Length"})
-               # drop the duplicates caused by household/gov codes, assign codes as shortest sector length
-               .drop_duplicates(subset=df.columns, keep='first')
-               )
-    # find difference in length between source and target naics
-    df2 = df2.assign(source_to_target_diff = df2['sourceLength'] - df2['targetLength'])
-
-    # Data Reliability
-    # If value maps to a different sector level than what the data set provides (maps down), then change all
-    # 1/2 values to 3 because no longer direct representation (Non-verified data based on a calculation).
-    # Leave values alone if maps up or no change.
-    df2['DataReliability'] = np.where(
-        (df2['source_to_target_diff'] < 0) & (df2['DataReliability'].isin([1, 2])),
-        3,
-        df2['DataReliability'])
-
-    # Data Collection
-    # If NAICS level drops, NAICS4 -> NAICS6, assign a score of 5 because no longer know if % of
-    # establishments/activities represented
-    df2['DataCollection'] = np.where(
-        df2['source_to_target_diff'] < 0,
-        5,
-        df2['DataCollection'])
-
-    return df2.drop(columns=['sourceLength', 'targetLength', 'source_to_target_diff'])
+    return df.assign(DataReliability=reliability, DataCollection=collection)
@@ -7,10 +7,14 @@ from typing import List, Literal, TypeVar, TYPE_CHECKING
 import pandas as pd
 import numpy as np
 import re
-from functools import partial, reduce
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, reduce, wraps
+from contextlib import contextmanager
+from contextvars import ContextVar
 from copy import deepcopy
 from flowsa import (settings, literature_values, flowsa_yaml, geo, schema,
-                    naics)
+                    naics, attribution, location, sharding, outofcore,
+                    arrowcompute, aggregation, dependencies, buildplan)
 from flowsa.common import get_catalog_info
 from flowsa.flowsa_log import log, vlog
 from flowsa.location import fips_number_key
@@ -27,11 +31,71 @@ NAME_SEP_CHAR = '.'
 # ^^^ Used to separate source/activity set names as part of 'full_name' attr
 
 
+# set while clean functions run, see function_socket()
+_string_locations = ContextVar('string_locations', default=False)
+
 with open(settings.datapath / 'flowby_config.yaml') as f:
     flowby_config = flowsa_yaml.load(f)
     # ^^^ Replaces schema.py
 
 
+def copy_on_write_available() -> bool:
+    '''
+    :return: bool, True if pandas has a copy-on-write mode (pandas >= 1.5)
+    '''
+    try:
+        pd.get_option('mode.copy_on_write')
+    except pd.errors.OptionError:
+        return False
+    return True
+
+
+def copy_on_write_enabled() -> bool:
+    '''
+    :return: bool, True if pandas copy-on-write mode is active
+    '''
+    return (copy_on_write_available()
+            and pd.get_option('mode.copy_on_write') is True)
+
+
+def copy_on_write(method):
+    '''
+    Decorator running a FlowBy pipeline method under pandas copy-on-write
+    mode, if settings.COPY_ON_WRITE. Within the pipeline, FlowBy.copy() and
+    the copies made by pandas methods are deferred, so chained methods share
+    column buffers until one of them writes to a column. Nested calls run in
+    the mode set by the outermost call, which copies its result once before
+    returning, so that data returned to the caller does not share buffers
+    with the input or with cached sources.
+    '''
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        if (not settings.COPY_ON_WRITE or not copy_on_write_available()
+                or copy_on_write_enabled()):
+            return method(*args, **kwargs)
+        # the option name is only checked when entering the context
+        with pd.option_context('mode.copy_on_write', True):
+            result = method(*args, **kwargs)
+        if isinstance(result, pd.DataFrame):
+            result = result.copy()
+        return result
+    return wrapper
+
+
+@contextmanager
+def copy_on_write_suspended():
+    '''
+    Leave pandas copy-on-write mode, if active, e.g. to generate an FBA
+    within FBS generation, as the FBA parse functions are not written for
+    copy-on-write
+    '''
+    if not copy_on_write_enabled():
+        yield
+        return
+    with pd.option_context('mode.copy_on_write', False):
+        yield
+
+
 # TODO: Should this be in the flowsa __init__.py?
 def get_flowby_from_config(
     name: str,
@@ -51,14 +115,14 @@ def get_flowby_from_config(
     external_data_path = config.get('external_data_path')
 
     if config.get('data_format') == 'FBA':
-        return FlowByActivity.return_FBA(
+        fb = FlowByActivity.return_FBA(
             full_name=name,
             config=config,
             download_ok=download_sources_ok,
             external_data_path=external_data_path
         )
     elif config.get('data_format') == 'FBS':
-        return FlowBySector.return_FBS(
+        fb = FlowBySector.return_FBS(
             method=name,
             config=config,
             external_config_path=external_config_path,
@@ -67,7 +131,7 @@ def get_flowby_from_config(
             external_data_path=external_data_path
         )
     elif config.get('data_format') == 'FBS_outside_flowsa':
-        return FlowBySector(
+        fb = FlowBySector(
             config['FBS_datapull_fxn'](
                 config=config,
                 external_config_path=external_config_path,
@@ -84,14 +148,22 @@ def get_flowby_from_config(
                          'within the method yaml. Data formats allowed: '
                          '"FBA", "FBS", "FBS_outside_flowsa".')
 
+    # if generating a method by state shard, only retain the shard's states
+    if config.get('shard') is not None:
+        fb = sharding.select_shard(fb, config['shard'])
+    return fb
+
 
 
 
 class _FlowBy(pd.DataFrame):
-    _metadata = ['full_name', 'config']
+    _metadata = ['full_name', 'config', 'diagnostics']
 
     full_name: str
     config: dict
+    diagnostics: pd.DataFrame
+    # ^^^ attribution diagnostics, one row per attribution step, see
+    #     attribution.conservation_diagnostics()
 
     def __init__(
         self,
@@ -132,6 +204,10 @@ class _FlowBy(pd.DataFrame):
                                       if field not in data.columns})
             else:
                 fields = {k: v for k, v in fields.items() if k in data.columns}
+            if ('Location' in data
+                    and location.is_integer_location(data['Location'])):
+                # retain integer-encoded FIPS, see encode_location()
+                fields = {**fields, 'Location': 'int32'}
 
             fill_na_dict = {
                 field: 0 if dtype in ['int', 'float'] else string_null
@@ -169,6 +245,9 @@ class _FlowBy(pd.DataFrame):
         object. Additional code below specifies how to propagate metadata under
         other circumstances, such as merging.
 
+        copy: as for other single FlowBy methods, but with a shallow copy of
+            config, so that config of the copy can be updated without
+            updating the original
         merge: use metadata of left FlowBy
         concat: for full_name or config, use the shared portion (possibly
             '' or {}); for other _metadata (if any), use values from the
@@ -176,6 +255,10 @@ class _FlowBy(pd.DataFrame):
         '''
         self = super().__finalize__(other, method=method, **kwargs)
 
+        if method == 'copy' and isinstance(getattr(self, 'config', None),
+                                           dict):
+            object.__setattr__(self, 'config', {**self.config})
+
         # When merging, use metadata from left FlowBy
         if method == 'merge':
             for attribute in self._metadata:
@@ -200,10 +283,18 @@ class _FlowBy(pd.DataFrame):
                 if all(v == getattr(x, 'config', {}).get(k)
                        for x in other.objs[1:])
             }
+            _diagnostics = [getattr(x, 'diagnostics', None)
+                            for x in other.objs]
+            _diagnostics = [d for d in _diagnostics
+                            if d is not None and len(d) > 0]
             object.__setattr__(self, 'full_name', _full_name)
             object.__setattr__(self, 'config', _config)
+            object.__setattr__(self, 'diagnostics',
+                               pd.concat(_diagnostics, ignore_index=True)
+                               if _diagnostics else pd.DataFrame())
             for attribute in [x for x in self._metadata
-                              if x not in ['full_name', 'config']]:
+                              if x not in ['full_name', 'config',
+                                           'diagnostics']]:
                 object.__setattr__(self, attribute,
                                    getattr(other.objs[0], attribute, None))
         return self
@@ -240,30 +331,47 @@ class _FlowBy(pd.DataFrame):
         attempt_list = (['import local', 'download', 'generate']
                         if download_ok else ['import local', 'generate'])
 
-        for attempt in attempt_list:
-            log.info(f'Attempting to {attempt} {file_metadata.name_data} '
-                     f'{file_metadata.category}')
-            if attempt == 'download':
-                esupy.processed_data_mgmt.download_from_remote(
+        df = buildplan.shared_dataset(file_metadata.category,
+                                      file_metadata.name_data,
+                                      external_data_path)
+        if df is not None:
+            log.info(f'Using {file_metadata.name_data} '
+                     f'{file_metadata.category} shared by the build plan')
+        else:
+            for attempt in attempt_list:
+                log.info(f'Attempting to {attempt} {file_metadata.name_data} '
+                         f'{file_metadata.category}')
+                if attempt == 'download':
+                    esupy.processed_data_mgmt.download_from_remote(
+                        file_metadata,
+                        paths
+                    )
+                if attempt == 'generate':
+                    with copy_on_write_suspended():
+                        flowby_generator()
+                df = esupy.processed_data_mgmt.load_preprocessed_output(
                     file_metadata,
                     paths
                 )
-            if attempt == 'generate':
-                flowby_generator()
-            df = esupy.processed_data_mgmt.load_preprocessed_output(
-                file_metadata,
-                paths
-            )
-            if df is None:
-                log.info(f'{file_metadata.name_data} {file_metadata.category} '
-                         f'not found in {paths.local_path}')
+                if df is None:
+                    log.info(f'{file_metadata.name_data} '
+                             f'{file_metadata.category} not found in '
+                             f'{paths.local_path}')
+                else:
+                    log.info(f'Successfully loaded {file_metadata.name_data} '
+                             f'{file_metadata.category} from {output_path}')
+                    break
             else:
-                log.info(f'Successfully loaded {file_metadata.name_data} '
-                         f'{file_metadata.category} from {output_path}')
-                break
-        else:
-            log.error(f'{file_metadata.name_data} {file_metadata.category} '
-                      f'could not be found locally, downloaded, or generated')
+                log.error(f'{file_metadata.name_data} '
+                          f'{file_metadata.category} could not be found '
+                          f'locally, downloaded, or generated')
+        if df is not None:
+            upstream = esupy.processed_data_mgmt.read_source_metadata(
+                paths, file_metadata)
+            dependencies.record_dataset(
+                file_metadata.category, file_metadata.name_data,
+                (upstream or {}).get('tool_meta', {}).get('output_hash')
+                or dependencies.frame_hash(df))
         fb = cls(df, full_name=full_name or '', config=config or {})
         return fb
 
@@ -287,6 +395,8 @@ class _FlowBy(pd.DataFrame):
             .get_Canadian_to_USD_exchange_rate(year or self.config['year'])
         )
 
+        dependencies.record_file('crosswalks',
+                                 settings.datapath / 'unit_conversion.csv')
         conversion_table = pd.concat([
             pd.read_csv(settings.datapath / 'unit_conversion.csv'),
             pd.Series({'old_unit': 'Canadian Dollar',
@@ -334,16 +444,28 @@ class _FlowBy(pd.DataFrame):
         :param *args, **kwargs: passed indiscriminately to the function or
             functions specified in self.config[socket_name].
         :return: transformed FlowBy dataset
+
+        Functions are passed, and load sources with, 5 digit FIPS Locations
+        even if the method sets integer_location (see encode_location()), and
+        the result is encoded again.
         '''
-        if socket_name in self.config:
-            if isinstance(self.config[socket_name], list):
-                return reduce(lambda fb, func: fb.pipe(func, *args, **kwargs),
-                              self.config[socket_name],
-                              self)
-            else:
-                return self.config[socket_name](self, *args, **kwargs)
-        else:
+        if socket_name not in self.config:
             return self
+        functions = self.config[socket_name]
+        if not isinstance(functions, list):
+            functions = [functions]
+        encoded = ('Location' in self.columns
+                   and location.is_integer_location(self['Location']))
+        token = _string_locations.set(True)
+        try:
+            fb = reduce(lambda fb, func: fb.pipe(func, *args, **kwargs),
+                        functions,
+                        self.decode_location() if encoded else self)
+        finally:
+            _string_locations.reset(token)
+        if encoded and isinstance(fb, _FlowBy):
+            fb = fb.encode_location()
+        return fb
 
     def conditional_method(
         self: FB,
@@ -376,6 +498,8 @@ class _FlowBy(pd.DataFrame):
         geoscale on the right (county geocodes are unmodified, state codes are
         generally padded with 3 zeros, and the "national" FIPS code is set to
         00000)
+        If the column is integer-encoded (see encode_location()), the
+        national code is 0 and state codes are FIPS // 1000 * 1000.
         :param to_geoscale: str, target geoscale
         :param column: str, column of FIPS codes to convert.
             Default = 'Location'
@@ -385,19 +509,69 @@ class _FlowBy(pd.DataFrame):
         if type(target_geoscale) == str:
             target_geoscale = geo.scale.from_string(target_geoscale)
 
+        integer = location.is_integer_location(self[column])
         if target_geoscale == geo.scale.NATIONAL:
             return self.assign(
-                **{column: geo.filtered_fips('national').FIPS.values[0]}
+                **{column: np.int32(0) if integer
+                   else geo.filtered_fips('national').FIPS.values[0]}
             )
         elif target_geoscale == geo.scale.STATE:
             return self.assign(
-                **{column: self[column].str.slice_replace(start=2, repl='000')}
+                **{column: location.fips_to_state(self[column]) if integer
+                   else self[column].str.slice_replace(start=2, repl='000')}
             )
         elif target_geoscale == geo.scale.COUNTY:
             return self
         else:
             log.error(f'No FIPS level corresponds to {target_geoscale}')
 
+    def encode_location(self: FB) -> FB:
+        """
+        Encode 5 digit FIPS codes in the Location column as int32, so that
+        geoscale roll-ups are arithmetic (state FIPS // 1000 * 1000, national
+        0) rather than string operations. Enabled by setting
+        `integer_location: True` in the method yaml. Locations are decoded
+        with decode_location() before FlowBy datasets are written or returned.
+        Datasets with non-FIPS locations, and datasets prepared within clean
+        functions (see function_socket()), are returned unchanged.
+        :return: FlowBy dataset with int32 Location
+        """
+        if (_string_locations.get()
+                or location.is_integer_location(self['Location'])):
+            return self
+        if not (self['LocationSystem'].str.startswith('FIPS').all()
+                and self['Location'].str.isdigit().all()):
+            log.warning(f'Location of {self.full_name} is not all FIPS, '
+                        f'retaining string Location')
+            return self
+        return self.assign(Location=location.fips_to_int(self['Location']))
+
+    def decode_location(self: FB) -> FB:
+        """
+        Decode an integer-encoded Location column (see encode_location())
+        to 5 digit, zero-padded FIPS codes
+        :return: FlowBy dataset with 5 digit fips
+        """
+        if not location.is_integer_location(self['Location']):
+            return self
+        return self.assign(Location=location.fips_to_str(self['Location']))
+
+    def match_location(self: FB, other: FB) -> 'tuple[FB, FB]':
+        """
+        Encode or decode the Location of other to match that of the calling
+        dataset (see encode_location()), so they can be merged on Location.
+        If other has non-FIPS Locations, the calling dataset is decoded.
+        :param other: FlowBy dataset
+        :return: tuple, the calling dataset and other
+        """
+        if location.is_integer_location(self['Location']):
+            other = other.encode_location()
+            if not location.is_integer_location(other['Location']):
+                self = self.decode_location()
+        else:
+            other = other.decode_location()
+        return self, other
+
     def select_by_fields(
         self: FB,
         selection_fields: dict = None,
@@ -573,6 +747,17 @@ class _FlowBy(pd.DataFrame):
                 if self[x].dtype == 'float' and x != 'FlowAmount'
             ]
 
+        if (outofcore.use_outofcore(self.config, len(self))
+                and 'Location' in columns_to_group_by):
+            # groups do not span states, so aggregate each state separately
+            return outofcore.map_partitions(
+                self,
+                lambda fb: fb.aggregate_flowby(columns_to_group_by,
+                                               columns_to_average,
+                                               retain_zeros, aggregate_ratios),
+                keys=location.fips_to_state(self['Location']),
+                sort_by=columns_to_group_by)
+
         if not retain_zeros:
             self = self.query('FlowAmount != 0')
             # ^^^ keep rows of zero values
@@ -584,29 +769,47 @@ class _FlowBy(pd.DataFrame):
         if len(self) == 0:
             log.warning('Error, dataframe is empty')
             return self
-        aggregated = (
-            fb
-            .assign(**{f'_{c}_weighted': fb[c] * fb.FlowAmount
-                    for c in columns_to_average},
-                    **{f'_{c}_weights': fb.FlowAmount * fb[c].notnull()
-                    for c in columns_to_average})
-            .groupby(columns_to_group_by, dropna=False)
-            .agg(sum)
-            .reset_index()
-        )
-        aggregated = (
-            aggregated
-            .assign(**{c: (aggregated[f'_{c}_weighted']
-                           / aggregated[f'_{c}_weights'])
-                       for c in columns_to_average})
-            .drop(columns=([*[f'_{c}_weighted' for c in columns_to_average],
-                            *[f'_{c}_weights' for c in columns_to_average]]))
-        )
+        aggregated = None
+        if arrowcompute.use_arrow(self.config):
+            weighted = (
+                fb
+                .assign(**{f'_{c}_weighted': fb[c] * fb.FlowAmount
+                        for c in columns_to_average},
+                        **{f'_{c}_weights': fb.FlowAmount * fb[c].notnull()
+                        for c in columns_to_average})
+            )
+            aggregated = arrowcompute.group_sum(
+                weighted, columns_to_group_by,
+                [c for c in weighted if c not in columns_to_group_by])
+        if aggregated is not None:
+            aggregated = type(self)(
+                aggregated, add_missing_columns=False,
+                **{attribute: getattr(self, attribute)
+                   for attribute in self._metadata})
+            aggregated = (
+                aggregated
+                .assign(**{c: (aggregated[f'_{c}_weighted']
+                               / aggregated[f'_{c}_weights'])
+                           for c in columns_to_average})
+                .drop(columns=(
+                    [*[f'_{c}_weighted' for c in columns_to_average],
+                     *[f'_{c}_weights' for c in columns_to_average]]))
+            )
+        else:
+            aggregated = aggregation.weighted_aggregate(
+                fb, columns_to_group_by,
+                sums=['FlowAmount'], means=columns_to_average,
+                weight='FlowAmount')
+            aggregated = aggregated[
+                [*columns_to_group_by,
+                 *[c for c in fb.columns if c not in columns_to_group_by]]]
         aggregated = aggregated.astype(
             {column: type for column, type
              in set([*flowby_config['all_fba_fields'].items(),
                      *flowby_config['all_fbs_fields'].items()])
-             if column in aggregated}
+             if column in aggregated
+             and not (column == 'Location'
+                      and location.is_integer_location(aggregated[column]))}
         )
         # ^^^ Need to convert back to correct dtypes after aggregating;
         #     otherwise, columns of NaN will become float dtype.
@@ -653,6 +856,7 @@ class _FlowBy(pd.DataFrame):
         if isinstance(attribute_config, dict):
             attribute_config = [attribute_config]
 
+        diagnostics = [getattr(self, 'diagnostics', None)]
         for index, step_config in enumerate(attribute_config):
             validate = True
             grouped: 'FB' = (
@@ -779,32 +983,34 @@ class _FlowBy(pd.DataFrame):
                              f"target sectors.")
                     attributed_fb = fb.equally_attribute()
 
+            # record conservation metrics for the attribution step and,
             # depending on att method, check that new df values equal
             # original df values
+            step_diagnostics, unconserved = (
+                attribution.conservation_diagnostics(
+                    fb, attributed_fb,
+                    FullName=self.full_name,
+                    Step=index,
+                    AttributionMethod=attribution_method,
+                    AttributionSource=fb['AttributionSources'].iloc[0]
+                    if len(fb) else None))
+            diagnostics.append(step_diagnostics)
             if validate and attribution_method not in [
                     'multiplication', 'inheritance', 'division']:
-                # todo: add results from this if statement to validation log
-                validation_fb = attributed_fb.assign(
-                    validation_total=(attributed_fb.groupby('group_id')
-                                      ['FlowAmount'].transform('sum'))
-                )
-                if not np.allclose(validation_fb.group_total,
-                                   validation_fb.validation_total,
-                                   equal_nan=True):
-                    errors = (validation_fb
-                              .query('validation_total != group_total')
-                              [['group_id',
-                                'ActivityProducedBy', 'ActivityConsumedBy',
-                                'SectorProducedBy', 'SectorConsumedBy', 'Location',
-                                'FlowAmount', 'group_total', 'validation_total']])
+                if len(unconserved) > 0:
                     log.error(f'Errors in attributing flows from '
-                              f'{self.full_name}:\n{errors}')
-                # calculate the percent change in df caused by attribution
-                fbsum = (fb[['group_id', 'group_total']]
-                         .drop_duplicates())['group_total'].sum()
-                attsum = (validation_fb[['group_id', 'validation_total']]
-                          .drop_duplicates())['validation_total'].sum()
-                percent_change = round(((attsum - fbsum)/fbsum)*100,3)
+                              f'{self.full_name}: totals of '
+                              f'{len(unconserved)} groups changed with '
+                              f'attribution. Set "attribution_diagnostics: '
+                              f'full" in the method yaml to log the rows.')
+                    if self.config.get('attribution_diagnostics') == 'full':
+                        vlog.debug('Errors in attributing flows from %s:'
+                                   '\n {}'.format(
+                                       attribution.conservation_errors(
+                                           attributed_fb, unconserved)
+                                       .to_string()), self.full_name)
+                # the percent change in df caused by attribution
+                percent_change = step_diagnostics['PercentChange'][0]
                 if percent_change == 0:
                     log.info(f"No change in {self.full_name} FlowAmount after "
                              "attribution.")
@@ -822,10 +1028,13 @@ class _FlowBy(pd.DataFrame):
                 attributed_fb
                 .drop(columns=['group_id', 'group_total', 'group_count',
                                'FlowAmount_ds', 'factor', 'Suppressed',
-                               'descendants'], errors='ignore')
+                               'descendant_node'], errors='ignore')
                 .drop(columns=step_config.get('drop_columns', []))
             )
 
+        diagnostics = [d for d in diagnostics if d is not None and len(d) > 0]
+        if diagnostics:
+            self.diagnostics = pd.concat(diagnostics, ignore_index=True)
         return self
 
     def activity_sets(self) -> List['FB']:
@@ -937,15 +1146,34 @@ class _FlowBy(pd.DataFrame):
 
         fb_geoscale = geo.scale.from_string(self.config['geoscale'])
         other_geoscale = geo.scale.from_string(other.config['geoscale'])
+        self, other = self.match_location(other)
 
         log.info(f"Harmonizing {self.full_name} {self.config['geoscale']} data "
                  f"with {other.full_name} {other.config['geoscale']} data")
 
         fill_cols = self.config.get('fill_columns')
+        attribution_cols = self.config.get('attribute_on')
+
+        # The harmonized attribution source depends only on the source, the
+        # target geoscale, the attribution columns and the Location encoding,
+        # so it is memoized for the other activity sets attributed with the
+        # same source
+        memo = self.config.get('harmonized_cache')
+        memo_key = None
+        if memo is not None:
+            memo_key = (
+                other.full_name,
+                repr(sorted((k, repr(v)) for k, v in other.config.items()
+                            if k not in ['cache', 'harmonized_cache',
+                                         'method_config_keys'])),
+                fb_geoscale, repr(attribution_cols), repr(fill_cols),
+                location.is_integer_location(other['Location']))
+        harmonized = memo.get(memo_key) if memo is not None else None
+
         if fill_cols and 'Location' in fill_cols:
             # Don't harmonize geoscales when updating Location
             pass
-        elif other_geoscale < fb_geoscale:
+        elif other_geoscale < fb_geoscale and harmonized is None:
             log.info(f'Aggregating {other.full_name} from {other_geoscale} to '
                      f'{fb_geoscale}')
             other = (
@@ -966,9 +1194,13 @@ class _FlowBy(pd.DataFrame):
 
         fb = self.add_primary_secondary_columns('Sector')
 
+        if harmonized is not None:
+            log.info(f'Using {other.full_name} as harmonized for a previous '
+                     f'activity set')
+            return fb_geoscale, other_geoscale, fb, harmonized.copy()
+
         subset_cols = ['PrimarySector', 'Location', 'FlowAmount', 'Unit']
         groupby_cols = ['PrimarySector', 'Location', 'Unit']
-        attribution_cols = self.config.get('attribute_on')
         if attribution_cols is not None:
             subset_cols = subset_cols + attribution_cols
             groupby_cols = subset_cols + attribution_cols
@@ -979,14 +1211,23 @@ class _FlowBy(pd.DataFrame):
         subset_cols = list(set(subset_cols))
         groupby_cols = list(set(groupby_cols))
 
-        other = (
-            other
-            .add_primary_secondary_columns('Sector')
-            [subset_cols]
-            .groupby(groupby_cols)
-            .agg('sum')
-            .reset_index()
-        )
+        other = other.add_primary_secondary_columns('Sector')[subset_cols]
+        summed = None
+        if arrowcompute.use_arrow(self.config):
+            summed = arrowcompute.group_sum(
+                other, groupby_cols,
+                [c for c in subset_cols if c not in groupby_cols],
+                dropna=True)
+        if summed is not None:
+            other = type(other)(
+                summed, add_missing_columns=False,
+                **{attribute: getattr(other, attribute)
+                   for attribute in other._metadata})
+        else:
+            other = other.groupby(groupby_cols).agg('sum').reset_index()
+
+        if memo is not None:
+            memo[memo_key] = other.copy()
 
         return fb_geoscale, other_geoscale, fb, other
 
@@ -1005,6 +1246,46 @@ class _FlowBy(pd.DataFrame):
 
         fb_geoscale, other_geoscale, fb, other = self.harmonize_geoscale(other)
 
+        partitions = attribution.location_partitions(
+            fb, other, self.config, fb_geoscale, other_geoscale)
+        if partitions is None:
+            return self._proportionally_attribute_partition(
+                fb, other, other_geoscale)
+
+        workers = self.config.get('attribution_workers', 1)
+        log.info(f'Attributing {self.full_name} in {len(partitions)} '
+                 f'location partitions with {workers} worker(s)')
+
+        def attribute_partition(partition):
+            fb_rows, other_rows = partition
+            return self._proportionally_attribute_partition(
+                fb.iloc[fb_rows].reset_index(drop=True),
+                other.iloc[other_rows].reset_index(drop=True),
+                other_geoscale)
+
+        if outofcore.use_outofcore(self.config):
+            # spill each partition's result as it is attributed
+            return outofcore.collect(map(attribute_partition, partitions),
+                                     self)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            attributed = list(executor.map(
+                dependencies.in_context(attribute_partition), partitions))
+        return pd.concat(attributed, ignore_index=True)
+
+    def _proportionally_attribute_partition(
+        self: 'FB',
+        fb: 'FB',
+        other: 'FlowBySector',
+        other_geoscale: geo.scale
+    ) -> 'FB':
+        """
+        Proportionally attribute fb using other, after the geoscales of the
+        two datasets have been harmonized. Called on all of the data, or on
+        each location partition, by proportionally_attribute().
+        """
+        sparse_backend = attribution.use_sparse_backend(self.config)
+        fill_col = self.config.get('fill_columns')
+
         # attribute on sector columns
         if self.config.get('attribute_on') is None:
             groupby_cols = ['group_id']
@@ -1026,31 +1307,45 @@ class _FlowBy(pd.DataFrame):
                     .drop(columns='group_count')
                 )
 
-                merged = (
-                    needs_attribution
-                    .merge(other,
-                           how='left',
-                           left_on=[f'{rank}Sector',
-                                    'temp_location'
-                                    if 'temp_location' in needs_attribution
-                                    else 'Location'],
-                           right_on=['PrimarySector', 'Location'],
-                           suffixes=[None, '_other'])
-                    .fillna({'FlowAmount_other': 0})
-                )
+                left_on = [f'{rank}Sector',
+                           'temp_location'
+                           if 'temp_location' in needs_attribution
+                           else 'Location']
+                right_on = ['PrimarySector', 'Location']
+                index = None
+                if sparse_backend:
+                    index = attribution.match_keys(needs_attribution[left_on],
+                                                   other[right_on])
+                if index is not None:
+                    with_denominator = needs_attribution.assign(
+                        **attribution.take_other(needs_attribution, other,
+                                                 index, left_on, right_on),
+                        denominator=attribution.group_denominators(
+                            needs_attribution['group_id'], index,
+                            other['FlowAmount'].to_numpy()))
+                else:
+                    merged = (
+                        needs_attribution
+                        .merge(other,
+                               how='left',
+                               left_on=left_on,
+                               right_on=right_on,
+                               suffixes=[None, '_other'])
+                        .fillna({'FlowAmount_other': 0})
+                    )
 
-                denominator_flag = ~merged.duplicated(subset=[*groupby_cols,
-                                                      f'{rank}Sector'])
-                with_denominator = (
-                    merged
-                    .assign(denominator=(
+                    denominator_flag = ~merged.duplicated(
+                        subset=[*groupby_cols, f'{rank}Sector'])
+                    with_denominator = (
                         merged
-                        .assign(FlowAmount_other=(merged.FlowAmount_other
-                                                  * denominator_flag))
-                        .groupby(groupby_cols)
-                        ['FlowAmount_other']
-                        .transform('sum')))
-                )
+                        .assign(denominator=(
+                            merged
+                            .assign(FlowAmount_other=(merged.FlowAmount_other
+                                                      * denominator_flag))
+                            .groupby(groupby_cols)
+                            ['FlowAmount_other']
+                            .transform('sum')))
+                    )
 
                 non_zero_denominator = with_denominator.query(f'denominator != 0 ')
                 unattributable = with_denominator.query(f'denominator == 0 ')
@@ -1059,7 +1354,7 @@ class _FlowBy(pd.DataFrame):
                     # implode the location data to shorten warning message
                     unatt_sub = unattributable.groupby(
                         [f"{rank}Sector"], dropna=False, as_index=False).agg(
-                        {'Location': lambda x: ", ".join(x)})
+                        {'Location': lambda x: ", ".join(x.astype(str))})
                     vlog.warning(
                         f'Could not attribute activities in '
                         f'{unattributable.full_name} due to lack of flows in '
@@ -1108,27 +1403,41 @@ class _FlowBy(pd.DataFrame):
                 # if merging state with county data, merge on first 2 digits of location column using
                 # temporary "temp_location" col
                 if (self.config['geoscale'] == 'state') & (other.config['geoscale'] == 'county'):
-                    fb['temp_location'] = fb['Location'].str[:2]
-                    other['temp_location'] = other['Location'].str[:2]
+                    fb['temp_location'] = location.fips_to_state(
+                        fb['Location'])
+                    other['temp_location'] = location.fips_to_state(
+                        other['Location'])
                     for l in (left_on, right_on):
                         l.append('temp_location')
 
-            merged = (
-                fb
-                .merge(other,
-                       how='left',
-                       left_on=left_on,
-                       right_on=right_on,
-                       suffixes=[None, '_other'])
-                .fillna({'FlowAmount_other': 0})
-            )
+            index = None
+            if sparse_backend:
+                index = attribution.match_keys(fb[left_on], other[right_on])
+            if index is not None:
+                merged_with_denominator = fb.assign(
+                    **attribution.take_other(fb, other, index, left_on,
+                                             right_on),
+                    denominator=attribution.group_denominators(
+                        fb['group_id'], index,
+                        other['FlowAmount'].to_numpy(),
+                        distinct_keys=False))
+            else:
+                merged = (
+                    fb
+                    .merge(other,
+                           how='left',
+                           left_on=left_on,
+                           right_on=right_on,
+                           suffixes=[None, '_other'])
+                    .fillna({'FlowAmount_other': 0})
+                )
 
-            merged_with_denominator = (
-                merged
-                .assign(denominator=(merged
-                        .groupby('group_id')['FlowAmount_other']
-                        .transform('sum')))
-            )
+                merged_with_denominator = (
+                    merged
+                    .assign(denominator=(merged
+                            .groupby('group_id')['FlowAmount_other']
+                            .transform('sum')))
+                )
 
             non_zero_denominator = merged_with_denominator.query(f'denominator != 0 ')
             unattributable = merged_with_denominator.query(f'denominator == 0 ')
@@ -1162,7 +1471,6 @@ class _FlowBy(pd.DataFrame):
         # if the fbs method yamls specifies that a column from in the
         # primary data source should be replaced with data from the
         # attribution source, fill here
-        fill_col = self.config.get('fill_columns')
         if fill_col is not None:
             log.info(f'Replacing {fill_col} values in primary data source '
                      f'with those from attribution source.')
@@ -1177,6 +1485,10 @@ class _FlowBy(pd.DataFrame):
         # it could appear that data is dropped elsewhere when the dataset is
         # checked for null values
         fb = fb[fb['FlowAmount_other'] != 0].reset_index(drop=True)
+        if fill_col is not None:
+            # unmatched rows, now dropped, upcast integer columns such as
+            # integer-encoded Location
+            fb = fb.astype({fill_col: other[fill_col].dtype})
 
         return (
             fb
@@ -1213,17 +1525,25 @@ class _FlowBy(pd.DataFrame):
                                   else 'Location']
             right_merge = ['PrimarySector', 'Location']
 
+        fill_col = self.config.get('fill_columns')
+
         # multiply using each dfs primary sector col
-        merged = (fb
-                  .merge(other,
-                         how='left',
-                         left_on=left_merge,
-                         right_on=right_merge,
-                         suffixes=[None, '_other'])
-                  .fillna({'FlowAmount_other': 0})
-                  )
+        index = None
+        if attribution.use_sparse_backend(self.config):
+            index = attribution.match_keys(fb[left_merge], other[right_merge])
+        if index is not None:
+            merged = fb.assign(**attribution.take_other(
+                fb, other, index, left_merge, right_merge))
+        else:
+            merged = (fb
+                      .merge(other,
+                             how='left',
+                             left_on=left_merge,
+                             right_on=right_merge,
+                             suffixes=[None, '_other'])
+                      .fillna({'FlowAmount_other': 0})
+                      )
 
-        fill_col = self.config.get('fill_columns')
         if fill_col is not None:
             log.info(f'Replacing {fill_col} values in primary data source '
                      f'with those from attribution source.')
@@ -1243,7 +1563,7 @@ class _FlowBy(pd.DataFrame):
             # implode the location data to shorten warning message
             fb_null = fb_null.groupby(
                 ['ActivityProducedBy', 'ActivityConsumedBy'], dropna=False,
-                as_index=False).agg({'Location': lambda x: ", ".join(x)})
+                as_index=False).agg({'Location': lambda x: ", ".join(x.astype(str))})
             log.warning('FlowAmounts in %s are reset to 0 due to lack of '
                         'flows in attribution source %s for '
                         'ActivityProducedBy/ActivityConsumedBy/Location: %s',
@@ -1302,17 +1622,26 @@ class _FlowBy(pd.DataFrame):
         fb_geoscale, other_geoscale, fb, other = self.harmonize_geoscale(
             other)
 
+        left_on = ['PrimarySector',
+                   'temp_location' if 'temp_location' in fb else 'Location']
+        right_on = ['PrimarySector', 'Location']
+
         # divide using each dfs primary sector col
-        merged = (fb
-                  .merge(other,
-                         how='left',
-                         left_on=['PrimarySector', 'temp_location'
-                                  if 'temp_location' in fb
-                                  else 'Location'],
-                         right_on=['PrimarySector', 'Location'],
-                         suffixes=[None, '_other'])
-                  .fillna({'FlowAmount_other': 0})
-                  )
+        index = None
+        if attribution.use_sparse_backend(self.config):
+            index = attribution.match_keys(fb[left_on], other[right_on])
+        if index is not None:
+            merged = fb.assign(**attribution.take_other(
+                fb, other, index, left_on, right_on))
+        else:
+            merged = (fb
+                      .merge(other,
+                             how='left',
+                             left_on=left_on,
+                             right_on=right_on,
+                             suffixes=[None, '_other'])
+                      .fillna({'FlowAmount_other': 0})
+                      )
 
         fb = (merged
               .assign(FlowAmount=lambda x: (x.FlowAmount
@@ -1378,34 +1707,17 @@ class _FlowBy(pd.DataFrame):
         fba = self.add_primary_secondary_columns('Sector')
 
         groupby_cols = ['group_id', 'Location']
+        ratio = np.ones(len(fba))
         for rank in ['Primary', 'Secondary']:
-            fba = (
-                fba
-                .merge(naics_key, how='left', left_on=f'{rank}Sector',
-                       right_on='target_naics')
-                .assign(
-                    **{f'_unique_naics_{n}_by_group': lambda x, i=n: (
-                            x.groupby(groupby_cols if i == 2
-                                      else [*groupby_cols, f'_naics_{i-1}'],
-                                      dropna=False)
-                            [[f'_naics_{i}']]
-                            .transform('nunique', dropna=False)
-                        )
-                        for n in range(2, 8)},
-                    FlowAmount=lambda x: reduce(
-                        lambda x, y: x / y,
-                        [x.FlowAmount, *[x[f'_unique_naics_{n}_by_group']
-                                         for n in range(2, 8)]]
-                    )
-                )
-                .drop(columns=naics_key.columns.values.tolist())
-            )
+            ratio = ratio * naics.equal_attribution_ratios(
+                fba[groupby_cols], fba[f'{rank}Sector'], naics_key)
             groupby_cols.append(f'{rank}Sector')
 
-        return fba.drop(
-            columns=['PrimarySector', 'SecondarySector',
-                     *[f'_unique_naics_{n}_by_group' for n in range(2, 8)]]
-        )
+        return (fba
+                .assign(FlowAmount=fba.FlowAmount * ratio)
+                .drop(columns=['PrimarySector', 'SecondarySector'])
+                .reset_index(drop=True)
+                )
 
     def assign_temporal_correlation(
             self: FB,
@@ -1413,11 +1725,11 @@ class _FlowBy(pd.DataFrame):
             **kwargs
     ) -> FB:
 
-        fbs = self.copy()
         if not target_year:
-            target_year = int((re.search(r"\d{4}", fbs.full_name)).group())
-        if 'TemporalCorrelation' not in fbs:
-            fbs['TemporalCorrelation'] = 1
+            target_year = int((re.search(r"\d{4}", self.full_name)).group())
+        fbs = self.assign(
+            TemporalCorrelation=(self['TemporalCorrelation']
+                                 if 'TemporalCorrelation' in self else 1))
         fbs = esupy.dqi.adjust_dqi_scores(fbs, abs(fbs['Year'] - target_year),
                                          'TemporalCorrelation')
         fbs['Year'] = target_year
@@ -1430,8 +1742,6 @@ class _FlowBy(pd.DataFrame):
             **kwargs
     ) -> FB:
 
-        fbs = self.copy()
-
         # if target_geoscale not assigned, pull target from FBS name
         if not target_geoscale:
             try:
@@ -1457,34 +1767,31 @@ class _FlowBy(pd.DataFrame):
 
         log.info(f"Assigning geographical correlation data quality score for {self.full_name}")
 
-        # if all Geo Corr scores in the FBS are 0, drop the column and reassign values
-        if ('GeographicalCorrelation' in fbs and
-            (fbs['GeographicalCorrelation'] == 0).all()):
-            fbs = fbs.drop(columns=['GeographicalCorrelation'])
-
-        # if Geo Corr column is missing from the df or if all Geo Corr column is all 0s, add score based on fips
-        if 'GeographicalCorrelation' not in fbs:
+        fbs = self
+        # if Geo Corr column is missing from the df or if all Geo Corr scores
+        # in the FBS are 0, reassign values based on fips
+        if ('GeographicalCorrelation' not in fbs or
+                (fbs['GeographicalCorrelation'] == 0).all()):
             if fbs['LocationSystem'][0] == 'Census_Region':
-                fbs = fbs.assign(GeographicalCorrelation = 4)
+                scale = 4
             elif fbs['LocationSystem'][0] == 'Census_Division':
-                fbs = fbs.assign(GeographicalCorrelation = 3)
+                scale = 3
             else:
-                # assign geo corr score by FIPS year
-                try:
-                    fips = (geo
-                            .get_all_fips(int((re.search(r"\d{4}", fbs['LocationSystem'][0])).group()))
-                            .rename(columns={'FIPS': 'Location',
-                                             'FIPS_Scale':'GeographicalCorrelation'})
-                            )
-                # if FIPS year not defined, assume default year of 2015
-                except AttributeError:
-                    fips = (geo.get_all_fips()
-                            .rename(columns={'FIPS': 'Location',
-                                             'FIPS_Scale':'GeographicalCorrelation'})
-                            )
-                fbs = fbs.merge(fips[['Location', 'GeographicalCorrelation']])
-        fbs['GeographicalCorrelation'] = fbs['GeographicalCorrelation'].astype(int)
-        fbs['GeographicalCorrelation'] = fbs['GeographicalCorrelation'] - fips_number_key[target_geoscale]
+                # assign geo corr score by FIPS year, if FIPS year not
+                # defined, assume default year of 2015
+                fips_year = re.search(r"\d{4}", fbs['LocationSystem'][0])
+                scale = fbs['Location'].map(geo.fips_scale_key(
+                    int(fips_year.group()) if fips_year else 2015,
+                    integer=location.is_integer_location(fbs['Location'])))
+                # drop locations that are not FIPS
+                if scale.isna().any():
+                    fbs = fbs[scale.notna()].reset_index(drop=True)
+                    scale = scale.dropna().reset_index(drop=True)
+        else:
+            scale = fbs['GeographicalCorrelation']
+        fbs = fbs.assign(GeographicalCorrelation=(
+            pd.Series(scale, index=fbs.index).astype(int)
+            - fips_number_key[target_geoscale]))
         fbs = esupy.dqi.adjust_dqi_scores(fbs,
                                           fbs['GeographicalCorrelation'],
                                          'GeographicalCorrelation')
@@ -1585,6 +1892,16 @@ class _FlowBy(pd.DataFrame):
         #     to_parquet method inherited from DatFrame from working, so this
         #     casts the data back to plain DataFrame to write to a parquet.
 
+    def copy(self: FB, deep: bool = True) -> FB:
+        '''
+        Overrides DataFrame.copy(). Under copy-on-write (see copy_on_write()),
+        returns a shallow copy, whose data are copied only when either frame
+        is written to, rather than copying all columns up front.
+        '''
+        if copy_on_write_enabled():
+            deep = False
+        return super().copy(deep=deep)
+
     def astype(self: FB, *args, **kwargs) -> FB:
         '''
         Overrides DataFrame.astype(). Necessary only for pandas >= 1.5.0.
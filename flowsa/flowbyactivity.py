@@ -13,7 +13,7 @@ gerneateflowbyactivity.py
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from functools import partial, reduce
+from functools import partial
 from typing import Literal, List
 import fedelemflowlist
 import pandas as pd
@@ -21,11 +21,12 @@ import numpy as np
 
 import flowsa.exceptions
 from flowsa import settings, metadata, geo, validation, naics, common, \
-    sectormapping, generateflowbyactivity
+    sectormapping, generateflowbyactivity, dependencies
 from flowsa.flowsa_log import log
 from flowsa.settings import DEFAULT_DOWNLOAD_IF_MISSING
 from flowsa.flowbyfunctions import filter_by_geoscale
-from flowsa.flowby import _FlowBy, flowby_config, NAME_SEP_CHAR
+from flowsa.flowby import (_FlowBy, flowby_config, NAME_SEP_CHAR,
+                           copy_on_write)
 
 if TYPE_CHECKING:
     from flowsa.flowbysector import FlowBySector
@@ -268,83 +269,36 @@ class FlowByActivity(_FlowBy):
         if type(target_geoscale) == str:
             target_geoscale = geo.scale.from_string(target_geoscale)
 
-        geoscale_by_fips = pd.concat([
-            (geo.filtered_fips(scale)
-             .assign(geoscale=scale, National='USA')
-             # ^^^ Need to have a column for each relevant scale
-             .rename(columns={'FIPS': 'Location'}))
-            # ^^^ (only FIPS for now)
-            for scale in [s for s in geo.scale if s.has_fips_level]
-        ])
-
-        geoscale_name_columns = [s.name.title() for s in geo.scale
-                                 if s.has_fips_level]
-
         log.info(f'Determining appropriate source geoscale for '
                  f'{self.full_name}; target geoscale is '
                  f'{target_geoscale.name.lower()}')
 
-        highest_reporting_level_by_geoscale = [
-            (self
-             .merge(geoscale_by_fips, how='inner')
-             .query('geoscale <= @scale')
-             .groupby(['ActivityProducedBy', 'ActivityConsumedBy']
-                      + [s.name.title() for s in geo.scale
-                         if s.has_fips_level and s >= scale],
-                      dropna=False)
-             .agg({'geoscale': 'max'})
-             .reset_index()
-             .rename(columns={
-                 'geoscale': f'highest_reporting_level_by_{scale.name.title()}'
-                 }))
-            for scale in geo.scale
-            if scale.has_fips_level and scale <= target_geoscale
-        ]
-
-        # if an activity column is a mix of string and np.nan values but
-        # after subsetting, the column is all np.nan, then the column dtype is
-        # converted to float which causes an error when merging float col back
-        # with the original object dtype. So convert float cols back to object
-        for df in highest_reporting_level_by_geoscale:
-            for c in ['ActivityProducedBy', 'ActivityConsumedBy']:
-                if df[c].dtype == float:
-                    df[c] = df[c].astype(object)
-
-        fba_with_reporting_levels = reduce(
-            lambda x, y: x.merge(y, how='left'),
-            [self, geoscale_by_fips, *highest_reporting_level_by_geoscale]
+        activity_groups = (
+            self[['ActivityProducedBy', 'ActivityConsumedBy']]
+            .groupby(['ActivityProducedBy', 'ActivityConsumedBy'],
+                     dropna=False, sort=False)
+            .ngroup()
+            .to_numpy()
         )
+        level, source_level = geo.source_geoscale_levels(
+            activity_groups, self['Location'], target_geoscale)
 
-        reporting_level_columns = [
-            f'highest_reporting_level_by_{s.name.title()}'
-            for s in geo.scale if s.has_fips_level and s <= target_geoscale
-        ]
+        fba_at_source_geoscale = self[level == source_level]
+        source_geoscales = [geo.scale.from_aggregation_level(int(x))
+                            for x in np.unique(source_level[level ==
+                                                            source_level])]
 
-        fba_at_source_geoscale = (
-            fba_with_reporting_levels
-            .assign(source_geoscale=(
-                fba_with_reporting_levels[reporting_level_columns]
-                .max(axis='columns')))
-            #   ^^^ max() with axis='columns' takes max along rows
-            .query('geoscale == source_geoscale')
-            .drop(columns=(['geoscale',
-                            *geoscale_name_columns,
-                            *reporting_level_columns]))
-        )
-
-        if len(fba_at_source_geoscale.source_geoscale.unique()) > 1:
+        if len(source_geoscales) > 1:
             log.warning(f"{fba_at_source_geoscale.full_name} has multiple "
                         f"source geoscales: "
-                        f"{', '.join([s.name.lower() for s in fba_at_source_geoscale.source_geoscale.unique()])}")
+                        f"{', '.join([s.name.lower() for s in source_geoscales])}")
         else:
             log.info('%s source geoscale is %s',
                      fba_at_source_geoscale.full_name,
-                     fba_at_source_geoscale
-                     .source_geoscale.unique()[0].name.lower())
+                     source_geoscales[0].name.lower())
 
         fba_at_target_geoscale = (
             fba_at_source_geoscale
-            .drop(columns='source_geoscale')
             .convert_fips_to_geoscale(target_geoscale)
             .aggregate_flowby()
             .astype({activity: flowby_config['fba_fields'][activity]
@@ -352,7 +306,10 @@ class FlowByActivity(_FlowBy):
                                       'ActivityConsumedBy']})
         )
 
-        if target_geoscale != geo.scale.NATIONAL:
+        if target_geoscale != geo.scale.NATIONAL and 'shard' in self.config:
+            log.info(f'Skipping comparison of {self.full_name} to national '
+                     f'totals, as only a shard of states is loaded')
+        elif target_geoscale != geo.scale.NATIONAL:
             # TODO: This block of code can be simplified a great deal once
             #       validation.py is rewritten to use the FB config dictionary
             activities = list(
@@ -361,13 +318,21 @@ class FlowByActivity(_FlowBy):
                 .PrimaryActivity.unique()
             )
 
-            validation.compare_geographic_totals(
-                fba_at_target_geoscale, self,
-                self.source_name, self.config,
-                self.full_name.split('.')[-1], activities,
-                df_type='FBS', subnational_geoscale=target_geoscale
-                # ^^^ TODO: Rewrite validation to use fb metadata
-            )
+            if self.config.get('defer_validation', False):
+                # only the national data are needed for the comparison
+                validation.defer_validation(
+                    validation.geographic_totals_comparison, self.full_name,
+                    pd.DataFrame(fba_at_target_geoscale),
+                    validation.national_subset(pd.DataFrame(self)),
+                    self.source_name, activities, df_type='FBS')
+            else:
+                validation.compare_geographic_totals(
+                    fba_at_target_geoscale, self,
+                    self.source_name, self.config,
+                    self.full_name.split('.')[-1], activities,
+                    df_type='FBS', subnational_geoscale=target_geoscale
+                    # ^^^ TODO: Rewrite validation to use fb metadata
+                )
 
         return fba_at_target_geoscale
 
@@ -466,8 +431,9 @@ class FlowByActivity(_FlowBy):
             else:
                 if self.config.get('sector_hierarchy') == 'parent-incompleteChild':
                     # add descendants column
-                    fba_w_naics = define_parentincompletechild_descendants(
-                        fba_w_naics, activity_col=f'Activity{direction}')
+                    fba_w_naics, descendants = \
+                        define_parentincompletechild_descendants(
+                            fba_w_naics, activity_col=f'Activity{direction}')
                 if "NAICS" in activity_schema:
                     primary_sector_key = naics_key
                     secondary_sector_key = None
@@ -504,7 +470,9 @@ class FlowByActivity(_FlowBy):
                     fba_w_naics.loc[fba_w_naics[f'{c}_y'].notnull(), f'{c}_x'] = fba_w_naics[f'{c}_y']
                     fba_w_naics = fba_w_naics.drop(columns=[f'{c}_y']).rename(columns={f'{c}_x': c})
                 if fba_w_naics.config.get('sector_hierarchy') == 'parent-incompleteChild':
-                    fba_w_naics = drop_parentincompletechild_descendants(fba_w_naics, sector_col=f'Sector{direction}')
+                    fba_w_naics = drop_parentincompletechild_descendants(
+                        fba_w_naics, descendants,
+                        sector_col=f'Sector{direction}')
         # assign data quality scores based on highest value, if there are data for both SCB and SPB
         for dq in ['DataReliability', 'DataCollection', 'TechnologicalCorrelation']:
             if f'{dq}_x' in fba_w_naics.columns:
@@ -547,6 +515,7 @@ class FlowByActivity(_FlowBy):
         return fba_w_naics
 
 
+    @copy_on_write
     def prepare_fbs(
             self: 'FlowByActivity',
             external_config_path: str = None,
@@ -564,6 +533,11 @@ class FlowByActivity(_FlowBy):
         if retain_activity_columns:
             drop_cols = []
 
+        if self.empty and 'shard' in self.config:
+            log.info(f'{self.full_name} has no data in this shard of states')
+            return FlowBySector(pd.DataFrame(), full_name=self.full_name,
+                                config=self.config)
+
         if 'activity_sets' in self.config:
             try:
                 return (
@@ -598,6 +572,8 @@ class FlowByActivity(_FlowBy):
             .convert_units_and_flows()  # and also map to flow lists
             .function_socket('clean_fba')
             .assign_geographic_correlation(fbs_method_name=fbs_method_name)
+            .conditional_method(self.config.get('integer_location', False),
+                                'encode_location')
             .convert_to_geoscale()
             .attribute_flows_to_sectors(external_config_path=external_config_path,
                                         download_sources_ok=download_sources_ok)  # recursive call to prepare_fbs
@@ -706,6 +682,9 @@ class FlowByActivity(_FlowBy):
         columns need to be matched on for accurate conversion from activity to
         emissions.
         '''
+        dependencies.record_file(
+            'crosswalks',
+            settings.datapath / f'{self.config["emissions_factors"]}.csv')
         emissions_factors = (
             pd.read_csv(
                 settings.datapath / f'{self.config["emissions_factors"]}.csv')
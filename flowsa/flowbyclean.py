@@ -8,7 +8,7 @@ import pandas as pd
 from flowsa.flowby import FB, get_flowby_from_config
 from flowsa.common import get_catalog_info
 from flowsa.flowsa_log import log
-from flowsa import (geo, location)
+from flowsa import (aggregation, geo, location, suppression)
 from flowsa.flowbyactivity import FlowByActivity
 from flowsa.flowbysector import FlowBySector
 from flowsa.naics import map_source_sectors_to_more_aggregated_sectors
@@ -91,26 +91,22 @@ def weighted_average(
     # drop rows where flow is 0
     merged = merged[merged['FlowAmount'] != 0]
     # replace terms
-    for original, replacement in fba.config.get(
-            'replacement_dictionary').items():
-        merged = merged.replace({original: replacement})
-
-    wt_flow = (merged
-               .groupby(['Class', 'Flowable', 'Unit',
-                         'FlowType', 'ActivityProducedBy',
-                         'ActivityConsumedBy', 'Context', 'Location',
-                         'LocationSystem', 'Year', 'MeasureofSpread',
-                         'Spread', 'DistributionType', 'Min', 'Max',
-                         'DataReliability', 'DataCollection',
-                         'SectorProducedBy', 'ProducedBySectorType',
-                         'SectorConsumedBy', 'ConsumedBySectorType',
-                         'SectorSourceName'],
-                        dropna=False)
-               .apply(lambda x: np.average(x['FlowAmount'],
-                                           weights=x['FlowAmount_other']))
-               .drop(columns='FlowAmount')  # original flowamounts
-               .reset_index(name='FlowAmount')  # new, weighted flows
-               )
+    merged = aggregation.replace_values(
+        merged, fba.config.get('replacement_dictionary'))
+
+    wt_flow = aggregation.weighted_aggregate(
+        merged,
+        ['Class', 'Flowable', 'Unit',
+         'FlowType', 'ActivityProducedBy',
+         'ActivityConsumedBy', 'Context', 'Location',
+         'LocationSystem', 'Year', 'MeasureofSpread',
+         'Spread', 'DistributionType', 'Min', 'Max',
+         'DataReliability', 'DataCollection',
+         'SectorProducedBy', 'ProducedBySectorType',
+         'SectorConsumedBy', 'ConsumedBySectorType',
+         'SectorSourceName'],
+        means=['FlowAmount'],  # new, weighted flows
+        weight='FlowAmount_other')
     # set attributes todo: revise above code so don't lose attributes
     attributes_to_save = {
         attr: getattr(fba, attr) for attr in fba._metadata + ['_metadata']
@@ -148,6 +144,8 @@ def substitute_nonexistent_values(
         (geo.filtered_fips(fb.config['geoscale'])[['FIPS']]
          .assign(Location=location.US_FIPS))
     ])
+    if location.is_integer_location(other['Location']):
+        state_geo = state_geo.apply(location.fips_to_int)
 
     other = (other
              .merge(state_geo)
@@ -235,62 +233,23 @@ def estimate_suppressed_sectors_equal_attribution(
     # only single parent:child
     fba3 = fba.merge(fba2, how='outer')
 
-    fba3 = (fba3
-            .assign(Unattributed=fba3.FlowAmount.copy(),
-                    Attributed=0)
-            .assign(descendants='')
-            )
-
     # drop rows that contain "&" and "-"
     fba3 = (fba3
             .query(f"~{col}.str.contains('&')")
             .query(f"~{col}.str.contains('-')")
+            .reset_index(drop=True)
             )
 
-    for level in [6, 5, 4, 3, 2]:
-        descendants = (
-            fba3
-            .drop(columns='descendants')
-            .query(f'{col}.str.len() > {level}')
-            .assign(
-                parent=lambda x: x[col].str.slice(stop=level)
-            )
-            .groupby(['FlowName', 'Location', 'parent'])
-            .agg({'Unattributed': 'sum', col: ' '.join})
-            .reset_index()
-            .rename(columns={col: 'descendants',
-                             'Unattributed': 'descendant_flows',
-                             'parent': col})
-        )
-        fba3 = (
-            fba3
-            .merge(descendants,
-                   how='left',
-                   on=['FlowName', 'Location', col],
-                   suffixes=(None, '_y'))
-            .fillna({'descendant_flows': 0, 'descendants_y': ''})
-            .assign(
-                descendants=lambda x: x.descendants.mask(x.descendants == '',
-                                                         x.descendants_y),
-                Unattributed=lambda x: (x.Unattributed -
-                                        x.descendant_flows).mask(
-                    x.Unattributed - x.descendant_flows < 0, 0),
-                Attributed=lambda x: (x.Attributed +
-                                      x.descendant_flows)
-            )
-            .drop(columns=['descendant_flows', 'descendants_y'])
-        )
-
-    fba3 = fba3.drop(columns=['descendants'])
+    fba3 = suppression.subtract_descendants(
+        fba3, col, ['FlowName', 'Location'], levels=[6, 5, 4, 3, 2])
 
     # todo: All hyphenated sectors are currently dropped, modify code so
     #  they are not
+    hierarchy = ['n2', 'n3', 'n4', 'n5', 'n6', 'n7']
     fba_m = (
         fba3
         .merge(naics_key, how='left', left_on=col,
                right_on='source_naics')
-        .assign(location=fba3.Location,
-                category=fba3.FlowName)
         .replace({'FlowAmount': {0: np.nan}  #,
                   # col: {'1125 & 1129': '112X',
                   #       '11193 & 11194 & 11199': '1119X',
@@ -307,44 +266,15 @@ def estimate_suppressed_sectors_equal_attribution(
         .drop(columns='source_naics')
     )
 
-    indexed = fba_m.set_index(['n2', 'n3', 'n4', 'n5', 'n6', 'n7',
-                               'location', 'category'], verify_integrity=True)
-
-    def fill_suppressed(
-        flows, level: int, activity
-    ):
-        parent = flows[flows[activity].str.len() == level]
-        children = flows[flows[activity].str.len() == level + 1]
-        null_children = children[children['FlowAmount'].isna()]
-
-        if null_children.empty or parent.empty:
-            return flows
-        else:
-            value = max(parent['Unattributed'][0] / len(null_children), 0)
-            # update the null children by adding the unattributed data to
-            # the attributed data
-            null_children = (
-                null_children
-                .assign(FlowAmount=value+null_children['Attributed'])
-                .assign(Unattributed=value)
-            )
-            flows.update(null_children)
-            return flows
-
-    unsuppressed = indexed.copy()
-    for level in [2, 3, 4, 5, 6]:
-        groupcols = (["{}{}".format("n", i) for i in range(2, level+1)] +
-                     ['location', 'category'])
-        unsuppressed = (unsuppressed
-                        .groupby(level=groupcols)
-                        .apply(fill_suppressed, level, col)
-                        )
+    unsuppressed = suppression.fill_suppressed(
+        fba_m, col, hierarchy=hierarchy, group_cols=['Location', 'FlowName'],
+        levels=[2, 3, 4, 5, 6])
     unsuppressed['Year'] = unsuppressed['Year'].astype('int')
     aggregated = (
         unsuppressed
         .reset_index(drop=True)
         .fillna({'FlowAmount': 0})
-        .drop(columns=['Unattributed', 'Attributed'])
+        .drop(columns=[*hierarchy, 'Unattributed', 'Attributed'])
         # .replace({col: {'3X': '31-33',
         #                 '4X': '44-45',
         #                 '4Y': '48-49'}})
@@ -378,7 +308,9 @@ def attribute_national_to_states(fba: FlowByActivity, **_) -> FlowByActivity:
         dropna=False).FlowAmount.transform('sum')
 
     # add column to merge on
-    hlp = hlp.assign(Location_merge='00000')
+    hlp = hlp.assign(Location_merge=(
+        0 if location.is_integer_location(fba['Location'])
+        else location.US_FIPS))
 
     # todo: generalize so works for data sources other than employment FBS
     fba = pd.merge(
@@ -444,7 +376,7 @@ def calculate_flow_per_person(
 
 def define_parentincompletechild_descendants(
         fba: FlowByActivity, activity_col='ActivityConsumedBy', **_) -> \
-        FlowByActivity:
+        (FlowByActivity, pd.DataFrame):
     '''
     This function helps address the unique structure of the EIA MECS dataset.
     The MECS dataset contains rows at various levels of aggregation between
@@ -478,65 +410,74 @@ def define_parentincompletechild_descendants(
     3112               |  10        |
     311221             |  55        |
 
-    Additionally, this function adds a column called "descendants", which for
-    each industry holds all the descendant industries or industry groups that
-    have detailed information provided in the dataset. After mapping to
-    industries, but before attribution is performed, this column is used by the
-    drop_parentincompletechild_descendants function to drop any row that is mapped
+    Additionally, this function records, for each industry, all the
+    descendant (less aggregated) industries or industry groups that have
+    detailed information provided in the dataset. The relationships are
+    returned as an integer-id adjacency table, with each row of the FBA
+    assigned the id of its industry in a "descendant_node" column. After
+    mapping to industries, but before attribution is performed, the table is
+    passed to the drop_parentincompletechild_descendants function to drop
+    any row that is mapped
     from an aggregated industry group to a less aggregated industry or industry
     group THAT HAS DETAILED INFORMATION GIVEN IN THE MECS (and therefore has
     its own row already) to avoid the over-attribution issue.
     Again using the previous example:
 
-    ActivityConsumedBy | FlowAmount | descendants | ...
-    ---------------------------------------------------
-    311                |  45        | 3112 311221 |
-    3112               |  10        | 311221      |
-    311221             |  55        |             |
+    node | descendant
+    -----------------
+    311  | 3112
+    311  | 311221
+    3112 | 311221
 
     Note that this function is not useful if the desired aggregation level is
     NAICS-2. In such a case, the MECS dataset can be filtered to include only
     the rows with ActivityConsumedBy == "31-33", then disaggregated to 31, 32,
     33 using another dataset (such as the QCEW).
+
+    :return: FBA with the descendant_node column, and the adjacency table
+        (df with columns node and descendant)
     '''
+    levels = [5, 4, 3]
+    group_cols = ['Flowable', 'Location']
+    fba = fba.query(f'{activity_col} != "31-33"').reset_index(drop=True)
+
+    # subtract the flows of descendants from each industry group
     fba = (
-        fba
-        .query(f'{activity_col} != "31-33"')
-        .assign(descendants='')
+        suppression.subtract_descendants(fba, activity_col, group_cols,
+                                         levels=levels)
+        .assign(FlowAmount=lambda x: x.Unattributed)
+        .drop(columns=['Unattributed', 'Attributed'])
     )
 
-    for level in [5, 4, 3]:
-        descendants = (
-            fba
-            .drop(columns='descendants')
-            .query(f'{activity_col}.str.len() > {level}')
-            .assign(
-                parent=lambda x: x[activity_col].str.slice(stop=level)
-            )
-            .groupby(['Flowable', 'Location', 'parent'])
-            .agg({'FlowAmount': 'sum', activity_col: ' '.join})
-            .reset_index()
-            .rename(columns={activity_col: 'descendants',
-                             'FlowAmount': 'descendant_flows',
-                             'parent': activity_col})
-        )
-
-        fba = (
-            fba
-            .merge(descendants,
-                   how='left',
-                   on=['Flowable', 'Location', activity_col],
-                   suffixes=(None, '_y'))
-            .fillna({'descendant_flows': 0, 'descendants_y': ''})
-            .assign(
-                descendants=lambda x: x.descendants.mask(x.descendants == '',
-                                                         x.descendants_y),
-                FlowAmount=lambda x: (x.FlowAmount -
-                                      x.descendant_flows).mask(
-                    x.FlowAmount - x.descendant_flows < 0, 0)
-            )
-            .drop(columns=['descendant_flows', 'descendants_y'])
-        )
+    # adjacency table of industries (nodes, by group_cols and activity) and
+    # the codes of their descendants in the same group
+    codes = fba[activity_col]
+    nodes = aggregation.group_ids(fba, group_cols + [activity_col])
+    groups = aggregation.group_ids(fba, group_cols)
+    code_ids, vocabulary = pd.factorize(codes)
+    vocabulary = pd.Index(vocabulary)
+    n_codes = len(vocabulary) + 1
+    node_keys, node_rows = np.unique(groups * n_codes + code_ids,
+                                     return_index=True)
+    node_keys = pd.Index(node_keys)
+    length = codes.str.len().to_numpy()
+    adjacency = []
+    for level in levels:
+        rows = np.flatnonzero(length > level)
+        parent_ids = vocabulary.get_indexer(
+            codes.iloc[rows].str.slice(stop=level))
+        parents = node_keys.get_indexer(groups[rows] * n_codes + parent_ids)
+        found = (parent_ids >= 0) & (parents >= 0)
+        adjacency.append(pd.DataFrame({
+            'node': nodes[node_rows[parents[found]]],
+            'descendant': code_ids[rows[found]]}))
+    adjacency = (pd.concat(adjacency, ignore_index=True)
+                 .drop_duplicates(ignore_index=True)
+                 .assign(descendant=lambda x: pd.Categorical.from_codes(
+                     x.descendant, categories=vocabulary)))
+
+    fba = fba.assign(descendant_node=nodes)
+
     # Reset group_total after adjusting for descendents
     fba = (fba
            .drop(columns='group_total')
@@ -547,35 +488,52 @@ def define_parentincompletechild_descendants(
                   on='group_id', how='left', validate='m:1')
            )
 
-    return fba
+    return fba, adjacency
 
 
 def drop_parentincompletechild_descendants(
-        fba: FlowByActivity, sector_col='SectorConsumedBy', **_) -> \
-        FlowByActivity:
+        fba: FlowByActivity, descendants: pd.DataFrame,
+        sector_col='SectorConsumedBy', **_) -> FlowByActivity:
     '''
     This function finishes handling the over-attribution issue described in
     the documentation for define_parentincompletechild_descendants by dropping any row in the
     MECS dataset which has been mapped to an industry or industry group which
-    is a subset (strict or otherwise) of an industry group listed in the
-    descendants columns. So, if 311 and 3112 both appear in the MECS datset,
-    3112 will be listed as a descendant of 311 and this function will therefore
-    drop a row mapping 311 to 311221 (since more detailed information on 3112,
-    which contains 311221, is provided). If 31122 and 311221 do not appear in
-    the dataset, a row mapping 3112 to 311221 will not be dropped, since no
-    more detailed information on 311221 is given. Further attribution/
-    disaggregation should be done using another datatset such as the QCEW.
+    is a subset (strict or otherwise) of an industry group listed as a
+    descendant in the adjacency table. So, if 311 and 3112 both appear in the
+    MECS datset, 3112 will be listed as a descendant of 311 and this function
+    will therefore drop a row mapping 311 to 311221 (since more detailed
+    information on 3112, which contains 311221, is provided). If 31122 and
+    311221 do not appear in the dataset, a row mapping 3112 to 311221 will not
+    be dropped, since no more detailed information on 311221 is given. Further
+    attribution/disaggregation should be done using another datatset such as
+    the QCEW.
+
+    Rows are dropped with a single anti-join of (node, sector prefix) keys
+    against the (node, descendant) keys of the adjacency table, checking each
+    prefix length of the descendant codes.
+
+    :param descendants: df, adjacency table returned by
+        define_parentincompletechild_descendants
     '''
+    adjacency = descendants
+    vocabulary = adjacency['descendant'].cat.categories
+    n_codes = len(vocabulary) + 1
+    descendant_keys = (adjacency['node'].to_numpy(dtype=np.int64) * n_codes
+                       + adjacency['descendant'].cat.codes.to_numpy())
+
+    nodes = fba['descendant_node'].to_numpy(dtype=np.int64)
+    sectors = fba[sector_col]
+    mapped_to_descendant = np.zeros(len(fba), dtype=bool)
+    for length in vocabulary.str.len().unique():
+        prefix_ids = vocabulary.get_indexer(
+            sectors.where(sectors.str.len() >= length).str.slice(stop=length))
+        mapped_to_descendant |= ((prefix_ids >= 0)
+                                 & np.isin(nodes * n_codes + prefix_ids,
+                                           descendant_keys))
 
     fba2 = (
-        fba
-        .assign(to_keep=fba.apply(
-            lambda x: not any([str(x[sector_col]).startswith(d) for d in
-                               x.descendants.split()]),
-            axis='columns'
-        ))
-        .query('to_keep')
-        .drop(columns=['descendants', 'to_keep'])
+        fba[~mapped_to_descendant]
+        .drop(columns=['descendant_node'])
     )
 
     return fba2
@@ -6,13 +6,14 @@ Helper functions for flowbyactivity and flowbysector data
 """
 
 import numpy as np
-from esupy.dqi import get_weighted_average
 import flowsa
+from flowsa import aggregation
 import flowsa.flowbyactivity
 from flowsa.common import fbs_collapsed_default_grouping_fields
 from flowsa.dataclean import clean_df, standardize_units
 from flowsa.flowsa_log import log
-from flowsa.location import US_FIPS, get_state_FIPS, get_county_FIPS
+from flowsa.location import US_FIPS, get_state_FIPS, get_county_FIPS, \
+    is_integer_location
 from flowsa.schema import flow_by_activity_fields, flow_by_sector_fields, \
     flow_by_sector_collapsed_fields
 
@@ -52,6 +53,8 @@ def filter_by_geoscale(df, geoscale):
     """
 
     fips = create_geoscale_list(df, geoscale)
+    if is_integer_location(df['Location']):
+        fips = [int(f) for f in fips]
 
     df = df[df['Location'].isin(fips)].reset_index(drop=True)
 
@@ -100,21 +103,20 @@ def aggregator(df, groupbycols, retain_zeros=True, flowcolname='FlowAmount'):
     # check cols exist in df
     groupbycols = [c for c in groupbycols if c in df.columns]
 
-    df_dfg = df.groupby(groupbycols, dropna=False).agg({flowcolname: ['sum']})
-
     def is_identical(s):
         a = s.to_numpy()
         return (a[0] == a).all()
 
-    # run through other columns creating weighted average
-    for e in column_headers:
-        if len(df) > 0 and is_identical(df[e]):
-            df_dfg.loc[:, e] = df[e].iloc[0]
-        else:
-            df_dfg[e] = get_weighted_average(df, e, flowcolname, groupbycols)
-
-    df_dfg = df_dfg.reset_index()
-    df_dfg.columns = df_dfg.columns.droplevel(level=1)
+    # columns with a single value keep it, others take the weighted average
+    identical = [e for e in column_headers
+                 if len(df) > 0 and is_identical(df[e])]
+    df_dfg = aggregation.weighted_aggregate(
+        df, groupbycols, sums=[flowcolname],
+        means=[e for e in column_headers if e not in identical],
+        weight=flowcolname, fill_value=0)
+    df_dfg = (df_dfg
+              .assign(**{e: df[e].iloc[0] for e in identical})
+              [[*groupbycols, flowcolname, *column_headers]])
 
     return df_dfg
 
@@ -7,18 +7,36 @@ defined in this file are specific to FBS data.
 # annotations without importing the class to the py script which would lead
 # to circular reasoning
 from __future__ import annotations
+from functools import wraps
 
 import esupy.processed_data_mgmt
 import pandas as pd
 from pandas import ExcelWriter
-from flowsa import settings, metadata, common, exceptions, geo, naics
+from flowsa import (settings, metadata, common, exceptions, geo, naics,
+                    sharding, arrowcompute, dependencies, location)
 from flowsa.common import get_catalog_info, load_crosswalk
-from flowsa.flowby import _FlowBy, flowby_config, get_flowby_from_config
+from flowsa.flowby import (_FlowBy, flowby_config, get_flowby_from_config,
+                           copy_on_write)
 from flowsa.flowbyfunctions import collapse_fbs_sectors
 from flowsa.settings import DEFAULT_DOWNLOAD_IF_MISSING
 from flowsa.flowsa_log import reset_log_file, log
 
 
+def owns_validation_queue(method):
+    '''
+    Decorator running FBS generation with its own queue of deferred
+    validation checks, discarded when generation ends, see
+    validation.deferred_validation()
+    '''
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        # imported here, as validation imports this module
+        from flowsa.validation import deferred_validation
+        with deferred_validation():
+            return method(*args, **kwargs)
+    return wrapper
+
+
 class FlowBySector(_FlowBy):
     _metadata = [*_FlowBy()._metadata]
 
@@ -114,31 +132,23 @@ class FlowBySector(_FlowBy):
         )
 
     @classmethod
-    def generateFlowBySector(
+    def prepare_sources(
             cls,
             method: str,
+            method_config: dict,
             external_config_path: str = None,
             download_sources_ok: bool = settings.DEFAULT_DOWNLOAD_IF_MISSING,
-            retain_activity_columns: bool = False,
-            append_sector_names=False,
-            **kwargs
+            retain_activity_columns: bool = False
     ) -> 'FlowBySector':
         '''
-        Generates a FlowBySector dataset.
-        :param method: str, name of FlowBySector method .yaml file to use.
-        :param external_config_path: str, optional. If given, tells flowsa
-            where to look for the method yaml specified above.
-        :param download_fba_ok: bool, optional. Whether to attempt to download
-            source data FlowByActivity files from EPA server rather than
-            generating them.
-        :kwargs: keyword arguments to pass to load_yaml_dict(). Possible kwargs
-            include config.
+        Loads and prepares each source in a FlowBySector method, after first
+        preparing any sources to cache. 'sources_to_cache' and 'source_names'
+        are popped from method_config.
+        :param method: str, name of FlowBySector method
+        :param method_config: dict, loaded FlowBySector method
+        :return: FlowBySector, concatenated sources prior to method-level
+            aggregation
         '''
-        log.info('Beginning FlowBySector generation for %s', method)
-        method_config = common.load_yaml_dict(method, 'FBS',
-                                              external_config_path,
-                                              **kwargs)
-
         # Cache one or more sources by attaching to method_config
         to_cache = method_config.pop('sources_to_cache', {})
         if 'cache' in method_config:
@@ -146,6 +156,9 @@ class FlowBySector(_FlowBy):
                         method)
 
         method_config['cache'] = {}
+        # attribution sources harmonized to a geoscale, see
+        # harmonize_geoscale()
+        method_config['harmonized_cache'] = {}
         for source_name, config in to_cache.items():
             method_config['cache'][source_name] = (
                 get_flowby_from_config(
@@ -163,6 +176,8 @@ class FlowBySector(_FlowBy):
                               retain_activity_columns=retain_activity_columns,
                               fbs_method_name=method,
                               )
+                # clean functions use cached sources with 5 digit FIPS
+                .decode_location()
             )
             # ^^^ This is done with a for loop instead of a dict comprehension
             #     so that later entries in method_config['sources_to_cache']
@@ -171,7 +186,7 @@ class FlowBySector(_FlowBy):
         # Generate FBS from method_config
         sources = method_config.pop('source_names')
 
-        fbs = pd.concat([
+        fbs = pd.concat(location.match_locations([
             get_flowby_from_config(
                 name=source_name,
                 config={
@@ -188,7 +203,58 @@ class FlowBySector(_FlowBy):
                           fbs_method_name=method,
                           )
             for source_name, config in sources.items()
-        ])
+        ]))
+        method_config['harmonized_cache'].clear()
+        return fbs
+
+    @classmethod
+    @copy_on_write
+    @dependencies.tracked
+    @owns_validation_queue
+    def generateFlowBySector(
+            cls,
+            method: str,
+            external_config_path: str = None,
+            download_sources_ok: bool = settings.DEFAULT_DOWNLOAD_IF_MISSING,
+            retain_activity_columns: bool = False,
+            append_sector_names=False,
+            **kwargs
+    ) -> 'FlowBySector':
+        '''
+        Generates a FlowBySector dataset.
+        :param method: str, name of FlowBySector method .yaml file to use.
+        :param external_config_path: str, optional. If given, tells flowsa
+            where to look for the method yaml specified above.
+        :param download_fba_ok: bool, optional. Whether to attempt to download
+            source data FlowByActivity files from EPA server rather than
+            generating them.
+        :kwargs: keyword arguments to pass to load_yaml_dict(). Possible kwargs
+            include config.
+        '''
+        log.info('Beginning FlowBySector generation for %s', method)
+        method_config = common.load_yaml_dict(method, 'FBS',
+                                              external_config_path,
+                                              **kwargs)
+
+        if method_config.get('shard_by_state', False):
+            prepared = sharding.prepare_sharded_sources(
+                method, method_config,
+                external_config_path=external_config_path,
+                download_sources_ok=download_sources_ok,
+                retain_activity_columns=retain_activity_columns,
+                **kwargs)
+            fbs = FlowBySector(
+                prepared, diagnostics=prepared.attrs.pop('diagnostics'))
+            method_config.pop('sources_to_cache', None)
+            method_config.pop('source_names')
+            method_config['cache'] = {}
+            method_config['harmonized_cache'] = {}
+        else:
+            fbs = cls.prepare_sources(
+                method, method_config,
+                external_config_path=external_config_path,
+                download_sources_ok=download_sources_ok,
+                retain_activity_columns=retain_activity_columns)
 
         fbs.full_name = method
         fbs.config = method_config
@@ -204,6 +270,8 @@ class FlowBySector(_FlowBy):
         )
         # aggregate to target sector
         fbs = fbs.sector_aggregation()
+        # return integer-encoded FIPS to 5 digit strings before saving
+        fbs = fbs.decode_location()
 
         # set all data quality fields to none until implemented fully
         dq_cols = ['Spread', 'Min', 'Max']
@@ -235,12 +303,25 @@ class FlowBySector(_FlowBy):
                       f'{fbs.columns[fbs.columns.duplicated()].tolist()}')
         meta = metadata.set_fb_meta(method, 'FlowBySector')
         esupy.processed_data_mgmt.write_df_to_file(fbs, settings.paths, meta)
+        if fbs.config.get('defer_validation', False):
+            from flowsa.validation import run_deferred_validation, \
+                queued_validation
+            log.info(f'Running deferred validation checks for {method}')
+            run_deferred_validation(
+                queued_validation(),
+                report_path=(settings.logoutputpath /
+                             f'{method}_v{meta.tool_version}'
+                             f'{"_" + meta.git_hash if meta.git_hash else ""}'
+                             f'_validation.parquet'),
+                sample=fbs.config.get('validation_sample'),
+                workers=fbs.config.get('validation_workers', 1))
         reset_log_file(method, meta)
         metadata.write_metadata(source_name=method,
                                 config=common.load_yaml_dict(
                                     method, 'FBS', external_config_path, **kwargs),
                                 fb_meta=meta,
-                                category='FlowBySector')
+                                category='FlowBySector',
+                                df=fbs)
 
         return fbs
 
@@ -264,11 +345,21 @@ class FlowBySector(_FlowBy):
         for direction in sector_cols:
             if fbs[f'Sector{direction}'].isna().all():
                 continue
+            renamed = fbs.rename(
+                columns={f'Sector{direction}': 'source_naics'})
+            merged = None
+            if arrowcompute.use_arrow(self.config):
+                merged = arrowcompute.merge_left(renamed, naics_key,
+                                                 on=['source_naics'])
+            if merged is not None:
+                merged = type(fbs)(
+                    merged, add_missing_columns=False,
+                    **{attribute: getattr(fbs, attribute)
+                       for attribute in fbs._metadata})
+            else:
+                merged = renamed.merge(naics_key, how='left')
             fbs = (
-                fbs
-                .rename(columns={f'Sector{direction}': 'source_naics'})
-                .merge(naics_key,
-                       how='left')
+                merged
                 .rename(columns={'target_naics': f'Sector{direction}'})
                 .drop(columns='source_naics')
                 .aggregate_flowby(columns_to_group_by = (
@@ -279,6 +370,7 @@ class FlowBySector(_FlowBy):
 
         return fbs
 
+    @copy_on_write
     def prepare_fbs(
             self: 'FlowBySector',
             external_config_path: str = None,
@@ -287,17 +379,22 @@ class FlowBySector(_FlowBy):
             **kwargs
     ) -> 'FlowBySector':
 
+        if self.empty and 'shard' in self.config:
+            log.info(f'{self.full_name} has no data in this shard of states')
+            return FlowBySector(pd.DataFrame(), full_name=self.full_name,
+                                config=self.config)
+
         if 'activity_sets' in self.config:
             try:
                 return (
-                    pd.concat([
+                    pd.concat(location.match_locations([
                         fbs.prepare_fbs()
                         for fbs in (
                             self
                             .select_by_fields()
                             .activity_sets()
                         )
-                    ])
+                    ]))
                     .reset_index(drop=True)
                 )
             except ValueError:
@@ -307,6 +404,8 @@ class FlowBySector(_FlowBy):
             .function_socket('clean_fbs')
             .select_by_fields()
             .assign_geographic_correlation(fbs_method_name=fbs_method_name)
+            .conditional_method(self.config.get('integer_location', False),
+                                'encode_location')
             .convert_fips_to_geoscale()
             .attribute_flows_to_sectors(external_config_path=external_config_path,
                                         download_sources_ok=download_sources_ok)
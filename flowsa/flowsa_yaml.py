@@ -1,6 +1,7 @@
 from typing import IO, Callable
 import yaml
 import flowsa.settings
+from flowsa import dependencies
 from os import path
 import csv
 import importlib
@@ -96,6 +97,7 @@ class FlowsaLoader(yaml.SafeLoader):
 
         activity_set = loader.construct_scalar(node)
 
+        dependencies.record_file('yaml', file)
         with open(file, 'r', encoding='utf-8-sig', newline='') as f:
             index = csv.DictReader(f)
             return [
@@ -117,6 +119,7 @@ class FlowsaLoader(yaml.SafeLoader):
         # it is safe to change this behavior, then go ahead.
         module = importlib.import_module(f'flowsa.data_source_scripts'
                                          f'.{module_name}')
+        dependencies.record_file('scripts', module.__file__)
         return getattr(module, loader.construct_scalar(node))
 
 
@@ -133,10 +136,13 @@ class FlowsaLoader(yaml.SafeLoader):
         # If someone who understands security concerns better than I do feels
         # it is safe to change this behavior, then go ahead.
         module = importlib.import_module(f'flowsa.{module_name}')
+        dependencies.record_file('scripts', module.__file__)
         return getattr(module, loader.construct_scalar(node))
 
 
 def load(stream: IO, external_path: str = None) -> dict:
+    if hasattr(stream, 'name'):
+        dependencies.record_file('yaml', stream.name)
     loader = FlowsaLoader(stream)
     if external_path:
         loader.external_paths_to_search.append(external_path)
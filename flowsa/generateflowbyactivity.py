@@ -13,6 +13,7 @@ import pandas as pd
 from urllib import parse
 import time
 import flowsa
+from flowsa import dependencies
 from esupy.processed_data_mgmt import write_df_to_file
 from esupy.remote import make_url_request
 from flowsa.common import load_env_file_key, sourceconfigpath, \
@@ -178,12 +179,14 @@ def process_data_frame(*, df, source, year, config):
     name_data = set_fba_name(source, year)
     meta = set_fb_meta(name_data, "FlowByActivity")
     write_df_to_file(flow_df, paths, meta)
-    write_metadata(source, config, meta, "FlowByActivity", year=year)
+    write_metadata(source, config, meta, "FlowByActivity", df=flow_df,
+                   year=year)
     log.info("FBA generated and saved for %s", name_data)
     # rename the log file saved to local directory
     reset_log_file(name_data, meta)
 
 
+@dependencies.tracked
 def main(**kwargs):
     """
     Generate FBA parquet(s)
@@ -1,8 +1,9 @@
 from typing import Literal
 import enum
 from functools import total_ordering
+import numpy as np
 import pandas as pd
-from . import settings
+from . import dependencies, settings
 from .flowsa_log import log
 
 
@@ -60,6 +61,19 @@ class scale(enum.Enum):
         else:
             raise ValueError(f'No geo.scale level corresponds to {geoscale}')
 
+    @classmethod
+    def from_aggregation_level(cls, aggregation_level: int) -> 'scale':
+        '''
+        Return the geo.scale constant with the given aggregation level
+        :param aggregation_level: int
+        :return: geo.scale constant
+        '''
+        for s in cls:
+            if s.aggregation_level == aggregation_level:
+                return s
+        raise ValueError(f'No geo.scale level corresponds to aggregation '
+                         f'level {aggregation_level}')
+
 
 def get_all_fips(year: Literal[2010, 2013, 2015] = 2015) -> pd.DataFrame:
     '''
@@ -70,6 +84,8 @@ def get_all_fips(year: Literal[2010, 2013, 2015] = 2015) -> pd.DataFrame:
         'State' is NaN for national level FIPS ('00000'), and 'County'
         is Nan for national and each state level FIPS.
     '''
+    dependencies.record_file('crosswalks',
+                             settings.datapath / 'FIPS_Crosswalk.csv')
     return (pd
             .read_csv(settings.datapath / 'FIPS_Crosswalk.csv',
                       header=0, dtype=object)
@@ -94,3 +110,80 @@ def filtered_fips(
     else:
         log.error('No FIPS list exists for the given geoscale: %s', geoscale)
         raise ValueError(geoscale)
+
+
+@dependencies.cached
+def fips_scale_key(
+        year: Literal[2010, 2013, 2015] = 2015,
+        integer: bool = False
+) -> pd.Series:
+    '''
+    Lookup of FIPS code to FIPS scale, which equals the aggregation level of
+    the corresponding geo.scale (1 county, 2 state, 5 national). Cached, so
+    it must not be modified in place.
+    :param year: int, one of 2010, 2013, or 2015
+    :param integer: bool, if True, index by integer-encoded FIPS codes (see
+        location.fips_to_int())
+    :return: pd.Series of int scales, indexed by FIPS
+    '''
+    fips = get_all_fips(year).drop_duplicates(subset='FIPS')
+    index = fips['FIPS'].to_numpy()
+    if integer:
+        index = fips['FIPS'].astype('int32').to_numpy()
+    return pd.Series(fips['FIPS_Scale'].astype(int).to_numpy(), index=index)
+
+
+def source_geoscale_levels(
+        groups: np.ndarray,
+        location: pd.Series,
+        target_geoscale: scale,
+        year: Literal[2010, 2013, 2015] = 2015
+) -> tuple:
+    '''
+    Determine, for each row, the aggregation level of the row and of the
+    source geoscale for its group and region. The source geoscale is the
+    highest (most aggregated) FIPS geoscale at or below the target geoscale
+    at which the group reports data for the region containing the row. See
+    FlowByActivity.convert_to_geoscale() for details.
+
+    Locations are encoded as integer national (0), state (FIPS // 1000) and
+    county (FIPS) keys, and the highest reporting level for each
+    (group, region) at each scale is a grouped max over integer arrays.
+
+    :param groups: array of int, group of each row (such as the activity
+        combination)
+    :param location: pd.Series, FIPS code of each row, as 5 digit strings or
+        integer-encoded
+    :param target_geoscale: geo.scale constant
+    :param year: int, FIPS year
+    :return: tuple of float arrays (level, source_level), NaN for rows with
+        non-FIPS locations or that cannot contribute to the target geoscale
+    '''
+    level = location.map(fips_scale_key(
+        year, integer=pd.api.types.is_integer_dtype(location))
+    ).to_numpy(dtype=float)
+    valid = ~np.isnan(level)
+    fips = np.zeros(len(location), dtype=np.int64)
+    fips[valid] = location[valid].astype(int).to_numpy()
+    groups = np.asarray(groups, dtype=np.int64)
+
+    region_by_scale = {scale.NATIONAL: np.zeros_like(fips),
+                       scale.STATE: fips // 1000,
+                       scale.COUNTY: fips}
+
+    source_level = np.full(len(location), np.nan)
+    for s in scale:
+        if not s.has_fips_level or s > target_geoscale:
+            continue
+        # rows reported at or below this scale, within each region at scale
+        at_or_below = valid & (level <= s.aggregation_level)
+        key = groups * (region_by_scale[s].max(initial=0) + 1) \
+            + region_by_scale[s]
+        codes, inverse = np.unique(key[at_or_below], return_inverse=True)
+        highest = np.full(len(codes), -1.0)
+        np.maximum.at(highest, inverse, level[at_or_below])
+        highest_for_row = np.full(len(location), np.nan)
+        highest_for_row[at_or_below] = highest[inverse]
+        source_level = np.fmax(source_level, highest_for_row)
+
+    return level, source_level
@@ -11,6 +11,7 @@ import io
 import pycountry
 import urllib.error
 from esupy.remote import make_url_request
+from flowsa import dependencies
 from flowsa.flowsa_log import log
 from flowsa.geo import get_all_fips
 from flowsa.settings import datapath
@@ -65,21 +66,93 @@ def update_geoscale(df, to_scale):
     Updates df['Location'] based on specified to_scale
     :param df: df, requires Location column
     :param to_scale: str, target geoscale
-    :return: df, with 5 digit fips
+    :return: df, with 5 digit fips (or integer FIPS if Location is
+        integer-encoded)
     """
     # code for when the "Location" is a FIPS based system
     if to_scale == 'state':
-        df = df.assign(Location = (df['Location']
-                                   .apply(lambda x: str(x[0:2]))
-                                   .apply(lambda x:
-                                          x.ljust(3 + len(x), '0')
-                                          if len(x) < 5 else x))
-                      )
+        df = df.assign(Location=fips_to_state(df['Location']))
     elif to_scale == 'national':
-        df = df.assign(Location = US_FIPS)
+        df = df.assign(Location=0 if is_integer_location(df['Location'])
+                       else US_FIPS)
     return df
 
 
+def is_integer_location(fips):
+    """
+    Determine if a series of FIPS codes is integer-encoded
+    :param fips: pd.Series, FIPS codes
+    :return: bool, True if the series has an integer dtype
+    """
+    return pd.api.types.is_integer_dtype(fips)
+
+
+def fips_to_int(fips):
+    """
+    Encode 5 digit FIPS codes as int32, such that the national code is 0,
+    state codes are multiples of 1000 and state roll-ups are arithmetic
+    (FIPS // 1000 * 1000)
+    :param fips: pd.Series, 5 digit FIPS codes
+    :return: pd.Series, int32 FIPS codes
+    """
+    if is_integer_location(fips):
+        return fips.astype('int32')
+    return pd.to_numeric(fips, errors='raise').astype('int32')
+
+
+def fips_to_str(fips):
+    """
+    Decode integer FIPS codes to 5 digit, zero-padded strings. Strings are
+    returned unchanged.
+    :param fips: pd.Series, FIPS codes
+    :return: pd.Series, 5 digit FIPS codes
+    """
+    if is_integer_location(fips):
+        return fips.astype(str).str.zfill(5)
+    return fips
+
+
+def match_locations(dfs):
+    """
+    Decode integer-encoded Locations (see flowby.encode_location()) of dfs
+    to be concatenated, unless the Locations of all dfs are integer-encoded
+    :param dfs: list of dfs, empty dfs and dfs without Location are ignored
+    :return: list of dfs
+    """
+    encoded = [is_integer_location(df['Location']) for df in dfs
+               if 'Location' in df.columns and not df.empty]
+    if all(encoded):
+        return dfs
+    return [df.assign(Location=fips_to_str(df['Location']))
+            if 'Location' in df.columns else df for df in dfs]
+
+
+def fips_to_state(fips):
+    """
+    Roll FIPS codes up to the state FIPS code
+    :param fips: pd.Series, 5 digit or integer-encoded FIPS codes
+    :return: pd.Series, state FIPS codes, of the same type as fips
+    """
+    if is_integer_location(fips):
+        return fips // 1000 * 1000
+    return fips.str[:2].str.ljust(5, '0')
+
+
+def fips_geoscale(fips):
+    """
+    Classify FIPS codes as 'national', 'state', or 'county'
+    :param fips: pd.Series, 5 digit or integer-encoded FIPS codes
+    :return: np.array of geoscale names
+    """
+    if is_integer_location(fips):
+        national = (fips == 0).to_numpy()
+        state = (fips % 1000 == 0).to_numpy()
+    else:
+        national = (fips == US_FIPS).to_numpy()
+        state = fips.str.endswith('000', na=False).to_numpy()
+    return np.select([national, state], ['national', 'state'], 'county')
+
+
 def get_state_FIPS(year='2015', abbrev=False):
     """
     Filters FIPS df for state codes only
@@ -187,6 +260,8 @@ def get_region_and_division_codes():
     Load the Census Regions csv
     :return: pandas df of census regions
     """
+    dependencies.record_file('crosswalks',
+                             datapath / "Census_Regions_and_Divisions.csv")
     df = pd.read_csv(datapath / "Census_Regions_and_Divisions.csv",
                      dtype="str")
     return df
@@ -357,6 +432,7 @@ def shift_census_cnty_tbl(df, year):
         # i.e., join by ['FIPS_{decade}'] field ensures pct_pop_urb inheritance
     # merges identified by duplicated 'FIPS_{year}' codes (A-->C, B-->C)
         # e.g., 51019 & 51515 --> 51019
+    dependencies.record_file('crosswalks', datapath / 'FIPS_Crosswalk.csv')
     fips_xwalk = pd.read_csv(datapath / 'FIPS_Crosswalk.csv', dtype=str,
                              usecols=[f'FIPS_{decade}', f'FIPS_{year}'])
     df = pd.merge(df, fips_xwalk, how='left', on=f'FIPS_{decade}')
@@ -6,9 +6,11 @@ Functions for creating and loading metadata files for
 FlowByActivity (FBA) and FlowBySector (FBS) datasets
 """
 
+import json
 import pandas as pd
 from esupy.processed_data_mgmt import FileMeta, write_metadata_to_file, \
     read_source_metadata
+from flowsa import dependencies
 from flowsa.common import return_true_source_catalog_name, get_catalog_info
 from flowsa.flowsa_log import log
 from flowsa.settings import paths, PKG, PKG_VERSION_NUMBER, WRITE_FORMAT, \
@@ -34,13 +36,16 @@ def set_fb_meta(name_data, category):
     return fb_meta
 
 
-def write_metadata(source_name, config, fb_meta, category, **kwargs):
+def write_metadata(source_name, config, fb_meta, category, df=None,
+                   **kwargs):
     """
     Write the metadata and output as a JSON in a local directory
     :param source_name: string, source name for either a FBA or FBS dataset
     :param config: dictionary, configuration file
     :param fb_meta: object, metadata
     :param category: string, 'FlowBySector' or 'FlowByActivity'
+    :param df: df, the FBA or FBS saved, to record its hash and the
+        diagnostics of its attribution steps
     :param kwargs: additional parameters, if running for FBA, define
         "year" of data
     :return: object, metadata that includes methodology for FBAs
@@ -48,6 +53,17 @@ def write_metadata(source_name, config, fb_meta, category, **kwargs):
 
     fb_meta.tool_meta = return_fb_meta_data(
         source_name, config, category, **kwargs)
+    # hashes of the inputs read while generating the dataset and of the
+    # dataset itself, see dependencies.rebuild_stale()
+    fb_meta.tool_meta['dependencies'] = dependencies.current()
+    if df is not None:
+        fb_meta.tool_meta['output_hash'] = dependencies.frame_hash(df)
+    # conservation metrics of each attribution step, see
+    # attribution.conservation_diagnostics()
+    diagnostics = getattr(df, 'diagnostics', None)
+    if diagnostics is not None and len(diagnostics) > 0:
+        fb_meta.tool_meta['attribution_diagnostics'] = json.loads(
+            diagnostics.to_json(orient='records'))
     write_metadata_to_file(paths, fb_meta)
 
 
@@ -5,7 +5,7 @@ import re
 from flowsa.flowbyfunctions import aggregator
 from flowsa.flowsa_log import vlog, log
 from flowsa.dqi import adjust_dqi_reliability_collection_scores
-from . import (common, settings)
+from . import (common, dependencies, settings)
 
 
 def return_naics_crosswalk(
@@ -293,6 +293,81 @@ def map_target_sectors_to_less_aggregated_sectors(
     return naics.drop_duplicates().reset_index(drop=True)
 
 
+def equal_attribution_ratios(
+    group_keys: pd.DataFrame,
+    sectors: pd.Series,
+    naics_key: pd.DataFrame
+) -> np.ndarray:
+    """
+    Share of each row's flow retained when flows are equally attributed
+    down the NAICS hierarchy, as described in
+    _FlowBy.equally_attribute(). Within each group, a flow is divided
+    equally across the distinct 2-digit codes of the group's sectors, then
+    equally across the distinct 3-digit codes within each 2-digit code, and
+    so on through 7 digits.
+
+    Each distinct (group, sector) pair is expanded to its paths through the
+    hierarchy in naics_key and the paths are encoded as integer codes per
+    level. A single lexicographic sort then makes every parent node a
+    contiguous segment, so the branching factor at each level is a
+    segmented count of child boundaries. Sectors missing from naics_key
+    are treated as a single path of null codes.
+
+    :param group_keys: df, columns identifying the groups within which
+        flows are attributed, such as group_id and Location
+    :param sectors: series, sector of each row, aligned with group_keys
+    :param naics_key: df, output of
+        map_target_sectors_to_less_aggregated_sectors()
+    :return: array of ratios, one per row, to multiply FlowAmount by
+    """
+    levels = [f'_naics_{n}' for n in range(2, 8)]
+    paths = naics_key[['target_naics', *levels]].drop_duplicates()
+
+    group_id = (group_keys
+                .groupby(list(group_keys.columns), dropna=False, sort=False)
+                .ngroup().to_numpy())
+    sector_id, sector_codes = pd.factorize(
+        pd.concat([sectors, paths['target_naics']], ignore_index=True))
+    row_sector = sector_id[:len(sectors)] + 1  # null sectors become 0
+
+    # distinct (group, sector) pairs, and the pair each row belongs to
+    pair_key = group_id.astype(np.int64) * (len(sector_codes) + 1) + row_sector
+    pair_key, row_pair = np.unique(pair_key, return_inverse=True)
+    pairs = pd.DataFrame({'pair': np.arange(len(pair_key)),
+                          'group': pair_key // (len(sector_codes) + 1),
+                          'sector': pair_key % (len(sector_codes) + 1)})
+
+    # expand pairs to their hierarchy paths, with codes as integers (-1 for
+    # null codes, so that nulls count as a distinct value)
+    path_codes = pd.DataFrame(
+        {level: pd.factorize(paths[level])[0] for level in levels})
+    path_codes['sector'] = sector_id[len(sectors):] + 1
+    expanded = pairs.merge(path_codes, how='left', on='sector')
+    expanded[levels] = expanded[levels].fillna(-1).astype(np.int64)
+
+    keys = [expanded['group'].to_numpy()] + [expanded[level].to_numpy()
+                                             for level in levels]
+    order = np.lexsort(keys[::-1])
+    keys = [k[order] for k in keys]
+
+    def changed(k):
+        return np.concatenate([[True], k[1:] != k[:-1]])
+
+    # NAICS codes are hierarchical, so each parent code determines its
+    # prefix and grouping by the full prefix matches grouping by the parent
+    divisor = np.ones(len(order))
+    parent_change = changed(keys[0])
+    for k in keys[1:]:
+        child_change = parent_change | changed(k)
+        segment = np.cumsum(parent_change) - 1
+        divisor *= np.bincount(segment, weights=child_change)[segment]
+        parent_change = child_change
+
+    ratio = np.bincount(expanded['pair'].to_numpy()[order],
+                        weights=1 / divisor, minlength=len(pairs))
+    return ratio[row_pair]
+
+
 def map_source_sectors_to_more_aggregated_sectors(
     year: Literal[2002, 2007, 2012, 2017]
 ) -> pd.DataFrame:
@@ -381,6 +456,8 @@ def year_crosswalk(
     :return: pd.DataFrame with columns 'source_naics' and 'target_naics',
         corresponding to NAICS codes for the source and target specifications.
     '''
+    dependencies.record_file(
+        'crosswalks', settings.datapath / 'NAICS_Crosswalk_TimeSeries.csv')
     return (
         pd.read_csv(settings.datapath / 'NAICS_Crosswalk_TimeSeries.csv',
                     dtype='object')
@@ -401,29 +478,15 @@ def check_if_sectors_are_naics(df_load, crosswalk_list, column_headers):
     :param column_headers: list, headers to check for sectors
     :return: list, values that are not sectors
     """
-
-    # create a df of non-sectors to export
-    non_sectors_df = []
-    # create a df of just the non-sectors column
-    non_sectors_list = []
-    # loop through the df headers and determine if value
-    # is not in crosswalk list
-    for c in column_headers:
-        # create df where sectors do not exist in master crosswalk
-        non_sectors = df_load[~df_load[c].isin(crosswalk_list)]
-        # drop rows where c is empty
-        non_sectors = non_sectors[~non_sectors[c].isna()]
-        # subset to just the sector column
-        if len(non_sectors) != 0:
-            sectors = non_sectors[[c]].rename(columns={c: 'NonSectors'})
-            non_sectors_df.append(non_sectors)
-            non_sectors_list.append(sectors)
-
-    if len(non_sectors_df) != 0:
-        # concat the df and the df of sectors
-        ns_list = pd.concat(non_sectors_list, sort=False, ignore_index=True)
-        # print the NonSectors
-        non_sectors = ns_list['NonSectors'].drop_duplicates().tolist()
+    # unique values across all the headers, in column order, so the
+    # crosswalk lookup runs once per distinct code rather than per row
+    # and column
+    values = pd.Series(pd.unique(
+        df_load[column_headers].to_numpy().ravel(order='F')), dtype=object)
+    values = values[values.notna()]
+    non_sectors = values[~values.isin(set(crosswalk_list))].tolist()
+
+    if len(non_sectors) != 0:
         vlog.debug('There are sectors that are not target NAICS Codes')
         vlog.debug(non_sectors)
 
@@ -494,25 +557,48 @@ def generate_naics_crosswalk_conversion_ratios(sectorsourcename, targetsectorsou
 
     return ratios_df
 
-def return_closest_naics_year(nonsectors, mapping, targetsectorsourcename):
+@dependencies.cached
+def naics_vintage_index() -> pd.DataFrame:
     """
-    Match sectors to the closest NAICS year to target naics using naics timeseries.
+    Inverted index of the NAICS timeseries crosswalk, with one row for each
+    (code, NAICS year) pair in which the code exists. The index is built
+    once per session and shared across calls, so it must not be modified
+    in place.
+    :return: df with columns 'NAICS', 'SectorSourceName' and 'NAICS_Year'
     """
-    naics_years = mapping.columns
-    sector_year_match = {}
-    for sector in nonsectors:
-        closest_year = ''
-        min_difference = 100
-        for year in naics_years:
-            if year in mapping.columns and sector in mapping[year].values:
-                difference = abs(int(year.split('_')[1]) - int(targetsectorsourcename.split('_')[1]))
-                if difference < min_difference:
-                    closest_year = year
-                    min_difference = difference
+    return (common.load_crosswalk('NAICS_Crosswalk_TimeSeries')
+            .melt(var_name='SectorSourceName', value_name='NAICS')
+            .dropna()
+            .drop_duplicates()
+            .assign(NAICS_Year=lambda x: x['SectorSourceName']
+                    .str.extract(r'(\d{4})', expand=False).astype(int))
+            .reset_index(drop=True)
+            [['NAICS', 'SectorSourceName', 'NAICS_Year']]
+            )
 
-        sector_year_match[sector] = closest_year
 
-    return sector_year_match
+def return_closest_naics_year(nonsectors, targetsectorsourcename):
+    """
+    Match sectors to the closest NAICS year to target naics using naics
+    timeseries. Ties are resolved to the earlier NAICS year.
+    :param nonsectors: list, codes not found in the target NAICS year
+    :param targetsectorsourcename: str, target sector year, such as
+        "NAICS_2012_Code"
+    :return: dict, code: closest SectorSourceName, or '' if the code is not
+        a NAICS code in any year
+    """
+    target_year = int(targetsectorsourcename.split('_')[1])
+    index = naics_vintage_index()
+    closest = (index[index['NAICS'].isin(set(nonsectors))]
+               .assign(difference=lambda x: (x['NAICS_Year'] -
+                                             target_year).abs())
+               .sort_values(['difference', 'NAICS_Year'])
+               .drop_duplicates(subset='NAICS')
+               .set_index('NAICS')['SectorSourceName']
+               )
+
+    return (pd.Series(nonsectors, index=nonsectors, dtype=object)
+            .map(closest).fillna('').to_dict())
 
 
 def replace_sectors_with_targetsectors(df, non_naics, cw_melt, column_headers, targetsectorsourcename):
@@ -618,17 +704,19 @@ def convert_naics_year(df_load, targetsectorsourcename, sectorsourcename,
     if len(nonsectors) > 0:
         log.info('Checking if sectors represent a different '
                  f'NAICS year, if so, replace with {targetsectorsourcename}')
-        # load entire naics year crosswalk to determine if nonsectors belong to another naics year
-        mapping = common.load_crosswalk("NAICS_Crosswalk_TimeSeries")
-        sector_year_mapping = return_closest_naics_year(nonsectors, mapping, targetsectorsourcename)
+        # use the naics vintage index to determine if nonsectors belong to another naics year
+        sector_year_mapping = return_closest_naics_year(nonsectors, targetsectorsourcename)
 
-        # Generate multiple crosswalks based on found NAICS years
-        cw_melt_list = []
+        # Generate one crosswalk per found NAICS year
+        year_sectors = {}
         for sector, year in sector_year_mapping.items():
             if year:
-                cw_melt = generate_naics_crosswalk_conversion_ratios(year, targetsectorsourcename)
-                cw_melt = cw_melt[cw_melt['NAICS'] == sector].drop(columns=['naics_count', 'length'])
-                cw_melt_list.append(cw_melt)
+                year_sectors.setdefault(year, []).append(sector)
+        cw_melt_list = []
+        for year, sectors in year_sectors.items():
+            cw_melt = generate_naics_crosswalk_conversion_ratios(year, targetsectorsourcename)
+            cw_melt = cw_melt[cw_melt['NAICS'].isin(sectors)].drop(columns=['naics_count', 'length'])
+            cw_melt_list.append(cw_melt)
 
         # if sectors were found to represent a different naics year, use those values to map to target naics
         if len(cw_melt_list) > 0:
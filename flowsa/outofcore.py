@@ -0,0 +1,170 @@
+# outofcore.py (flowsa)
+# !/usr/bin/env python3
+# coding=utf-8
+"""
+Out-of-core execution backend for the grouped FlowBy operations on large
+(e.g., county) datasets.
+
+The peak memory of aggregate_flowby() and proportional attribution is set
+by their intermediate frames (groupby keys, merges), several times the
+size of the data. With the "outofcore" backend these two steps run one
+partition at a time: aggregation by state, as groups do not span states,
+and the attribution merge by location partition (see
+attribution.location_partitions()). Each partition's result is written to
+local parquet as it is produced, so that only one partition's
+intermediates and no earlier results are held in memory, and the results
+are read back and combined once all partitions are done. Results are
+identical to in-memory execution.
+
+The backend bounds the intermediates, not the data: the calling FlowBy is
+held in memory in full, partitions are taken from it in memory, and the
+combined result is held in memory. All other steps, including
+select_by_fields(), convert_fips_to_geoscale(), harmonize_geoscale() and
+the multiplication and division attribution merges, run in memory.
+
+The backend is selected in the FBS method yaml:
+
+    flowby_backend: outofcore
+    outofcore_chunk_rows: 1000000  # optional, smaller datasets in memory
+    outofcore_path: /path/to/scratch  # optional
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterable, TypeVar, TYPE_CHECKING
+import numpy as np
+import pandas as pd
+from esupy.processed_data_mgmt import mkdir_if_missing
+from flowsa import settings
+from flowsa.flowsa_log import log
+
+if TYPE_CHECKING:
+    from flowsa.flowby import _FlowBy
+
+FB = TypeVar('FB', bound='_FlowBy')
+
+FLOWBY_BACKENDS = ['memory', 'outofcore']
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+def use_outofcore(config: dict, n_rows: int = None) -> bool:
+    """
+    Determine if a FlowBy operation should use the out-of-core backend
+    :param config: dict, FlowBy config
+    :param n_rows: int, optional, rows of the calling FlowBy. If given,
+        datasets of at most outofcore_chunk_rows rows are processed in
+        memory.
+    :return: bool
+    """
+    backend = config.get('flowby_backend', 'memory')
+    if backend not in FLOWBY_BACKENDS:
+        log.error(f'FlowBy backend {backend} not recognized, options are '
+                  f'{FLOWBY_BACKENDS}')
+        raise ValueError('FlowBy backend not recognized')
+    if backend != 'outofcore':
+        return False
+    return n_rows is None or n_rows > chunk_rows(config)
+
+
+def chunk_rows(config: dict) -> int:
+    """
+    :param config: dict, FlowBy config
+    :return: int, rows of the largest dataset processed in memory
+    """
+    return int(config.get('outofcore_chunk_rows', DEFAULT_CHUNK_ROWS))
+
+
+def spill_directory(config: dict) -> tempfile.TemporaryDirectory:
+    """
+    Temporary directory for spilled partitions, removed on exit
+    :param config: dict, FlowBy config
+    :return: TemporaryDirectory
+    """
+    path = Path(config.get('outofcore_path', settings.spillpath))
+    mkdir_if_missing(path)
+    return tempfile.TemporaryDirectory(dir=path)
+
+
+def map_partitions(
+        fb: FB,
+        func: Callable[[FB], FB],
+        keys: pd.Series,
+        sort_by: list = None
+) -> FB:
+    """
+    Apply func to partitions of fb, one at a time, spilling each result to
+    parquet, and combine the results
+    :param fb: FlowBy dataset
+    :param func: function applied to each partition, which is a FlowBy of
+        the same type and metadata as fb, except that the config uses the
+        in-memory backend
+    :param keys: series, partition key of each row
+    :param sort_by: list, optional, columns by which to sort the combined
+        results, such as groupby columns
+    :return: FlowBy dataset, combined results
+    """
+    codes, _ = pd.factorize(keys, sort=True)
+    order = np.argsort(codes, kind='stable')
+    partitions = np.split(order, np.flatnonzero(np.diff(codes[order])) + 1)
+    log.info(f'Processing {fb.full_name} out of core in {len(partitions)} '
+             f'partitions')
+
+    # partitions are taken from fb as they are processed
+    results = (func(restore(pd.DataFrame(fb.iloc[rows])
+                            .reset_index(drop=True), fb))
+               for rows in partitions)
+    combined = collect(results, fb)
+
+    if sort_by is not None:
+        combined = (combined
+                    .sort_values(sort_by, kind='stable', na_position='last')
+                    .reset_index(drop=True))
+    return combined
+
+
+def collect(results: Iterable[pd.DataFrame], fb: FB, directory=None) -> FB:
+    """
+    Spill each result to parquet as it is produced, then read and
+    concatenate all results
+    :param results: iterable of dfs, such as a generator of partition
+        results
+    :param fb: FlowBy dataset whose type and metadata the combined results
+        take
+    :param directory: str, optional, directory for spilled results. A
+        temporary directory is used if not given.
+    :return: FlowBy dataset
+    """
+    if directory is None:
+        with spill_directory(fb.config) as directory:
+            return collect(results, fb, directory)
+    outputs = []
+    for i, result in enumerate(results):
+        outputs.append(Path(directory) / f'output_{i}.parquet')
+        pd.DataFrame(result).to_parquet(outputs[-1], index=False)
+    combined = pd.concat([pd.read_parquet(path) for path in outputs],
+                         ignore_index=True)
+    return type(fb)(combined, add_missing_columns=False, **metadata(fb))
+
+
+def restore(df: pd.DataFrame, fb: FB) -> FB:
+    """
+    Rebuild a partition as a FlowBy of the same type and metadata as fb,
+    configured for in-memory execution
+    :param df: df, partition
+    :param fb: FlowBy dataset the partition was taken from
+    :return: FlowBy dataset
+    """
+    return type(fb)(df, add_missing_columns=False, **metadata(
+        fb, config={**fb.config, 'flowby_backend': 'memory'}))
+
+
+def metadata(fb: FB, **updates) -> dict:
+    """
+    :param fb: FlowBy dataset
+    :param updates: values replacing those of fb
+    :return: dict, all _metadata attributes of fb, such as full_name, config
+        and diagnostics
+    """
+    return {**{attribute: getattr(fb, attribute)
+               for attribute in fb._metadata if hasattr(fb, attribute)},
+            **updates}
@@ -11,8 +11,10 @@ from pathlib import Path
 from esupy.mapping import apply_flow_mapping
 import flowsa
 import flowsa.flowbyactivity
+from flowsa import dependencies
 from flowsa.common import get_flowsa_base_name, load_crosswalk
 from flowsa.dataclean import standardize_units
+from flowsa.dqi import sector_length_difference, score_technological_correlation
 from flowsa.flowsa_log import log
 from flowsa.schema import dq_fields
 
@@ -41,6 +43,8 @@ def get_activitytosector_mapping(source, fbsconfigpath=None):
                 crosswalkpath = external_mappingpath
     activity_mapping_source_name = get_flowsa_base_name(
         crosswalkpath, mapfn, 'csv')
+    dependencies.record_file(
+        'crosswalks', crosswalkpath / f'{activity_mapping_source_name}.csv')
     mapping = pd.read_csv(crosswalkpath / f'{activity_mapping_source_name}.csv',
                           dtype={'Activity': 'str', 'Sector': 'str'})
     # some mapping tables will have data for multiple sources, while other
@@ -67,47 +71,12 @@ def assign_technological_correlation(mapping):
     # todo: modify tech assignments for cases where there is one:one parent:child relationships because a NAICS5 is
     #  the same as a NAICS6 in these situations, so the tech score should be the same for each
 
-    tech_dict = {'-5': '1',
-                 '-4': '1',
-                 '-3': '1',
-                 '-2': '1',
-                 '-1': '1',
-                 '0': '1',
-                 '1': '2',
-                 '2': '3',
-                 '3': '4',
-                 '4': '5',
-                 '5': '5',
-                 '6': '5',
-                 '7': '5',
-                 '8': '5'
-                 }
-
-    # load the sector length crosswalk
-    naics_crosswalk = load_crosswalk("Sector_Levels")
-
-    # assign sector lengths to compare to assign tech correlation
-    # merge dfs
-    for i in ['source', 'target']:
-        mapping = (mapping
-                  .merge(naics_crosswalk[['Sector', 'SectorLength']],
-                         how='left',
-                         left_on=[f'{i}_naics'],
-                         right_on=['Sector'])
-                  .drop(columns=['Sector'])
-                  .rename(columns={'SectorLength': f'{i}Length'})
-                  )
-    mapping = mapping.assign(SectorDifference = mapping[
-        'targetLength'].astype(int) - mapping['sourceLength'].astype(int))
-
     # determine difference in sector lengths between source and target and assign tech score
-    mapping = mapping.assign(TechnologicalCorrelation=mapping["SectorDifference"].astype(str).apply(lambda x: tech_dict.get(x)))
-    mapping["TechnologicalCorrelation"] = mapping["TechnologicalCorrelation"].map(int)
+    mapping = mapping.assign(TechnologicalCorrelation=score_technological_correlation(
+        sector_length_difference(mapping['source_naics'], mapping['target_naics'])))
 
     # address special circumstances for BEA household/gov codes by dropping duplicates, keeping first assignment
-    mapping = mapping.drop_duplicates(subset=['source_naics', 'target_naics'], keep="first")
-
-    return mapping.drop(columns=['sourceLength', 'targetLength', 'SectorDifference'])
+    return mapping.drop_duplicates(subset=['source_naics', 'target_naics'], keep="first")
 
 
 def convert_units_to_annual(df):
@@ -226,7 +195,56 @@ def map_to_BEA_sectors(fbs_load, region, io_level, output_year,
     :param bea_year: 2012 or 2017
 
     """
+    # determine naics year in df
+    naics_year = fbs_load['SectorSourceName'][0].split(
+        "_", 1)[1].split("_", 1)[0]
+
+    allocation = get_BEA_allocation_operator(region, io_level,
+                                             int(output_year), int(naics_year),
+                                             int(bea_year))
+
+    # Update and allocate to sectors
+    ## For FBS with both SPB and SCB, map sequentially
+    if set(['SectorProducedBy', 'SectorConsumedBy']).issubset(fbs_load.columns):
+        fbs = fbs_load
+        for col in ['SectorProducedBy', 'SectorConsumedBy']:
+            fbs = apply_BEA_allocation(fbs, col, allocation)
+        fbs = fbs.dropna(subset=['SectorProducedBy', 'SectorConsumedBy'])
+
+    else:
+        fbs = apply_BEA_allocation(fbs_load, 'Sector', allocation)
+
+    fbs = (fbs.drop(columns=dq_fields + ['SectorSourceName'],
+                    errors='ignore'))
+
+    if (abs(1-(sum(fbs['FlowAmount']) /
+               sum(fbs_load['FlowAmount'])))) > 0.005:
+        log.warning('Data loss upon BEA mapping')
+
+    return fbs
+
+
+@dependencies.cached
+def get_BEA_allocation_operator(region, io_level, output_year, naics_year,
+                                bea_year=2012):
+    """
+    NAICS to BEA allocation operator. NAICS sectors that map to a single BEA
+    sector are allocated in full regardless of Location (null Location).
+    NAICS sectors that map to multiple BEA sectors are allocated by the
+    share of gross industry output of each BEA sector in each Location.
+
+    The operator is cached per (region, io_level, output_year, naics_year,
+    bea_year) so that mapping many FBS does not reload the industry output
+    FBA or rebuild the crosswalk. It must not be modified in place.
 
+    :param region: str, 'state' or 'national'
+    :param io_level: str, 'summary' or 'detail'
+    :param output_year: year for industry output
+    :param naics_year: year of NAICS codes to map from
+    :param bea_year: 2012 or 2017
+    :return: df with columns 'Sector', 'Location', 'BEA', 'Allocation',
+        sorted by Sector and Location
+    """
     bea = get_BEA_industry_output(region, io_level, output_year, bea_year)
 
     if io_level == 'summary':
@@ -234,10 +252,6 @@ def map_to_BEA_sectors(fbs_load, region, io_level, output_year,
     elif io_level == 'detail':
         mapping_col = f'BEA_{bea_year}_Detail_Code'
 
-    # determine naics year in df
-    naics_year = fbs_load['SectorSourceName'][0].split(
-        "_", 1)[1].split("_", 1)[0]
-
     # Prepare NAICS:BEA mapping file
     mapping = (load_crosswalk(f'NAICS_to_BEA_Crosswalk_{bea_year}')
                .rename(columns={mapping_col: 'BEA',
@@ -254,55 +268,75 @@ def map_to_BEA_sectors(fbs_load, region, io_level, output_year,
     dup['Allocation'] = dup['Output']/dup.groupby(
         ['Sector','Location']).Output.transform('sum')
 
-    # Update and allocate to sectors
-    ## For FBS with both SPB and SCB, map sequentially
-    if set(['SectorProducedBy', 'SectorConsumedBy']).issubset(fbs_load.columns):
-        fbs = fbs_load.copy()
-        for col in ['SectorProducedBy', 'SectorConsumedBy']:
-            fbs = (fbs.merge(
-                mapping.drop_duplicates(subset='Sector', keep=False),
-                how='left',
-                left_on=col,
-                right_on='Sector'))
-            fbs = fbs.merge(dup.drop(columns='Output'),
-                            how='left',
-                            left_on=[col, 'Location'],
-                            right_on=['Sector', 'Location'],
-                            suffixes=(None, '_y'))
-            fbs['Allocation'] = fbs['Allocation'].fillna(1)
-            fbs['BEA'] = fbs['BEA'].fillna(fbs['BEA_y'])
-            fbs['FlowAmount'] = fbs['FlowAmount'] * fbs['Allocation']
-            fbs = (fbs
-                   .drop(columns=[col, 'BEA_y', 'Allocation', 'Sector', 'Sector_y'])
-                   .rename(columns={'BEA': col})
-                   )
-        fbs = fbs.dropna(subset=['SectorProducedBy', 'SectorConsumedBy'])
+    return (pd.concat([mapping.drop_duplicates(subset='Sector', keep=False)
+                       .assign(Location=np.nan, Allocation=1.0),
+                       dup.drop(columns='Output')
+                       .dropna(subset=['Location'])],
+                      ignore_index=True)
+            [['Sector', 'Location', 'BEA', 'Allocation']]
+            .sort_values(['Sector', 'Location'], kind='stable',
+                         ignore_index=True)
+            )
 
-    else:
-        fbs = (fbs_load.merge(
-            mapping.drop_duplicates(subset='Sector', keep=False),
-            how='left',
-            on='Sector'))
-        fbs = fbs.merge(dup.drop(columns='Output'),
-                        how='left', on=['Sector', 'Location'],
-                        suffixes=(None, '_y'))
-        fbs['Allocation'] = fbs['Allocation'].fillna(1)
-        fbs['BEA'] = fbs['BEA'].fillna(fbs['BEA_y'])
-        fbs['FlowAmount'] = fbs['FlowAmount'] * fbs['Allocation']
-        fbs = fbs.assign(Sector=fbs['BEA'])
-
-    fbs = (fbs.drop(columns=dq_fields +
-                    ['SectorSourceName', 'BEA',
-                     'BEA_y', 'Allocation'], errors='ignore'))
 
-    if (abs(1-(sum(fbs['FlowAmount']) /
-               sum(fbs_load['FlowAmount'])))) > 0.005:
-        log.warning('Data loss upon BEA mapping')
-
-    return fbs
+def apply_BEA_allocation(df, col, allocation):
+    """
+    Replace NAICS in a sector column with BEA codes, repeating rows of
+    NAICS sectors that map to multiple BEA sectors and multiplying
+    FlowAmount by the allocation ratio. Rows are repeated by position
+    rather than merged, so the frame is only copied once.
+    :param df: df with a NAICS sector column and Location
+    :param col: str, name of the sector column
+    :param allocation: df, output of get_BEA_allocation_operator()
+    :return: df with BEA codes in col, null where the sector does not map
+    """
+    one_to_one = (allocation[allocation['Location'].isna()]
+                  .set_index('Sector')['BEA'])
+    one_to_many = (allocation[allocation['Location'].notna()]
+                   .reset_index(drop=True))
+    pairs = one_to_many[['Sector', 'Location']].drop_duplicates()
+    starts = pairs.index.to_numpy()
+    counts = np.diff(np.append(starts, len(one_to_many)))
+    pairs = pd.MultiIndex.from_frame(pairs)
+
+    position = pairs.get_indexer(
+        pd.MultiIndex.from_arrays([df[col], df['Location']]))
+    matched = position >= 0
+    repeats = np.where(matched, counts[position], 1)
+    rows = np.repeat(np.arange(len(df)), repeats)
+    offset = np.arange(len(rows)) - np.repeat(np.cumsum(repeats) - repeats,
+                                              repeats)
+    matched = matched[rows]
+    target = np.where(matched, starts[position[rows]] + offset, 0)
+
+    bea = np.where(
+        matched,
+        one_to_many['BEA'].to_numpy()[target],
+        one_to_one.reindex(df[col].to_numpy()).to_numpy()[rows])
+    ratio = np.where(
+        matched,
+        one_to_many['Allocation'].fillna(1).to_numpy()[target],
+        1)
+
+    fbs = df.iloc[rows].reset_index(drop=True)
+    return fbs.assign(**{col: bea, 'FlowAmount': fbs['FlowAmount'] * ratio})
 
 
 def get_BEA_industry_output(region, io_level, output_year, bea_year=2012):
+    """
+    Get FlowByActivity for industry output from state or national datasets,
+    cached per set of parameters
+    :param region: str, 'state' or 'national'
+    :param io_level: str, 'summary' or 'detail'
+    :param output_year: year for industry output
+    :param bea_year: 2012 or 2017
+    """
+    return _load_BEA_industry_output(region, io_level, int(output_year),
+                                     int(bea_year)).copy()
+
+
+@dependencies.cached
+def _load_BEA_industry_output(region, io_level, output_year, bea_year):
     """
     Get FlowByActivity for industry output from state or national datasets
     :param region: str, 'state' or 'national'
@@ -380,6 +414,7 @@ def append_material_code(df, v, attr):
     :param df:
     :return:
     """
+    dependencies.record_file('crosswalks', v['append_material_codes'])
     mapping_file = pd.read_csv(v['append_material_codes'])
 
     # if material is identified in the activity set, use that material to
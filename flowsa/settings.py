@@ -30,6 +30,8 @@ logoutputpath = outputpath / 'Log'
 diffpath = outputpath / 'FBSComparisons'
 plotoutputpath = outputpath / 'Plots'
 tableoutputpath = outputpath / 'DisplayTables'
+spillpath = outputpath / 'Spill'
+facilityindexpath = outputpath / 'FacilityIndex'
 
 # ensure directories exist
 mkdir_if_missing(logoutputpath)
@@ -38,6 +40,11 @@ mkdir_if_missing(tableoutputpath)
 
 DEFAULT_DOWNLOAD_IF_MISSING = False
 
+# run FlowBy generation under pandas copy-on-write (pandas >= 1.5), see
+# flowby.copy_on_write(). Opt-in, as chained assignment in clean functions
+# (df['col'].iloc[0] = ...) has no effect under copy-on-write.
+COPY_ON_WRITE = False
+
 # paths to scripts
 scriptpath = MODULEPATH.parent / 'scripts'
 scriptsFBApath = scriptpath / 'FlowByActivity_Datasets'
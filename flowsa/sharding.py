@@ -0,0 +1,224 @@
+# sharding.py (flowsa)
+# !/usr/bin/env python3
+# coding=utf-8
+"""
+Geographic sharding of FlowBySector generation for state and county methods.
+
+With `shard_by_state: True` in the FBS method yaml, the sources of the
+method are prepared separately for blocks of states ("shards") in a pool of
+worker processes. Each shard loads the method, keeps only the rows of its
+states (plus national rows, so that national attribution sources remain
+whole) from every primary and attribution source, and runs each source
+through prepare_fbs(). The shard outputs are then concatenated and the
+method-level steps of generateFlowBySector() (temporal correlation,
+geoscale and sector aggregation) run once on the combined data.
+
+Sources that need data from all states are barrier steps: they are
+prepared once, unsharded, in the calling process. These are sources which
+- load or aggregate data at the national scale (geoscale: national), or
+  fill Location from an attribution source, such as national sources
+  attributed to states. Within a shard, the national total would be
+  attributed to the shard's states only.
+- call on a cleaning function known to require national totals (e.g.,
+  attribute_national_to_states()), listed in SHARD_BARRIERS. Methods can
+  declare additional ones.
+- use a cached source (sources_to_cache) that is a barrier.
+
+    shard_by_state: True
+    shard_workers: 4
+    shard_barriers: [my_cleaning_function]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from flowsa import buildplan, common, dependencies, geo, location
+from flowsa.flowsa_log import log
+
+# functions which combine data across states, sources calling on them are
+# prepared without sharding
+SHARD_BARRIERS = {'attribute_national_to_states',
+                  'substitute_nonexistent_values'}
+
+
+def state_shards(n_shards: int, year: int = 2015) -> list:
+    """
+    Divide the state FIPS codes into blocks
+    :param n_shards: int, number of blocks
+    :param year: int, FIPS year
+    :return: list of lists of 5 digit state FIPS codes
+    """
+    states = sorted(geo.filtered_fips('state', year)['FIPS'])
+    return [list(shard) for shard in np.array_split(states, n_shards)
+            if len(shard) > 0]
+
+
+def select_shard(df: pd.DataFrame, states: list) -> pd.DataFrame:
+    """
+    Subset data to the rows in the given states and national rows. Rows
+    with non-FIPS locations are retained.
+    :param df: df with Location column
+    :param states: list of 5 digit state FIPS codes
+    :return: df, subset to the shard
+    """
+    fips = pd.to_numeric(df['Location'], errors='coerce')
+    keep = (fips.isna() | (fips == 0)
+            | (fips // 1000 * 1000).isin([int(s) for s in states]))
+    return df[keep.to_numpy()].reset_index(drop=True)
+
+
+def is_barrier(config, barriers: set) -> bool:
+    """
+    Determine if a source config calls on any barrier function
+    :param config: source config, searched recursively
+    :param barriers: set of function names
+    :return: bool
+    """
+    if isinstance(config, dict):
+        return any(is_barrier(v, barriers) for v in config.values())
+    if isinstance(config, (list, tuple, set)):
+        return any(is_barrier(v, barriers) for v in config)
+    return callable(config) and getattr(config, '__name__', None) in barriers
+
+
+def needs_all_states(config) -> bool:
+    """
+    Determine if a source config works with national data: a geoscale of
+    national, or Location filled from an attribution source
+    :param config: source config, searched recursively
+    :return: bool
+    """
+    if isinstance(config, dict):
+        fill_columns = config.get('fill_columns') or []
+        if isinstance(fill_columns, str):
+            fill_columns = [fill_columns]
+        if config.get('geoscale') == 'national' or 'Location' in fill_columns:
+            return True
+        return any(needs_all_states(v) for v in config.values())
+    if isinstance(config, (list, tuple)):
+        return any(needs_all_states(v) for v in config)
+    return False
+
+
+def barrier_sources(method_config: dict) -> list:
+    """
+    Sources of a method to prepare without sharding, see module docstring.
+    Each source is checked against its own config and the configs of the
+    cached sources it uses.
+    :param method_config: dict, loaded FBS method
+    :return: list of source names
+    """
+    barriers = SHARD_BARRIERS | set(method_config.get('shard_barriers', []))
+    to_cache = method_config.get('sources_to_cache') or {}
+
+    def is_barrier_source(config, checked):
+        if is_barrier(config, barriers) or needs_all_states(config):
+            return True
+        for name, *_ in buildplan.upstream_sources(config):
+            if name in to_cache and name not in checked:
+                checked.add(name)
+                if is_barrier_source(to_cache[name], checked):
+                    return True
+        return False
+
+    return [k for k, v in method_config['source_names'].items()
+            if is_barrier_source(v or {}, set())]
+
+
+def prepare_shard(
+        method: str,
+        states: list or None,
+        source_names: list,
+        external_config_path: str = None,
+        download_sources_ok: bool = True,
+        retain_activity_columns: bool = False,
+        **kwargs
+) -> pd.DataFrame:
+    """
+    Prepare the given sources of an FBS method for a shard of states. Runs
+    in a worker process, so the method config is loaded again here rather
+    than passed in, and the inputs read (see dependencies.tracking()), the
+    validation checks deferred (see validation.deferred_validation()) and
+    the attribution diagnostics are returned in the attrs of the df.
+    :param method: str, FBS method name
+    :param states: list of 5 digit state FIPS codes, or None to prepare the
+        sources unsharded
+    :param source_names: list, names of sources in the method to prepare
+    :return: df, concatenated sources, ready for method-level aggregation
+    """
+    from flowsa.flowbysector import FlowBySector
+    from flowsa.validation import deferred_validation
+
+    with dependencies.tracking() as inputs, deferred_validation() as checks:
+        method_config = common.load_yaml_dict(method, 'FBS',
+                                              external_config_path, **kwargs)
+        if states is not None:
+            method_config['shard'] = states
+        method_config['source_names'] = {
+            k: v for k, v in method_config['source_names'].items()
+            if k in source_names}
+        fbs = FlowBySector.prepare_sources(
+            method, method_config,
+            external_config_path=external_config_path,
+            download_sources_ok=download_sources_ok,
+            retain_activity_columns=retain_activity_columns)
+    df = pd.DataFrame(fbs)
+    df.attrs['dependencies'] = inputs
+    df.attrs['validation'] = checks
+    df.attrs['diagnostics'] = fbs.diagnostics
+    return df
+
+
+def prepare_sharded_sources(
+        method: str,
+        method_config: dict,
+        external_config_path: str = None,
+        download_sources_ok: bool = True,
+        retain_activity_columns: bool = False,
+        **kwargs
+) -> pd.DataFrame:
+    """
+    Prepare the sources of an FBS method by shard in a process pool, with
+    barrier sources prepared unsharded, and combine the results
+    :param method: str, FBS method name
+    :param method_config: dict, loaded FBS method
+    :return: df, concatenated sources, ready for method-level aggregation,
+        with the attribution diagnostics of all sources in its attrs
+    """
+    unsharded = barrier_sources(method_config)
+    sharded_sources = [k for k in method_config['source_names']
+                       if k not in unsharded]
+    if unsharded:
+        log.info(f'Preparing barrier sources {", ".join(unsharded)} '
+                 f'for {method} without sharding')
+
+    workers = method_config.get('shard_workers', 1)
+    shards = state_shards(method_config.get('shard_count', workers))
+    log.info(f'Preparing {len(sharded_sources)} sources for {method} in '
+             f'{len(shards)} state shards with {workers} worker process(es)')
+    run = dict(external_config_path=external_config_path,
+               download_sources_ok=download_sources_ok,
+               retain_activity_columns=retain_activity_columns,
+               **kwargs)
+
+    prepared = []
+    if sharded_sources:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(prepare_shard, method, shard,
+                                       sharded_sources, **run)
+                       for shard in shards]
+            prepared.extend(f.result() for f in futures)
+    if unsharded:
+        prepared.append(prepare_shard(method, None, unsharded, **run))
+    from flowsa.validation import merge_deferred_validation
+    diagnostics = []
+    for df in prepared:
+        dependencies.merge(df.attrs.pop('dependencies', None))
+        merge_deferred_validation(df.attrs.pop('validation', None))
+        diagnostics.append(df.attrs.pop('diagnostics', None))
+    diagnostics = [d for d in diagnostics if d is not None and len(d) > 0]
+    combined = pd.concat(location.match_locations(prepared),
+                         ignore_index=True)
+    combined.attrs['diagnostics'] = (pd.concat(diagnostics, ignore_index=True)
+                                     if diagnostics else pd.DataFrame())
+    return combined
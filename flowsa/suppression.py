@@ -0,0 +1,149 @@
+# suppression.py (flowsa)
+# !/usr/bin/env python3
+# coding=utf-8
+"""
+Vectorized estimation of suppressed data in sector hierarchies.
+
+Data sources such as BLS_QCEW and USDA_CoA report values for a hierarchy of
+NAICS codes, with some values withheld. Suppressed values are estimated in
+two passes, each run level by level over integer-encoded arrays rather than
+with string joins and groupby callbacks:
+
+1. subtract_descendants(): working up from the most detailed level, the
+   flows reported for the descendants of each parent code are subtracted
+   from the parent, leaving the parent's "Unattributed" remainder and the
+   "Attributed" descendant total.
+2. fill_suppressed(): working down from the least detailed level, the
+   remainder of each parent is split equally among its suppressed (null)
+   children, which in turn become the parents of the next level.
+
+Both functions operate within groups (e.g., FlowName and Location), so they
+apply equally to national, state and county data. They are used by
+BLS_QCEW.estimate_suppressed_qcew() and
+flowbyclean.estimate_suppressed_sectors_equal_attribution(), and can be
+called from other source cleaning functions with the same inputs.
+"""
+
+import numpy as np
+import pandas as pd
+from flowsa.aggregation import group_ids
+from flowsa.flowsa_log import log
+
+
+def subtract_descendants(
+        df: pd.DataFrame,
+        activity: str,
+        group_cols: list,
+        levels: list,
+        parent_map: dict = None
+) -> pd.DataFrame:
+    """
+    Subtract the flows of descendant codes from their parents. At each level
+    (in the order given, most detailed first), rows with codes longer than
+    the level are summed by group and parent code (the first `level`
+    characters) and subtracted from the row with the parent code, floored at
+    0. Flows of descendants of descendants are included, after their own
+    descendants have been subtracted.
+    :param df: df with FlowAmount column
+    :param activity: str, column of hierarchical codes
+    :param group_cols: list, columns within which codes are compared
+    :param levels: list of int, code lengths of parents, descending
+    :param parent_map: dict, optional replacements for parent codes, e.g.,
+        {'31': '3X'} where the source reports the range '31-33' as '3X'
+    :return: df with 'Unattributed' (remaining parent flows) and
+        'Attributed' (summed descendant flows) columns
+    """
+    codes = df[activity]
+    length = codes.str.len().to_numpy()
+    groups = group_ids(df, group_cols)
+    code_ids, vocabulary = pd.factorize(codes)
+    n_codes = len(vocabulary) + 1
+    code_ids = np.where(code_ids < 0, len(vocabulary), code_ids)
+    # row keys, used to look up the summed flows of descendants
+    receivers = groups * n_codes + code_ids
+
+    unattributed = df['FlowAmount'].to_numpy(dtype=float, copy=True)
+    attributed = np.zeros(len(df))
+    for level in levels:
+        rows = np.flatnonzero(length > level)
+        parents = codes.iloc[rows].str.slice(stop=level)
+        if parent_map is not None:
+            parents = parents.replace(parent_map)
+        parent_ids = pd.Index(vocabulary).get_indexer(parents)
+        rows, parent_ids = rows[parent_ids >= 0], parent_ids[parent_ids >= 0]
+
+        descendant_flows = np.zeros(len(df))
+        if len(rows) > 0:
+            keys, inverse = np.unique(groups[rows] * n_codes + parent_ids,
+                                      return_inverse=True)
+            sums = np.bincount(inverse,
+                               weights=np.nan_to_num(unattributed[rows]),
+                               minlength=len(keys))
+            position = np.searchsorted(keys, receivers).clip(
+                max=len(keys) - 1)
+            found = keys[position] == receivers
+            descendant_flows[found] = sums[position[found]]
+
+        remainder = unattributed - descendant_flows
+        unattributed = np.where(remainder < 0, 0, remainder)
+        attributed = attributed + descendant_flows
+
+    return df.assign(Unattributed=unattributed, Attributed=attributed)
+
+
+def fill_suppressed(
+        df: pd.DataFrame,
+        activity: str,
+        hierarchy: list,
+        group_cols: list,
+        levels: list
+) -> pd.DataFrame:
+    """
+    Equally attribute the unattributed flows of parent codes to their null
+    children. At each level (in the order given, least detailed first), the
+    Unattributed flow of the parent code (code length equal to the level) is
+    split equally among the children (code length one greater) in the same
+    group whose FlowAmount is null. Each such child's FlowAmount becomes its
+    share plus its Attributed flow, and its share becomes its Unattributed
+    flow for the next level.
+    :param df: df with FlowAmount (null if suppressed), Unattributed and
+        Attributed columns, as returned by subtract_descendants()
+    :param activity: str, column of hierarchical codes
+    :param hierarchy: list, columns of ancestor codes at each length starting
+        at 2 (e.g., ['n2', 'n3', ...]), with codes shorter than a length
+        repeated in the longer columns
+    :param group_cols: list, columns within which codes are compared
+    :param levels: list of int, code lengths of parents, ascending
+    :return: df with FlowAmount and Unattributed updated
+    """
+    # rows must be unique by group and position in the hierarchy
+    if pd.Series(group_ids(df, group_cols + hierarchy)).duplicated().any():
+        log.error(f'Rows are not unique by {group_cols + hierarchy}, cannot '
+                  f'estimate suppressed data')
+        raise ValueError('Index has duplicate keys')
+
+    length = df[activity].str.len().to_numpy()
+    flows = df['FlowAmount'].to_numpy(dtype=float, copy=True)
+    unattributed = df['Unattributed'].to_numpy(dtype=float, copy=True)
+    attributed = df['Attributed'].to_numpy(dtype=float)
+
+    for level in levels:
+        log.info(f'Estimating suppressed data for {level + 1} digit codes')
+        # groups by group_cols and ancestor codes up to the level
+        ids = group_ids(df, group_cols + hierarchy[:level - 1])
+        n_groups = ids.max() + 1 if len(ids) > 0 else 0
+        null_children = (length == level + 1) & np.isnan(flows)
+        n_null = np.bincount(ids[null_children], minlength=n_groups)
+
+        # unattributed flow of the first parent in each group
+        parents = np.flatnonzero(length == level)[::-1]
+        parent_flows = np.full(n_groups, np.nan)
+        parent_flows[ids[parents]] = unattributed[parents]
+
+        with np.errstate(invalid='ignore'):
+            share = np.maximum(parent_flows / np.maximum(n_null, 1), 0)[ids]
+        fill = null_children & ~np.isnan(share)
+        flows[fill] = share[fill] + attributed[fill]
+        unattributed[fill] = share[fill]
+
+    return df.assign(FlowAmount=flows, Unattributed=unattributed)
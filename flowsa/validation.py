@@ -5,20 +5,30 @@
 Functions to check data is loaded and transformed correctly
 """
 
+import random
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 import pandas as pd
 import numpy as np
 from esupy.processed_data_mgmt import download_from_remote
 import flowsa
 import flowsa.flowbysector
+from flowsa import dependencies
 from flowsa.flowbysector import FlowBySector
 from flowsa.flowbyfunctions import aggregator, collapse_fbs_sectors
 from flowsa.flowsa_log import log, vlog
 from flowsa.common import fba_activity_fields, load_yaml_dict
-from flowsa.location import US_FIPS
+from flowsa.location import US_FIPS, fips_geoscale, is_integer_location
 from flowsa.metadata import set_fb_meta
 from flowsa.schema import dq_fields
 from flowsa.settings import paths, diffpath
 
+# stack of open queues of deferred validation checks, one per FBS being
+# generated (see deferred_validation()), checks are queued in the innermost
+# queue. Entries are (check name, dataset name, check partial).
+_validation_queues = []
+
 
 def calculate_flowamount_diff_between_dfs(dfa_load, dfb_load):
     """
@@ -44,12 +54,7 @@ def calculate_flowamount_diff_between_dfs(dfa_load, dfb_load):
         df_name = f'df{d}'
         # assign new column of geoscale by which to aggregate
         vars()[df_name+'2'] = vars()[df_name].assign(
-            geoscale=np.where(vars()[df_name]['Location'].
-                              apply(lambda x: x.endswith('000')),
-                              'state', 'county'))
-        vars()[df_name+'2'] = vars()[df_name+'2'].assign(
-            geoscale=np.where(vars()[df_name+'2']['Location'] == '00000',
-                              'national', vars()[df_name+'2']['geoscale']))
+            geoscale=fips_geoscale(vars()[df_name]['Location']))
         # ensure all nan/nones filled/match
         df_list.append(vars()[df_name+'2'])
     # merge the two dataframes
@@ -514,69 +519,206 @@ def compare_geographic_totals(
         rather than a DataFrame.
     :return: df, comparing published national level data to df subset
     """
+    subnational_geoscale = (subnational_geoscale
+                            or attr['allocation_from_scale'])
+    df_m_sub = geographic_totals_comparison(
+        df_subset, df_load, sourcename, activity_names, df_type)
+    if df_m_sub is None:
+        return None
+    if len(df_m_sub) == 0:
+        vlog.info(f'No data loss greater than 1% between national '
+                  f'level data and {subnational_geoscale} subset')
+    else:
+        vlog.info(f'There are data differences between published national '
+                  f'values and {subnational_geoscale} subset, '
+                  f'saving to validation log')
+
+        vlog.debug(
+            'Comparison of National FlowAmounts to aggregated data '
+            'subset for %s: \n {}'.format(
+                df_m_sub.to_string()), activity_set)
+    return df_m_sub
+
+
+def national_subset(df):
+    """
+    Subset a df to national level data
+    :param df: df, with 5 digit or integer-encoded FIPS Location
+    :return: df, national level rows
+    """
+    return df[fips_geoscale(df['Location']) == 'national'].reset_index(
+        drop=True)
 
+
+def geographic_totals_comparison(
+    df_subset, df_load, sourcename, activity_names, df_type='FBA'
+):
+    """
+    Compare published national data to the sum of a subnational subset of
+    the same data, see compare_geographic_totals()
+    :param df_subset: df, after subset by geography
+    :param df_load: df, loaded data, including published national data
+    :param sourcename: str, source name
+    :param activity_names: list of names in the activity set by which
+        to subset national level data
+    :param df_type: str, 'FBA' or 'FBS'
+    :return: df, rows where the subset differs from national data by more
+        than 1% or where national data is missing, or None if there is no
+        comparable national data
+    """
     # subset df_load to national level
-    nat = df_load[df_load['Location'] == US_FIPS].reset_index(
-        drop=True).rename(columns={'FlowAmount': 'FlowAmount_nat'})
-    # if df len is not 0, continue with comparison
-    if len(nat) != 0:
-        # if the unit is a rate, do not compare
-        if '/' in nat['Unit'][0]:
-            log.info(f"Skipping geoscale comparison because {nat['Unit'][0]} "
-                     f"is a rate.")
-        else:
-            # subset national level data by activity set names
-            nat = nat[(nat[fba_activity_fields[0]].isin(activity_names)) |
-                      (nat[fba_activity_fields[1]].isin(activity_names)
-                       )].reset_index(drop=True)
-            # drop the geoscale in df_subset and sum
-            sub = df_subset.assign(Location=US_FIPS)
-            # depending on the datasource, might need to rename some
-            # strings for national comparison
-            sub = rename_column_values_for_comparison(sub, sourcename)
-
-            # compare df
-            merge_cols = ['Class', 'SourceName', 'Unit', 'FlowType',
-                          'ActivityProducedBy', 'ActivityConsumedBy',
-                          'Location', 'LocationSystem', 'Year']
-
-            if df_type == 'FBA':
-                merge_cols.extend(['FlowName', 'Compartment'])
-            else:
-                 merge_cols.extend(['Flowable', 'Context'])
-
-            sub2 = aggregator(sub, merge_cols).rename(
-                columns={'FlowAmount': 'FlowAmount_sub'})
-
-            # compare units
-            compare_df_units(nat, sub2)
-            df_m = pd.merge(nat[merge_cols + ['FlowAmount_nat']],
-                            sub2[merge_cols + ['FlowAmount_sub']],
-                            how='outer')
-            df_m = df_m.assign(
-                FlowAmount_diff=df_m['FlowAmount_sub'] - df_m['FlowAmount_nat'])
-            df_m = df_m.assign(Percent_Increase=(abs(df_m['FlowAmount_diff'] /
-                                                 df_m['FlowAmount_nat']) * 100))
-            df_m = df_m[df_m['FlowAmount_diff'] != 0].reset_index(drop=True)
-            # subset the merged df to what to include in the validation df
-            # include data where percent difference is > 1 or where value is nan
-            df_m_sub = df_m[(df_m['Percent_Increase'] > 1) |
-                            (df_m['Percent_Increase'].isna())].reset_index(drop=True)
-
-            subnational_geoscale = (subnational_geoscale
-                                    or attr['allocation_from_scale'])
-            if len(df_m_sub) == 0:
-                vlog.info(f'No data loss greater than 1% between national '
-                          f'level data and {subnational_geoscale} subset')
-            else:
-                vlog.info(f'There are data differences between published national '
-                          f'values and {subnational_geoscale} subset, '
-                          f'saving to validation log')
-
-                vlog.debug(
-                    'Comparison of National FlowAmounts to aggregated data '
-                    'subset for %s: \n {}'.format(
-                        df_m_sub.to_string()), activity_set)
+    nat = national_subset(df_load).rename(
+        columns={'FlowAmount': 'FlowAmount_nat'})
+    # if df len is 0, there is nothing to compare
+    if len(nat) == 0:
+        return None
+    # if the unit is a rate, do not compare
+    if '/' in nat['Unit'][0]:
+        log.info(f"Skipping geoscale comparison because {nat['Unit'][0]} "
+                 f"is a rate.")
+        return None
+    # subset national level data by activity set names
+    nat = nat[(nat[fba_activity_fields[0]].isin(activity_names)) |
+              (nat[fba_activity_fields[1]].isin(activity_names)
+               )].reset_index(drop=True)
+    # drop the geoscale in df_subset and sum
+    sub = df_subset.assign(
+        Location=0 if is_integer_location(df_subset['Location'])
+        else US_FIPS)
+    # depending on the datasource, might need to rename some
+    # strings for national comparison
+    sub = rename_column_values_for_comparison(sub, sourcename)
+
+    # compare df
+    merge_cols = ['Class', 'SourceName', 'Unit', 'FlowType',
+                  'ActivityProducedBy', 'ActivityConsumedBy',
+                  'Location', 'LocationSystem', 'Year']
+
+    if df_type == 'FBA':
+        merge_cols.extend(['FlowName', 'Compartment'])
+    else:
+        merge_cols.extend(['Flowable', 'Context'])
+
+    sub2 = aggregator(sub, merge_cols).rename(
+        columns={'FlowAmount': 'FlowAmount_sub'})
+
+    # compare units
+    compare_df_units(nat, sub2)
+    df_m = pd.merge(nat[merge_cols + ['FlowAmount_nat']],
+                    sub2[merge_cols + ['FlowAmount_sub']],
+                    how='outer')
+    df_m = df_m.assign(
+        FlowAmount_diff=df_m['FlowAmount_sub'] - df_m['FlowAmount_nat'])
+    df_m = df_m.assign(Percent_Increase=(abs(df_m['FlowAmount_diff'] /
+                                         df_m['FlowAmount_nat']) * 100))
+    df_m = df_m[df_m['FlowAmount_diff'] != 0].reset_index(drop=True)
+    # subset the merged df to what to include in the validation df
+    # include data where percent difference is > 1 or where value is nan
+    return df_m[(df_m['Percent_Increase'] > 1) |
+                (df_m['Percent_Increase'].isna())].reset_index(drop=True)
+
+
+@contextmanager
+def deferred_validation():
+    """
+    Open a queue for the validation checks deferred while generating a
+    dataset. The queue is discarded on exit, whether or not its checks were
+    run, so checks never carry over to the next dataset.
+    :return: list, the queue, filled by defer_validation()
+    """
+    queue = []
+    _validation_queues.append(queue)
+    try:
+        yield queue
+    finally:
+        _validation_queues.remove(queue)
+
+
+def queued_validation() -> list:
+    """
+    Checks queued so far in the innermost open queue
+    :return: list of (check name, dataset name, check partial), empty if no
+        queue is open
+    """
+    return list(_validation_queues[-1]) if _validation_queues else []
+
+
+def defer_validation(check, label, *args, **kwargs):
+    """
+    Queue a validation check to run after FBS generation, see
+    run_deferred_validation(). If no queue is open (i.e., outside of
+    FlowBySector.generateFlowBySector()), the check is run immediately.
+    :param check: function returning a df of validation failures (or None)
+    :param label: str, name of the checked dataset, such as the activity set
+        full_name
+    :param args: args passed to check
+    :param kwargs: kwargs passed to check
+    """
+    merge_deferred_validation([(check.__name__, label,
+                                partial(check, *args, **kwargs))])
+
+
+def merge_deferred_validation(tasks: list):
+    """
+    Queue checks deferred elsewhere (e.g., in a worker process) in the
+    innermost open queue, or run them if no queue is open
+    :param tasks: list of (check name, dataset name, check partial)
+    """
+    if not tasks:
+        return
+    if _validation_queues:
+        _validation_queues[-1].extend(tasks)
+    else:
+        vlog.info('No deferred validation queue open, running checks now')
+        run_deferred_validation(tasks)
+
+
+def run_deferred_validation(tasks: list, report_path=None, sample=None,
+                            workers=1):
+    """
+    Run validation checks in a thread pool and collect the results into a
+    single report. A summary is written to the validation log and the full
+    report to parquet.
+    :param tasks: list of (check name, dataset name, check partial), see
+        queued_validation()
+    :param report_path: path, parquet file to save the report, if None the
+        report is not saved
+    :param sample: int, optional, number of randomly selected (seeded, so
+        repeatable) datasets to check, for fast iteration
+    :param workers: int, number of worker threads
+    :return: df, validation report with 'Check' and 'Dataset' columns
+    """
+    if sample is not None and sample < len(tasks):
+        keep = set(random.Random(0).sample(range(len(tasks)), sample))
+        vlog.info(f'Running {sample} of {len(tasks)} deferred validation '
+                  f'checks')
+        tasks = [t for i, t in enumerate(tasks) if i in keep]
+    if len(tasks) == 0:
+        return pd.DataFrame()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            dependencies.in_context(lambda t: t[2]()), tasks))
+
+    summary = pd.DataFrame(
+        {'Check': [t[0] for t in tasks],
+         'Dataset': [t[1] for t in tasks],
+         'Rows': [0 if r is None else len(r) for r in results]})
+    vlog.info('Deferred validation summary, rows flagged per dataset: '
+              '\n {}'.format(summary.to_string(index=False)))
+
+    report = pd.DataFrame(columns=['Check', 'Dataset'])
+    if summary['Rows'].any():
+        report = pd.concat(
+            [r.assign(Check=check, Dataset=label)
+             for (check, label, _), r in zip(tasks, results)
+             if r is not None and len(r) > 0], ignore_index=True)
+        report = report[['Check', 'Dataset'] +
+                        [c for c in report if c not in ['Check', 'Dataset']]]
+    if report_path is not None:
+        report.to_parquet(report_path, index=False)
+        vlog.info(f'Validation report saved to {report_path}')
+    return report
 
 
 def rename_column_values_for_comparison(df, sourcename):
@@ -630,10 +772,72 @@ def calculate_industry_coefficients(fbs_load, year,region,
     :param impacts: bool or str, True to apply and aggregate on impacts using TRACI,
         False to compare flow/contexts, str to pass alternate method
     """
+    fbs = collapse_fbs_sectors(fbs_load)
+
+    return _coefficients_from_collapsed_fbs(fbs, year, region, io_level,
+                                            impacts)
+
+
+def calculate_industry_coefficients_batch(method_years, region, io_level,
+                                          impacts=False,
+                                          download_FBAs_if_missing=False,
+                                          download_FBS_if_missing=False):
+    """
+    Generates sector coefficients (flow/$) for many FBS methods at once.
+
+    FBS are grouped by industry output year and NAICS year. Each group is
+    stacked into a single frame with a 'Method' column so that BEA output is
+    loaded, sectors are mapped to BEA and impacts are applied once per group
+    rather than once per FBS.
+
+    :param method_years: list of (method, year) tuples, where method is an
+        FBS method name and year is the year for the industry output dataset
+    :param region: str, 'state' or 'national'
+    :param io_level: str, 'summary' or 'detail'
+    :param impacts: bool or str, True to apply and aggregate on impacts using TRACI,
+        False to compare flow/contexts, str to pass alternate method
+    :param download_FBAs_if_missing: bool, passed to getFlowBySector
+    :param download_FBS_if_missing: bool, passed to getFlowBySector
+    :return: df of coefficients with 'Method' and 'Year' columns
+    """
+    groups = {}
+    for method, year in method_years:
+        fbs = collapse_fbs_sectors(flowsa.flowbysector.getFlowBySector(
+            method, download_FBAs_if_missing=download_FBAs_if_missing,
+            download_FBS_if_missing=download_FBS_if_missing))
+        groups.setdefault((int(year), fbs['SectorSourceName'][0]),
+                          []).append(fbs.assign(Method=method))
+
+    coefficients = []
+    for (year, sector_source_name), fbs_list in groups.items():
+        log.info(f'Calculating industry coefficients for '
+                 f'{len(fbs_list)} FBS with {year} industry output and '
+                 f'{sector_source_name}')
+        fbs = pd.concat(fbs_list, ignore_index=True)
+        coefficients.append(
+            _coefficients_from_collapsed_fbs(fbs, year, region, io_level,
+                                             impacts, by=['Method'])
+            .assign(Year=year))
+
+    coefficients = pd.concat(coefficients, ignore_index=True)
+    return coefficients[['Method', 'Year'] +
+                        [c for c in coefficients.columns
+                         if c not in ['Method', 'Year']]]
+
+
+def _coefficients_from_collapsed_fbs(fbs, year, region, io_level, impacts,
+                                     by=None):
+    """
+    Map a collapsed FBS to BEA sectors and divide by industry output.
+    :param fbs: df, FBS collapsed to single 'Sector' column
+    :param by: list, additional columns to keep when aggregating, such as
+        'Method' for stacked FBS
+    See calculate_industry_coefficients() for remaining parameters.
+    """
     from flowsa.sectormapping import map_to_BEA_sectors,\
         get_BEA_industry_output
 
-    fbs = collapse_fbs_sectors(fbs_load)
+    by = by or []
 
     fbs = map_to_BEA_sectors(fbs, region, io_level, year)
 
@@ -667,7 +871,7 @@ def calculate_industry_coefficients(fbs_load, year,region,
     if region == 'national':
         fbs_summary["Location"] = US_FIPS
 
-    fbs_summary = (fbs_summary.groupby(groupby_cols)
+    fbs_summary = (fbs_summary.groupby(by + groupby_cols)
                    .agg({'FlowAmount': 'sum'}).
                    reset_index())
 
@@ -679,6 +883,6 @@ def calculate_industry_coefficients(fbs_load, year,region,
         on=['Sector','Location'])
     fbs_summary['Coefficient'] = (fbs_summary['FlowAmount'] /
                                       fbs_summary['Output'])
-    fbs_summary = fbs_summary.sort_values(by=sort_by_cols)
+    fbs_summary = fbs_summary.sort_values(by=by + sort_by_cols)
 
     return fbs_summary
@@ -0,0 +1,93 @@
+# benchmark_arrow_kernels.py
+# !/usr/bin/env python3
+# coding=utf-8
+
+"""
+Compares the pandas and arrow kernel paths (see flowsa/arrowcompute.py)
+for aggregate_flowby(), sector_aggregation() and the attribution source
+aggregation in harmonize_geoscale() on state-level FBS, checking that both
+paths return the same results.
+
+FBS are loaded from the local directory (or downloaded). Pass method names
+as arguments to benchmark methods other than the defaults:
+
+    python benchmark_arrow_kernels.py Employment_state_2017 GHG_state_2019_m1
+"""
+
+import sys
+import time
+import pandas as pd
+
+from flowsa import common
+from flowsa.flowbysector import FlowBySector
+from flowsa.flowsa_log import log
+
+METHODS = ['Employment_state_2017', 'GHG_state_2019_m1',
+           'Water_state_2015_m1']
+REPEATS = 3
+
+
+def load_fbs(method, kernel):
+    """
+    Load an FBS with its method config and the given kernel path
+    :param method: str, FBS method
+    :param kernel: str, 'pandas' or 'arrow'
+    :return: FlowBySector
+    """
+    config = common.load_yaml_dict(method, 'FBS')
+    fbs = FlowBySector.return_FBS(method, download_fbs_ok=True)
+    fbs.config = {**config, 'flowby_kernel': kernel,
+                  'attribution_backend': 'merge'}
+    return fbs
+
+
+def time_operation(fbs, operation):
+    """
+    :return: tuple, (best time in seconds over REPEATS, result)
+    """
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = operation(fbs)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+OPERATIONS = {
+    'aggregate_flowby': lambda fbs: fbs.aggregate_flowby(),
+    'sector_aggregation': lambda fbs: fbs.sector_aggregation(),
+    'harmonize_geoscale': lambda fbs: fbs.harmonize_geoscale(fbs)[3],
+}
+
+
+def benchmark(methods):
+    """
+    Time each operation for each method and kernel path
+    :param methods: list of FBS method names
+    :return: df of timings
+    """
+    results = []
+    for method in methods:
+        for name, operation in OPERATIONS.items():
+            timed = {}
+            for kernel in ['pandas', 'arrow']:
+                fbs = load_fbs(method, kernel)
+                timed[kernel] = time_operation(fbs, operation)
+            same = pd.DataFrame(timed['pandas'][1]).equals(
+                pd.DataFrame(timed['arrow'][1]))
+            if not same:
+                log.warning(f'{name} results differ between kernel paths '
+                            f'for {method}')
+            results.append({'Method': method,
+                            'Rows': len(fbs),
+                            'Operation': name,
+                            'pandas_s': timed['pandas'][0],
+                            'arrow_s': timed['arrow'][0],
+                            'Speedup': timed['pandas'][0] / timed['arrow'][0],
+                            'SameResult': same})
+    return pd.DataFrame(results)
+
+
+if __name__ == '__main__':
+    df = benchmark(sys.argv[1:] or METHODS)
+    print(df.to_string(index=False))
@@ -0,0 +1,95 @@
+# benchmark_copy_on_write.py
+# !/usr/bin/env python3
+# coding=utf-8
+
+"""
+Regression benchmark for memory allocated when preparing FBS sources, with
+and without pandas copy-on-write (settings.COPY_ON_WRITE, see
+flowby.copy_on_write()).
+
+Each source of each method is prepared with prepare_fbs() while tracing
+allocations with tracemalloc (numpy reports its array allocations to
+tracemalloc). Peak bytes allocated during the call and bytes still held
+afterwards are reported for both modes, and the prepared FBS are checked for
+equality. Source FBA and attribution FBS are loaded from the local directory
+(or downloaded), so run each method once beforehand to exclude download
+allocations.
+
+    python benchmark_copy_on_write.py Water_national_2015_m1 Land_national_2012
+"""
+
+import sys
+import time
+import tracemalloc
+import pandas as pd
+
+from flowsa import common, settings
+from flowsa.flowbysector import FlowBySector
+from flowsa.flowsa_log import log
+
+METHODS = ['Water_national_2015_m1', 'Land_national_2012',
+           'Employment_state_2017']
+
+
+def prepare_source(method, source_name, copy_on_write):
+    """
+    Prepare a single source of an FBS method, tracing allocations
+    :param method: str, FBS method
+    :param source_name: str, source in the method
+    :param copy_on_write: bool, value of settings.COPY_ON_WRITE
+    :return: tuple, (peak bytes, retained bytes, seconds, prepared FBS)
+    """
+    method_config = common.load_yaml_dict(method, 'FBS')
+    method_config['source_names'] = {
+        source_name: method_config['source_names'][source_name]}
+    settings.COPY_ON_WRITE = copy_on_write
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        fbs = FlowBySector.prepare_sources(method, method_config,
+                                           download_sources_ok=True)
+        seconds = time.perf_counter() - start
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, retained, seconds, fbs
+
+
+def benchmark(methods):
+    """
+    Compare allocations for each source of each method
+    :param methods: list of FBS method names
+    :return: df, one row per source
+    """
+    default = settings.COPY_ON_WRITE
+    results = []
+    try:
+        for method in methods:
+            sources = common.load_yaml_dict(method, 'FBS')['source_names']
+            for source_name in sources:
+                measured = {cow: prepare_source(method, source_name, cow)
+                            for cow in [False, True]}
+                same = (pd.DataFrame(measured[False][3])
+                        .equals(pd.DataFrame(measured[True][3])))
+                if not same:
+                    log.warning(f'{source_name} in {method} differs with '
+                                f'copy-on-write')
+                results.append({
+                    'Method': method,
+                    'Source': source_name,
+                    'Rows': len(measured[True][3]),
+                    'PeakMB': measured[False][0] / 1e6,
+                    'PeakMB_cow': measured[True][0] / 1e6,
+                    'RetainedMB': measured[False][1] / 1e6,
+                    'RetainedMB_cow': measured[True][1] / 1e6,
+                    'Seconds': measured[False][2],
+                    'Seconds_cow': measured[True][2],
+                    'SameResult': same})
+    finally:
+        settings.COPY_ON_WRITE = default
+    return pd.DataFrame(results)
+
+
+if __name__ == '__main__':
+    df = benchmark(sys.argv[1:] or METHODS)
+    print(df.to_string(index=False))
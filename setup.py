@@ -35,6 +35,9 @@ setup(
         'tabula-py>=2.1.1',
         'xlrd>=2.0.1'
     ],
+    entry_points={
+        'console_scripts': ['flowsa = flowsa.__main__:main'],
+    },
     url='https://github.com/USEPA/FLOWSA',
     license='MIT',
     author='Catherine Birney, Ben Young, Matthew Chambers, and Wesley '
@@ -0,0 +1,139 @@
+"""
+Fixtures generating FBS methods offline, from synthetic FBAs
+"""
+import re
+import esupy.processed_data_mgmt
+import pandas as pd
+import pytest
+import yaml
+from flowsa import flowbysector, metadata
+
+
+def synthetic_fba(source, rows, year=2015, flow='Jobs', unit='p',
+                  activity_col='ActivityProducedBy',
+                  location_system='FIPS_2015'):
+    """
+    FBA of a source from (activity, Location, FlowAmount) rows
+    """
+    df = pd.DataFrame(rows, columns=[activity_col, 'Location', 'FlowAmount'])
+    other_activity_col = ({'ActivityProducedBy', 'ActivityConsumedBy'}
+                          - {activity_col}).pop()
+    return df.assign(
+        SourceName=source, Class='Employment', FlowName=flow, Unit=unit,
+        FlowType='ELEMENTARY_FLOW', **{other_activity_col: None},
+        Compartment=None, LocationSystem=location_system, Year=year,
+        MeasureofSpread=None, Spread=None, DistributionType=None, Min=None,
+        Max=None, DataReliability=5.0, DataCollection=5.0, Description='',
+        Suppressed=None)
+
+
+# state and national FBAs, and a state FBA to attribute national data to
+# states, with activities as NAICS_2012_Code
+SYNTHETIC_FBAS = {
+    'Synth_State_2015': synthetic_fba('Synth_State', [
+        ('111110', '01000', 10.0), ('221111', '06000', 20.0),
+        ('311111', '13000', 5.0), ('311111', '48000', 7.0)]),
+    'Synth_National_2015': synthetic_fba('Synth_National', [
+        ('111', '00000', 100.0), ('221', '00000', 40.0)]),
+    'Synth_Emp_2015': synthetic_fba('Synth_Emp', [
+        ('111110', '01000', 1.0), ('111120', '06000', 3.0),
+        ('111120', '48000', 4.0), ('221111', '13000', 2.0),
+        ('221112', '06000', 2.0), ('221112', '48000', 1.0)]),
+    'Synth_StateTotal_2015': synthetic_fba('Synth_StateTotal', [
+        ('111', '01000', 2.0), ('111', '06000', 30.0), ('111', '48000', 40.0),
+        ('221', '06000', 10.0), ('221', '13000', 6.0),
+        ('221', '48000', 9.0)]),
+}
+
+NAICS_FBA = {'data_format': 'FBA', 'activity_schema': 'NAICS_2012_Code'}
+
+SYNTHETIC_METHOD = {
+    'industry_spec': {'default': 'NAICS_6'},
+    'year': 2015,
+    'target_naics_year': 2012,
+    'geoscale': 'state',
+    'source_names': {
+        'Synth_State': {**NAICS_FBA, 'geoscale': 'state',
+                        'attribution_method': 'direct'},
+        'Synth_National': {
+            **NAICS_FBA, 'geoscale': 'national',
+            'attribution_method': 'proportional',
+            'attribute_on': ['SectorProducedBy'],
+            'fill_columns': 'Location',
+            'attribution_source': {'Synth_Emp': {
+                **NAICS_FBA, 'geoscale': 'state',
+                'attribution_method': 'direct'}}},
+    },
+}
+
+# state data attributed to sectors with state data, matched on Location
+STATE_PROPORTIONAL_METHOD = {
+    **SYNTHETIC_METHOD,
+    'source_names': {
+        'Synth_StateTotal': {
+            **NAICS_FBA, 'geoscale': 'state',
+            'attribution_method': 'proportional',
+            'attribute_on': ['SectorProducedBy'],
+            'attribution_source': {'Synth_Emp': {
+                **NAICS_FBA, 'geoscale': 'state',
+                'attribution_method': 'direct'}}},
+    },
+}
+
+
+@pytest.fixture
+def offline_fbs(tmp_path, monkeypatch):
+    """
+    Generate FBS methods from synthetic FBAs, without reading or writing
+    the local data store. Returns a function taking the method config (a
+    dict, defaults to SYNTHETIC_METHOD) and the FBAs by name (defaults to
+    SYNTHETIC_FBAS), returning the FBS. The keyword arguments passed to
+    metadata.write_metadata() for the last FBS are kept in the function's
+    'metadata' attribute.
+    """
+    fbas = {}
+    written = []
+    monkeypatch.setattr(esupy.processed_data_mgmt,
+                        'load_preprocessed_output',
+                        lambda meta, _: (None if meta.name_data not in fbas
+                                         else fbas[meta.name_data].copy()))
+    monkeypatch.setattr(esupy.processed_data_mgmt, 'read_source_metadata',
+                        lambda *_, **__: None)
+    monkeypatch.setattr(esupy.processed_data_mgmt, 'write_df_to_file',
+                        lambda *_, **__: None)
+    monkeypatch.setattr(metadata, 'write_metadata',
+                        lambda **kwargs: written.append(kwargs))
+    monkeypatch.setattr(flowbysector, 'reset_log_file',
+                        lambda *_, **__: None)
+
+    def generate(method_config=None, datasets=None,
+                 method='Synthetic_state_2015'):
+        fbas.clear()
+        fbas.update(SYNTHETIC_FBAS if datasets is None else datasets)
+        with open(tmp_path / f'{method}.yaml', 'w') as f:
+            # string values such as '!script_function:EIA_MECS name' are
+            # written as yaml tags
+            f.write(re.sub(r"'(![^' ]+ [^']+)'", r'\1',
+                           yaml.safe_dump(method_config or SYNTHETIC_METHOD)))
+        written.clear()
+        return flowbysector.FlowBySector.generateFlowBySector(
+            method, external_config_path=str(tmp_path),
+            download_sources_ok=False)
+
+    generate.metadata = written
+    return generate
+
+
+@pytest.fixture
+def assert_fbs_equal():
+    """
+    Compare two FBS as dfs, ignoring row order
+    """
+    def compare(left, right, **kwargs):
+        left, right = pd.DataFrame(left), pd.DataFrame(right)
+        columns = list(left.columns)
+        pd.testing.assert_frame_equal(
+            left.sort_values(columns, ignore_index=True),
+            right[columns].sort_values(columns, ignore_index=True),
+            **kwargs)
+    return compare
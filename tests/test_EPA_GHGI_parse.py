@@ -0,0 +1,212 @@
+"""
+Offline tests of the EPA_GHGI table parsing, comparing the vectorized
+string helpers with the row-wise helpers and the parsed tables with those
+of the row-wise parser
+"""
+import random
+import numpy as np
+import pandas as pd
+import pytest
+from flowsa.common import load_yaml_dict
+from flowsa.data_source_scripts import EPA_GHGI
+
+VALUES = ['1,234', '+', '5', 'NE', '2.5', '7']
+
+# synthetic tables by table family, as (rows, value columns)
+TABLES = {
+    # multiple chemicals, with subtotal and total rows
+    'EPA_GHGI_T_2_1': (
+        ['CO2', 'Fossil Fuel Combustion', 'Transportationb', 'CH4 a',
+         'Natural Gas Systems', 'N2O b', 'N2O from Product Uses',
+         'LULUCF Emissionsa', 'LULUCF Sink', 'Total Emissions',
+         'Net Emissions', 'HFCs', ' Other '], None),
+    # sub-categories of fuel by sector
+    'EPA_GHGI_T_3_7': (
+        ['Electric Power', 'Coal', 'Natural Gas', 'Industrial',
+         'Fuel Oil c ', 'Total', 'Residential', 'Wood'], None),
+    'EPA_GHGI_T_3_13': (
+        ['Gasoline', 'Passenger Carsb', 'Light-Duty Trucks', 'Jet Fuel',
+         'Total', 'Distillate Fuel Oil', 'Buses'], None),
+    # subtotal headers
+    'EPA_GHGI_T_3_45': (
+        ['Explorationb', 'Production', 'Well Completions',
+         ' Gathering and Boostingc', 'Total', 'Refining', 'Flaring b',
+         ' Processing '], None),
+    'EPA_GHGI_T_3_25b': (
+        ['Industry', 'Industrial Coking Coal', 'Transportation',
+         '  Lubricants  \u00b0', 'U.S.  Territories', 'Total', 'Other'],
+        None),
+    # gases listed above their totals
+    'EPA_GHGI_T_4_118': (
+        ['CF4', 'C2F6', 'Total PFC', 'HFC-23', 'Total HFC', 'N2O (CVD)',
+         'N2O (Other)', 'Total N2O'], None),
+    # rows as flows
+    'EPA_GHGI_T_4_63': (['CO2', 'CH4b', 'Total'], None),
+    # no activity column
+    'EPA_GHGI_T_4_16': (['Iron (Steel)', 'Cement a ', 'Lime'], None),
+    'EPA_GHGI_T_4_55': (['HFC-134a', 'Total'], None),
+    # units in the activity rows
+    'EPA_GHGI_T_A_69': (
+        ['Natural Gas (trillion)', ' Residential', ' Commercial b',
+         'Electricity (kWh)', ' Industrial', 'Motor Gasoline',
+         ' Transportation'], None),
+    # flows and units in the column headers
+    'EPA_GHGI_T_3_25': (
+        ['Industry', 'Asphalt', 'Total'],
+        ['Carbon Content (MMT  CO2)', 'Storage (MMT  CO2)',
+         'Emissions (MMT CO2 Eq.)', 'Adjusted (TBtu)']),
+    # annex energy tables
+    'EPA_GHGI_T_A_5': (
+        [' Coal', 'Natural Gas ', 'Total'],
+        ['Emissions (MMT CO2 Eq.) from Energy Use - Residential',
+         'Adjusted Consumption (TBtu) - Industrial',
+         'Adjusted Consumption (TBtu) - Commercial']),
+}
+
+KEY = ['FlowName', 'ActivityProducedBy', 'ActivityConsumedBy', 'Unit',
+       'FlowAmount']
+
+# parsed by the row-wise ghg_parse() that preceded the vectorized parsing
+EXPECTED = {
+    'EPA_GHGI_T_2_1': [
+        ('CO2', 'All activities', 'None', 'MMT CO2e', 1234.0),
+        ('CO2', 'Fossil Fuel Combustion', 'None', 'MMT CO2e', 0.0),
+        ('CO2', 'Transportationb', 'None', 'MMT CO2e', 5.0),
+        ('CO2', 'Natural Gas Systems', 'None', 'MMT CO2e', 2.5),
+        ('N2O', 'All activities', 'None', 'MMT CO2e', 7.0),
+        ('N2O', 'N2O from Product Uses', 'None', 'MMT CO2e', 1234.0),
+        ('CO2e', 'LULUCF Emissionsa', 'None', 'MMT CO2e', 0.0),
+        ('CO2e', 'LULUCF Sink', 'None', 'MMT CO2e', 5.0),
+        ('N2O', 'Other', 'None', 'MMT CO2e', 1234.0),
+    ],
+    'EPA_GHGI_T_3_7': [
+        ('CO2', 'All activities Electric Power', 'None', 'MMT CO2e', 1234.0),
+        ('CO2', 'Coal Electric Power', 'None', 'MMT CO2e', 0.0),
+        ('CO2', 'Natural Gas Electric Power', 'None', 'MMT CO2e', 5.0),
+        ('CO2', 'Fuel Oil Electric Power', 'None', 'MMT CO2e', 2.5),
+        ('CO2', 'All activities Residential', 'None', 'MMT CO2e', 1234.0),
+        ('CO2', 'All activities Wood', 'None', 'MMT CO2e', 0.0),
+    ],
+    'EPA_GHGI_T_3_13': [
+        ('CO2', 'All activities Gasoline', 'None', 'MMT CO2e', 1234.0),
+        ('CO2', 'Passenger Carsb Gasoline', 'None', 'MMT CO2e', 0.0),
+        ('CO2', 'Light-Duty Trucks Gasoline', 'None', 'MMT CO2e', 5.0),
+        ('CO2', 'All activities Distillate Fuel Oil', 'None', 'MMT CO2e', 7.0),
+        ('CO2', 'All activities Buses', 'None', 'MMT CO2e', 1234.0),
+    ],
+    'EPA_GHGI_T_3_45': [
+        ('CH4', 'Exploration', 'None', 'MMT CO2e', 1234.0),
+        ('CH4', 'Production', 'None', 'MMT CO2e', 0.0),
+        ('CH4', 'Production - Well Completions', 'None', 'MMT CO2e', 5.0),
+        ('CH4', 'Refining', 'None', 'MMT CO2e', 7.0),
+        ('CH4', 'Refining - Flaring', 'None', 'MMT CO2e', 1234.0),
+        ('CH4', 'Processing', 'None', 'MMT CO2e', 0.0),
+    ],
+    'EPA_GHGI_T_3_25b': [
+        ('CO2', 'Industry All activities', 'None', 'MMT CO2e', 1234.0),
+        ('CO2', 'Industry Industrial Coking Coal', 'None', 'MMT CO2e', 0.0),
+        ('CO2', 'Transportation All activities', 'None', 'MMT CO2e', 5.0),
+        ('CO2', 'U.S. Territories All activities', 'None', 'MMT CO2e', 2.5),
+        ('CO2', 'U.S. Territories Other', 'None', 'MMT CO2e', 1234.0),
+    ],
+    'EPA_GHGI_T_4_118': [
+        ('CF4', 'PFC', 'None', 'MMT CO2e', 1234.0),
+        ('C2F6', 'PFC', 'None', 'MMT CO2e', 0.0),
+        ('N2O', 'CVD', 'None', 'MMT CO2e', 7.0),
+        ('N2O', 'Other', 'None', 'MMT CO2e', 1234.0),
+    ],
+    'EPA_GHGI_T_4_63': [
+        ('CO2', 'Fluorochemical Production', 'None', 'MMT CO2e', 1234.0),
+        ('CH4b', 'Fluorochemical Production', 'None', 'MMT CO2e', 0.0),
+    ],
+    'EPA_GHGI_T_4_16': [
+        ('CO2', 'Iron', 'None', 'MMT CO2e', 1234.0),
+        ('CO2', 'Cement', 'None', 'MMT CO2e', 0.0),
+        ('CO2', 'Lime', 'None', 'MMT CO2e', 5.0),
+    ],
+    'EPA_GHGI_T_4_55': [
+        ('CO2e', 'HFC-134a', 'None', 'MMT CO2e', 1234.0),
+    ],
+    'EPA_GHGI_T_A_69': [
+        ('Natural Gas', 'None', 'All activities', 'trillion cubic feet',
+         1234.0),
+        ('Natural Gas', 'None', 'Residential', 'trillion cubic feet', 0.0),
+        ('Natural Gas', 'None', 'Commercial', 'trillion cubic feet', 5.0),
+        ('Natural Gas', 'None', 'Industrial', 'trillion cubic feet', 2.5),
+        ('Motor Gasoline', 'None', 'All activities', 'million gallons', 7.0),
+        ('Motor Gasoline', 'None', 'Transportation', 'million gallons',
+         1234.0),
+    ],
+    'EPA_GHGI_T_3_25': [
+        ('CO2', 'Industry All activities', 'None', 'MMT CO2e', 5.0),
+    ],
+    'EPA_GHGI_T_A_5': [
+        ('CO2', 'Coal Residential', 'None', 'MMT CO2e', 1234.0),
+        ('CO2', 'Natural Gas Residential', 'None', 'MMT CO2e', 0.0),
+        ('CO2', 'Total Residential', 'None', 'MMT CO2e', 5.0),
+        ('Coal', 'None', 'Industrial', 'TBtu', 0.0),
+        ('Natural Gas', 'None', 'Industrial', 'TBtu', 5.0),
+        ('Coal', 'None', 'Commercial', 'TBtu', 5.0),
+    ],
+}
+
+
+def synthetic_table(source_name, rows, columns=None):
+    """Table of rows with values cycling through VALUES in each column"""
+    columns = columns or ['2020', '2021']
+    df = pd.DataFrame({'Item': rows})
+    for j, column in enumerate(columns):
+        df[column] = [VALUES[(i + j) % len(VALUES)] for i in range(len(rows))]
+    df['SourceName'] = source_name
+    df['Unnamed: 3'] = np.nan
+    return df
+
+
+def random_strings(n=2000, seed=0):
+    """Random strings of name, unit and footnote fragments"""
+    rng = random.Random(seed)
+    pieces = ['Gasolineb', ' a ', 'Total', '(MMT', 'C)', ' ', '  ', 'x',
+              'CH?^{c}', '^{b}', 'Natural gas', ')a', 'f, g', 'Fuelf', '(',
+              ')', 'N2O', 'b,c', '\t', 'Land']
+    return pd.Series([''.join(rng.choice(pieces)
+                              for _ in range(rng.randint(0, 7)))
+                      for _ in range(n)])
+
+
+def test_series_strip_char():
+    """series_strip_char() matches strip_char() on each value"""
+    s = random_strings()
+    pd.testing.assert_series_equal(EPA_GHGI.series_strip_char(s),
+                                   s.apply(EPA_GHGI.strip_char))
+    assert pd.isna(EPA_GHGI.series_strip_char(
+        pd.Series(['Total', np.nan])).iloc[1])
+
+
+@pytest.mark.parametrize('default_flow_name',
+                         ['Fuel - __type__', 'plain', '__type__ and __type__'])
+@pytest.mark.parametrize('default_units', ['MMT', None])
+def test_series_separate_name_and_units(default_flow_name, default_units):
+    """series_separate_name_and_units() matches cell_get_name() and
+    cell_get_units() on each value"""
+    s = random_strings()
+    result = EPA_GHGI.series_separate_name_and_units(
+        s, default_flow_name, default_units)
+    pd.testing.assert_series_equal(
+        result['names'],
+        s.apply(lambda x: EPA_GHGI.cell_get_name(x, default_flow_name)))
+    pd.testing.assert_series_equal(
+        result['units'],
+        s.apply(lambda x: EPA_GHGI.cell_get_units(x, default_units)))
+
+
+@pytest.mark.parametrize('source_name', TABLES)
+def test_ghg_parse(source_name):
+    """Parsed synthetic tables match those of the row-wise parser"""
+    config = load_yaml_dict('EPA_GHGI', 'FBA')
+    rows, columns = TABLES[source_name]
+    df_list = EPA_GHGI.ghg_parse(
+        df_list=[synthetic_table(source_name, rows, columns)],
+        year='2020', config=config)
+    assert len(df_list) == 1
+    assert list(df_list[0][KEY].itertuples(index=False, name=None)) == \
+        EXPECTED[source_name]
@@ -4,7 +4,9 @@ Targeted comparison of FBS against remote
 import pytest
 import os
 from flowsa.settings import diffpath
-from flowsa.validation import compare_single_FBA_against_remote
+from flowsa.common import load_yaml_dict
+from flowsa.validation import compare_single_FBA_against_remote, \
+    compare_FBA_results
 
 
 @pytest.mark.skip(reason="Perform targeted test on manual trigger")
@@ -13,6 +15,16 @@ def test_fba_against_remote(source, year):
         source, year, outdir=diffpath, run_single=True)
 
 
+@pytest.mark.skip(reason="Perform targeted test on manual trigger")
+@pytest.mark.parametrize('year',
+                         load_yaml_dict('EPA_GHGI', flowbytype='FBA')['years'])
+def test_EPA_GHGI_parse_against_remote(year):
+    """Regenerate the EPA_GHGI FBA from the raw tables and confirm the
+    parsed tables match the FBA in remote"""
+    df = compare_FBA_results('EPA_GHGI', year, compare_to_remote=True)
+    assert len(df) == 0
+
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
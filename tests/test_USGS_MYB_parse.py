@@ -0,0 +1,118 @@
+"""
+Offline tests of the USGS_MYB spreadsheet extraction, comparing the tables
+parsed as specified in the FBA method yamls with those of the per-mineral
+call and parse functions
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from flowsa.common import WITHDRAWN_KEYWORD, load_yaml_dict
+from flowsa.data_source_scripts import USGS_MYB
+
+VALUES = ['--', '(3)', 'W', 12.5, np.nan, '1,000', ' -- ']
+
+# synthetic sheets T1 by case, as (source, number of columns, year, row
+# labels by row), the other rows labeled 'Total'
+SHEETS = {
+    # year columns as a list
+    'Barite': ('USGS_MYB_Barite', 11, '2014', {
+        7: 'Crude, sold or used by producers:', 8: 'Quantity', 9: 'Value',
+        10: 'Imports for consumption:3 ', 11: '  Quantity', 12: 'Exports:2',
+        13: 'Quantity ', 14: 'Value'}),
+    # year columns by number of columns in the sheet
+    'Iodine_13': ('USGS_MYB_Iodine', 13, '2015', {
+        6: 'Production', 7: 'Imports:2', 8: 'Quantity, for consumption',
+        9: ' Exports2', 10: 'Value'}),
+    'Iodine_11': ('USGS_MYB_Iodine', 11, '2017', {
+        6: 'Production', 7: 'Imports:2', 8: 'Quantity, for consumption',
+        9: ' Exports2', 10: 'Value'}),
+    # multiple tables, with descriptions
+    'Boron': ('USGS_MYB_Boron', 11, '2017', {
+        8: 'B2O3 content', 21: 'Colemanite:4', 22: 'Quantity',
+        27: 'Ulexite:4 ', 28: ' B2O3 content'}),
+    'Feldspar': ('USGS_MYB_Feldspar', 13, '2015', {
+        4: 'Exports, feldspar:4', 5: 'Quantity',
+        6: 'Imports for consumption:4', 7: 'Quantity3', 8: 'Value',
+        10: 'Production, feldspar:e, 2', 11: 'Quantity',
+        12: 'Nepheline syenite:', 13: 'Quantity', 14: 'Value',
+        15: 'Quantity3'}),
+    # values matched after stripping spaces
+    'Gallium': ('USGS_MYB_Gallium', 11, '2016', {
+        5: 'Production, primary crude', 6: 'Imports for consumption:',
+        7: ' Metal'}),
+}
+
+KEY = ['FlowName', 'Description', 'Unit', 'FlowAmount']
+
+# parsed by the usgs_{mineral}_call() and usgs_{mineral}_parse() functions
+# that preceded the extraction specified in the FBA method yamls
+EXPECTED = {
+    'Barite': [
+        ('barite production', 'barite', 'Metric Tons', '12.5'),
+        ('barite imports', 'barite', 'Metric Tons', ' -- '),
+        ('barite exports', 'barite', 'Metric Tons', '0'),
+    ],
+    'Iodine_13': [
+        ('iodine production', 'iodine', 'Metric Tons', 'nan'),
+        ('iodine imports', 'iodine', 'Metric Tons', ' -- '),
+        ('iodine exports', 'iodine', 'Metric Tons', '0'),
+    ],
+    'Iodine_11': [
+        ('iodine production', 'iodine', 'Metric Tons', '0'),
+        ('iodine imports', 'iodine', 'Metric Tons', WITHDRAWN_KEYWORD),
+        ('iodine exports', 'iodine', 'Metric Tons', '12.5'),
+    ],
+    'Boron': [
+        ('boron production', 'boron', 'Metric Tons', WITHDRAWN_KEYWORD),
+        ('boron production Colemanite', 'Colemanite', 'Metric Tons',
+         WITHDRAWN_KEYWORD),
+        ('boron production Ulexite', 'Ulexite', 'Metric Tons', '0'),
+    ],
+    'Feldspar': [
+        ('feldspar exports', 'feldspar', 'Metric Tons', ' -- '),
+        ('feldspar imports', 'feldspar', 'Metric Tons', '(3)'),
+        ('feldspar production', 'feldspar', 'Metric Tons', '1,000'),
+        ('feldspar production Nepheline syenite', 'Nepheline syenite',
+         'Metric Tons', '--'),
+        ('feldspar production Nepheline syenite', 'Nepheline syenite',
+         'Metric Tons', 'W'),
+    ],
+    'Gallium': [
+        ('gallium production', 'gallium', 'Kilograms', WITHDRAWN_KEYWORD),
+        ('gallium imports', 'gallium', 'Kilograms', '0'),
+    ],
+}
+
+
+class Response:
+    """Response of a url call, the workbook content is not read"""
+    content = b''
+
+
+def synthetic_sheet(labels, ncols, nrows=30):
+    """Sheet with the row labels in the first column, and values cycling
+    through VALUES across rows and columns"""
+    return pd.DataFrame({
+        'Title': [labels.get(i, 'Total') for i in range(nrows)],
+        **{f'Unnamed: {j}': [VALUES[(i + j) % len(VALUES)]
+                             for i in range(nrows)]
+           for j in range(1, ncols)}})
+
+
+@pytest.mark.parametrize('case', SHEETS)
+def test_usgs_myb_parse(case, monkeypatch):
+    """Parsed synthetic sheets match those of the per-mineral functions"""
+    source, ncols, year, labels = SHEETS[case]
+    sheet = synthetic_sheet(labels, ncols)
+    monkeypatch.setattr(pd.io.excel, 'read_excel',
+                        lambda _, sheet_name, **__: {
+                            name: sheet.copy() for name in sheet_name})
+    config = load_yaml_dict(source, 'FBA')
+    df = USGS_MYB.usgs_myb_parse(
+        df_list=[USGS_MYB.usgs_myb_call(resp=Response, year=year,
+                                        config=config)],
+        source=source, year=year, config=config)
+    pd.testing.assert_frame_equal(
+        df[KEY], pd.DataFrame(EXPECTED[case], columns=KEY))
+    assert (df['Location'] == '00000').all()
+    assert (df['Year'] == year).all()
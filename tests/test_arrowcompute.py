@@ -0,0 +1,70 @@
+"""
+Tests of the arrow kernels against the equivalent pandas operations, see
+flowsa/arrowcompute.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from flowsa import arrowcompute
+
+pytest.importorskip('pyarrow')
+
+DATA = pd.DataFrame({
+    'Sector': ['111', None, '221', '111', None, '221', '311'],
+    'Location': ['01000', '06000', None, '01000', '06000', '13000', None],
+    'Year': np.array([2015, 2015, 2016, 2015, 2015, 2016, 2016],
+                     dtype='int64'),
+    'FlowAmount': [1.0, 2.0, 3.0, np.nan, 5.0, 6.0, np.nan],
+    'Count': np.array([1, 2, 3, 4, 5, 6, 7], dtype='int64'),
+})
+
+RIGHT = pd.DataFrame({
+    'Sector': ['111', None, '221', '111', '999'],
+    'Location': ['01000', '06000', None, '01000', '01000'],
+    'Year': np.array([2015, 2015, 2016, 2015, 2015], dtype='int64'),
+    'Rate': [0.5, 1.5, 2.5, 3.5, 4.5],
+})
+
+
+@pytest.mark.parametrize('by', [['Sector', 'Location'], ['Year'],
+                                ['Sector', 'Year']])
+@pytest.mark.parametrize('dropna', [False, True])
+def test_group_sum(by, dropna):
+    """group_sum() equals a pandas groupby sum, with null string keys and
+    int columns"""
+    columns = ['FlowAmount', 'Count']
+    pd.testing.assert_frame_equal(
+        arrowcompute.group_sum(DATA, by, columns, dropna=dropna),
+        DATA.groupby(by, dropna=dropna)[columns].agg('sum').reset_index())
+
+
+@pytest.mark.parametrize('on', [['Sector', 'Location'], ['Year'],
+                                ['Sector', 'Location', 'Year']])
+def test_merge_left(on):
+    """merge_left() equals a pandas left merge in values and row order,
+    with null string keys matching null keys"""
+    left = DATA[[*on, 'FlowAmount']]
+    right = RIGHT[[*on, 'Rate']]
+    merged = arrowcompute.merge_left(left, right, on)
+    pd.testing.assert_frame_equal(merged,
+                                  left.merge(right, how='left', on=on))
+    # null keys are restored from the NULL_KEY sentinel
+    assert not merged.isin([arrowcompute.NULL_KEY]).any().any()
+
+
+def test_unsupported():
+    """Empty data, joins sharing non-key columns and joins with null
+    non-string keys are left to pandas"""
+    empty = DATA.iloc[:0]
+    assert arrowcompute.group_sum(empty, ['Sector'], ['FlowAmount']) is None
+    assert arrowcompute.merge_left(empty[['Sector', 'FlowAmount']],
+                                   RIGHT[['Sector', 'Rate']],
+                                   ['Sector']) is None
+    assert arrowcompute.merge_left(DATA[['Sector', 'FlowAmount']],
+                                   RIGHT[['Sector', 'Rate']].iloc[:0],
+                                   ['Sector']) is None
+    assert arrowcompute.merge_left(DATA, RIGHT, ['Sector']) is None
+    assert arrowcompute.merge_left(
+        DATA[['Year', 'FlowAmount']].assign(
+            Year=DATA['Year'].where(DATA['Sector'].notna())),
+        RIGHT[['Year', 'Rate']], ['Year']) is None
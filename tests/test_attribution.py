@@ -0,0 +1,159 @@
+"""
+Offline tests of attribution, see flowsa/attribution.py
+"""
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from conftest import SYNTHETIC_FBAS, STATE_PROPORTIONAL_METHOD, synthetic_fba
+from flowsa import attribution, metadata, sharding
+from flowsa.flowby import _FlowBy
+
+# before offline_fbs replaces it
+write_metadata = metadata.write_metadata
+
+STATE_TOTAL = STATE_PROPORTIONAL_METHOD['source_names']['Synth_StateTotal']
+
+DATASETS = {
+    **SYNTHETIC_FBAS,
+    'Synth_Rate_2015': synthetic_fba(
+        'Synth_Rate', SYNTHETIC_FBAS['Synth_StateTotal_2015'][
+            ['ActivityProducedBy', 'Location', 'FlowAmount']].values.tolist(),
+        unit='kg/p'),
+}
+
+# attribution steps by method, each attributing Synth_StateTotal (or
+# Synth_Rate) with Synth_Emp
+STEPS = {
+    'proportional': ('proportionally_attribute', 'Synth_StateTotal', {
+        k: v for k, v in STATE_TOTAL.items() if k != 'attribute_on'}),
+    'proportional_attribute_on': ('proportionally_attribute',
+                                  'Synth_StateTotal', STATE_TOTAL),
+    'multiplication': ('multiplication_attribution', 'Synth_Rate', {
+        **STATE_TOTAL, 'attribution_method': 'multiplication',
+        'attribute_on': None}),
+    'division': ('division_attribution', 'Synth_StateTotal', {
+        **STATE_TOTAL, 'attribution_method': 'division',
+        'attribute_on': None}),
+}
+
+
+@pytest.mark.skipif(attribution.sparse is None,
+                    reason='scipy is required for the sparse backend')
+@pytest.mark.parametrize('integer_location', [False, True])
+@pytest.mark.parametrize('step', STEPS)
+def test_attribution_backends(step, integer_location, offline_fbs,
+                              assert_fbs_equal, monkeypatch):
+    """The sparse backend attributes as the merge backend does, with the
+    same columns and dtypes"""
+    function, source, config = STEPS[step]
+    config = {k: v for k, v in config.items() if v is not None}
+    attributed = []
+    attribute = getattr(_FlowBy, function)
+
+    def record(self, other):
+        result = attribute(self, other)
+        attributed.append(pd.DataFrame(result))
+        return result
+
+    monkeypatch.setattr(_FlowBy, function, record)
+
+    fbs = {}
+    for backend in ['merge', 'sparse']:
+        fbs[backend] = offline_fbs(
+            {**STATE_PROPORTIONAL_METHOD, 'integer_location': integer_location,
+             'source_names': {source: {
+                **config, 'attribution_backend': backend}}},
+            DATASETS)
+    merged, sparse = attributed
+    assert len(merged) > 0
+    pd.testing.assert_frame_equal(merged, sparse)
+    assert_fbs_equal(fbs['merge'], fbs['sparse'])
+
+
+@pytest.mark.parametrize('left_on', [['PrimarySector', 'Location'],
+                                     ['SecondarySector', 'Location']])
+@pytest.mark.parametrize('matched', [[0, 1, 2], [2, 0, -1]])
+def test_take_other(left_on, matched):
+    """take_other() gives the columns and dtypes of a left merge"""
+    fb = pd.DataFrame({'PrimarySector': ['111', '221', '311'],
+                       'SecondarySector': ['111', '221', '311'],
+                       'Location': pd.array([1000, 6000, 0], dtype='int32'),
+                       'FlowAmount': [1.0, 2.0, 3.0],
+                       'Unit': ['p', 'p', 'p']})
+    other = pd.DataFrame({
+        'PrimarySector': ['111', '221', '311'],
+        'Location': pd.array([1000, 6000, 0], dtype='int32'),
+        'FlowAmount': [4.0, 5.0, 6.0], 'Unit': ['kg', 'kg', 'kg'],
+        'Count': pd.array([1, 2, 3], dtype='int64'),
+        'Flag': [True, False, True]}).iloc[
+        [i for i in matched if i >= 0]].reset_index(drop=True)
+    right_on = ['PrimarySector', 'Location']
+    index = attribution.match_keys(fb[left_on], other[right_on])
+    merged = (fb.merge(other, how='left', left_on=left_on, right_on=right_on,
+                       suffixes=[None, '_other'])
+              .fillna({'FlowAmount_other': 0}))
+    pd.testing.assert_frame_equal(
+        fb.assign(**attribution.take_other(fb, other, index, left_on,
+                                           right_on)),
+        merged)
+
+
+@pytest.mark.parametrize('partitioning', [
+    {'attribution_partitions': 'state'},
+    {'attribution_partitions': 2, 'attribution_workers': 3},
+    {'attribution_memory_budget': 0.001},
+    {'attribution_memory_budget': 0.001, 'attribution_workers': 2},
+])
+def test_location_partitions(partitioning, offline_fbs, assert_fbs_equal,
+                             monkeypatch):
+    """Proportional attribution in location partitions, in threads and in
+    batches within a memory budget, equals unpartitioned attribution"""
+    partitions = []
+    attribute_partition = _FlowBy._proportionally_attribute_partition
+
+    def record(self, fb, other, other_geoscale):
+        partitions.append(sorted(set(fb['Location'])))
+        return attribute_partition(self, fb, other, other_geoscale)
+
+    monkeypatch.setattr(_FlowBy, '_proportionally_attribute_partition',
+                        record)
+    fbs = offline_fbs(STATE_PROPORTIONAL_METHOD)
+    assert len(partitions) == 1
+    partitions.clear()
+    assert_fbs_equal(fbs, offline_fbs(
+        {**STATE_PROPORTIONAL_METHOD, 'source_names': {'Synth_StateTotal': {
+            **STATE_TOTAL, **partitioning}}}))
+    # each partition is attributed once, the states of all partitions
+    # together once
+    assert len(partitions) > 1
+    states = [s for p in partitions for s in p]
+    assert sorted(states) == ['01000', '06000', '13000', '48000']
+
+
+@pytest.mark.parametrize('sharded', [False, True])
+def test_diagnostics_in_metadata(sharded, offline_fbs, monkeypatch):
+    """Attribution steps losing flow are reported in the FBS metadata"""
+    written = []
+    monkeypatch.setattr(metadata, 'write_metadata_to_file',
+                        lambda _, fb_meta: written.append(fb_meta))
+    monkeypatch.setattr(metadata, 'return_fb_meta_data',
+                        lambda *_, **__: {})
+    monkeypatch.setattr(sharding, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    # 311 has no employment to attribute to
+    datasets = {**DATASETS, 'Synth_StateTotal_2015': pd.concat(
+        [DATASETS['Synth_StateTotal_2015'],
+         synthetic_fba('Synth_StateTotal', [('311', '06000', 5.0)])],
+        ignore_index=True)}
+    method = {**STATE_PROPORTIONAL_METHOD,
+              **({'shard_by_state': True, 'shard_count': 2}
+                 if sharded else {})}
+    offline_fbs(method, datasets)
+    write_metadata(**offline_fbs.metadata[-1])
+
+    diagnostics = pd.DataFrame(
+        written[-1].tool_meta['attribution_diagnostics'])
+    step = diagnostics.query('FullName == "Synth_StateTotal"')
+    assert step['InputTotal'].sum() == pytest.approx(102.0)
+    assert step['AttributedTotal'].sum() == pytest.approx(97.0)
+    assert step['UnattributableRows'].sum() > 0
+    assert (step['PercentChange'] < 0).any()
@@ -0,0 +1,102 @@
+"""
+Offline tests of the batch FBA generation, see flowsa/backfill.py
+"""
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from flowsa import backfill, generateflowbyactivity
+
+
+@pytest.fixture
+def generated(tmp_path, monkeypatch):
+    """Run jobs in threads with a stubbed generateflowbyactivity.main()
+    that saves an empty parquet per year, except for the 'Empty' source.
+    Yields the jobs run and the largest number running at once by
+    source."""
+    calls = []
+    running = Counter()
+    most = Counter()
+    lock = threading.Lock()
+
+    def main(source, year):
+        with lock:
+            calls.append(backfill.job_name(source, year))
+            running[source] += 1
+            most[source] = max(most[source], running[source])
+        time.sleep(0.05)
+        if source != 'Empty':
+            for y in backfill.job_years(year):
+                (tmp_path / f'{source}_{y}_v1.0.0.parquet').write_bytes(b'')
+        with lock:
+            running[source] -= 1
+
+    monkeypatch.setattr(backfill, 'fbaoutputpath', tmp_path)
+    monkeypatch.setattr(backfill, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(generateflowbyactivity, 'main', main)
+    yield calls, most
+
+
+def test_backfill_resumes_from_manifest(generated, tmp_path):
+    """Jobs complete in the manifest are skipped, failed and empty jobs
+    are rerun"""
+    calls, _ = generated
+    manifest_path = tmp_path / 'manifest.json'
+    backfill.write_manifest(
+        {'A_2020': {'Status': 'complete'}, 'A_2021': {'Status': 'failed'}},
+        manifest_path)
+    jobs = [{'source': 'A', 'year': '2020'},
+            {'source': 'A', 'year': '2021'},
+            {'source': 'Empty', 'year': '2020'},
+            {'source': 'B', 'year': '2018-2019'}]
+
+    manifest = backfill.run_backfill(jobs, manifest_path, workers=2)
+    assert sorted(calls) == ['A_2021', 'B_2018-2019', 'Empty_2020']
+    assert manifest['A_2021']['Status'] == 'complete'
+    assert manifest['B_2018-2019']['Outputs'] == [
+        'B_2018_v1.0.0.parquet', 'B_2019_v1.0.0.parquet']
+    assert manifest['Empty_2020']['Status'] == 'empty'
+    assert backfill.read_manifest(manifest_path) == manifest
+
+    calls.clear()
+    backfill.run_backfill(jobs, manifest_path, workers=2)
+    assert calls == ['Empty_2020']
+
+    calls.clear()
+    backfill.run_backfill(jobs, manifest_path, workers=2, rerun=True)
+    assert len(calls) == len(jobs)
+
+
+def test_backfill_source_limits(generated, tmp_path):
+    """Jobs of a source run at most source_limit at once"""
+    calls, most = generated
+    jobs = [{'source': s, 'year': str(y)}
+            for s in ['A', 'B', 'C'] for y in range(2015, 2021)]
+    backfill.run_backfill(jobs, tmp_path / 'manifest.json', workers=6,
+                          source_limit=1, source_limits={'B': 3})
+    assert len(calls) == len(jobs)
+    assert most['A'] == 1
+    assert most['C'] == 1
+    assert 1 <= most['B'] <= 3
+
+
+def test_local_outputs(tmp_path, monkeypatch):
+    """FBAs are assigned to the longest source their name starts with, so
+    jobs do not count the outputs of sources sharing their prefix"""
+    monkeypatch.setattr(backfill, 'fbaoutputpath', tmp_path)
+    for name in ['USDA_CoA_Cropland_2017', 'USDA_CoA_Cropland_NAICS_2017',
+                 'EPA_GHGI_T_2_1_2020', 'EPA_GHGI_T_3_2_2020',
+                 'EPA_GHGIX_2020']:
+        (tmp_path / f'{name}_v1.0.0.parquet').write_bytes(b'0' * 10)
+    assert [f.name for f in backfill.local_outputs(
+        'USDA_CoA_Cropland', '2017')] == [
+        'USDA_CoA_Cropland_2017_v1.0.0.parquet']
+    assert [f.name for f in backfill.local_outputs(
+        'USDA_CoA_Cropland_NAICS', '2017')] == [
+        'USDA_CoA_Cropland_NAICS_2017_v1.0.0.parquet']
+    assert [f.name for f in backfill.local_outputs('EPA_GHGI', '2020')] == [
+        'EPA_GHGI_T_2_1_2020_v1.0.0.parquet',
+        'EPA_GHGI_T_3_2_2020_v1.0.0.parquet']
+    assert backfill.job_size({'source': 'USDA_CoA_Cropland', 'year': '2017'},
+                             {}) == 10
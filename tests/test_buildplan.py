@@ -0,0 +1,94 @@
+"""
+Offline tests of the generation of several FBS methods together, see
+flowsa/buildplan.py
+"""
+import esupy.processed_data_mgmt
+import pandas as pd
+import pytest
+from flowsa import buildplan
+from flowsa.flowbyactivity import FlowByActivity
+from flowsa.flowbysector import FlowBySector
+
+CATALOG = {'BLS_QCEW': 'FBA', 'USDA': 'FBA', 'Employment': 'FBS',
+           'Water': 'FBS', 'Land': 'FBS', 'Total': 'FBS'}
+
+METHODS = {
+    'Employment': {'year': 2017, 'source_names': {'BLS_QCEW': {}}},
+    'Water': {'year': 2017, 'source_names': {'USDA': {'activity_sets': {
+        'a': {'attribution_source': {'Employment': {}}},
+        'b': {'attribution_source': {'Employment': {}}}}}}},
+    'Land': {'year': 2017, 'source_names': {
+        'USDA': {'attribution_source': 'Employment'},
+        'BLS_QCEW': {'year': 2016}}},
+    'Total': {'source_names': {'Water': {}, 'Land': {}}},
+}
+
+
+def key(category, name):
+    """Node key of a dataset in flowsa"""
+    return category, name, None
+
+
+@pytest.fixture
+def plan(monkeypatch):
+    """Build plan of the Total method with stubbed method yamls"""
+    monkeypatch.setattr(buildplan, 'load_yaml_dict',
+                        lambda method, *_: METHODS[method])
+    monkeypatch.setattr(buildplan, 'get_catalog_info',
+                        lambda name: {'data_format': CATALOG.get(name)})
+    return buildplan.build_plan(['Total'])
+
+
+def test_build_plan(plan):
+    """Each dataset is a single node, whichever methods reference it"""
+    usda = key('FlowByActivity', 'USDA_2017')
+    employment = key('FlowBySector', 'Employment')
+    assert set(plan) == {
+        usda, employment, key('FlowByActivity', 'BLS_QCEW_2017'),
+        key('FlowByActivity', 'BLS_QCEW_2016'), key('FlowBySector', 'Water'),
+        key('FlowBySector', 'Land'), key('FlowBySector', 'Total')}
+    assert plan[key('FlowBySector', 'Water')]['upstream'] == {
+        usda: 1, employment: 2}
+    assert plan[usda]['consumers'] == {key('FlowBySector', 'Water'),
+                                       key('FlowBySector', 'Land')}
+    assert [k for k, v in plan.items() if v['requested']] == [
+        key('FlowBySector', 'Total')]
+    order = buildplan.plan_order(plan)
+    assert order.index(employment) < order.index(key('FlowBySector', 'Land'))
+    assert order[-1] == key('FlowBySector', 'Total')
+
+
+def test_run_plan(plan, monkeypatch):
+    """Datasets shared by several consumers are loaded once, and released
+    after their last consumer is generated"""
+    calls = []
+
+    def generate(method, *_):
+        calls.append(('generate', method, sorted(
+            k[1] for k in buildplan._shared)))
+        return pd.DataFrame({'FlowAmount': [1.0]})
+
+    def load(*_, full_name, **__):
+        calls.append(('load', full_name))
+        return pd.DataFrame({'FlowAmount': [1.0]})
+
+    monkeypatch.setattr(FlowBySector, 'generateFlowBySector',
+                        staticmethod(generate))
+    monkeypatch.setattr(FlowByActivity, 'return_FBA', staticmethod(load))
+    monkeypatch.setattr(esupy.processed_data_mgmt, 'read_source_metadata',
+                        lambda *_: None)
+
+    assert buildplan.run_plan(plan)[-1] == 'Total'
+    assert calls.count(('load', 'USDA')) == 1
+    generated = {call[1]: call[2] for call in calls
+                 if call[0] == 'generate'}
+    assert sorted(generated) == ['Employment', 'Land', 'Total', 'Water']
+    assert {'Employment', 'USDA_2017'} <= set(generated['Land'])
+    # USDA and Employment are released once Water and Land are generated
+    assert calls[-1] == ('generate', 'Total', ['Land', 'Water'])
+    assert buildplan._shared == {}
+
+    calls.clear()
+    buildplan.run_plan(plan, share='store')
+    assert ('load', 'USDA') not in calls
+    assert all(shared == [] for *_, shared in calls)
@@ -0,0 +1,35 @@
+"""
+Tests of FBS generation under pandas copy-on-write, see
+flowby.copy_on_write()
+"""
+import pandas as pd
+import pytest
+from flowsa import settings
+from flowsa.flowby import copy_on_write_available, copy_on_write_enabled, \
+    copy_on_write_suspended
+
+
+@pytest.mark.skipif(not copy_on_write_available(),
+                    reason='pandas has no copy-on-write mode')
+def test_fbs_equal_with_copy_on_write(offline_fbs, assert_fbs_equal,
+                                      monkeypatch):
+    """FBS output is the same with and without copy-on-write"""
+    monkeypatch.setattr(settings, 'COPY_ON_WRITE', False)
+    expected = offline_fbs()
+    monkeypatch.setattr(settings, 'COPY_ON_WRITE', True)
+    assert_fbs_equal(offline_fbs(), expected)
+
+
+@pytest.mark.skipif(not copy_on_write_available(),
+                    reason='pandas has no copy-on-write mode')
+def test_copy_on_write_suspended():
+    """Chained assignment works while copy-on-write is suspended, as in
+    FBAs generated within FBS generation"""
+    with pd.option_context('mode.copy_on_write', True):
+        with copy_on_write_suspended():
+            assert not copy_on_write_enabled()
+            df = pd.DataFrame({'a': ['x', 'y']})
+            with pd.option_context('mode.chained_assignment', None):
+                df['a'].iloc[-1] = 'z'
+            assert df['a'].tolist() == ['x', 'z']
+        assert copy_on_write_enabled()
@@ -0,0 +1,140 @@
+"""
+Offline tests of the input tracking and rebuilding of stale datasets, see
+flowsa/dependencies.py
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import esupy.processed_data_mgmt
+import flowsa.common
+from flowsa import backfill, dependencies
+
+
+def meta(output_hash, **inputs):
+    """Metadata of a dataset with the recorded inputs"""
+    return {'tool_meta': {'output_hash': output_hash,
+                          'dependencies': inputs}}
+
+
+def test_changed_inputs(tmp_path):
+    """Changed files and upstream datasets are reported, upstream datasets
+    with unknown hashes are not"""
+    crosswalk = tmp_path / 'crosswalk.csv'
+    crosswalk.write_text('a,b\n')
+    method = tmp_path / 'method.yaml'
+    method.write_text('year: 2020\n')
+    with dependencies.tracking() as inputs:
+        dependencies.record_file('crosswalks', crosswalk)
+        dependencies.record_file('yaml', method)
+        dependencies.record_dataset('FlowByActivity', 'A_2020', 'a1')
+        dependencies.record_dataset('FlowByActivity', 'B_2020', 'b1')
+        dependencies.record_dataset('FlowBySector', 'C', 'c1')
+    recorded = meta('x', **inputs)
+    output_hashes = {('FlowByActivity', 'A_2020'): 'a1',
+                     ('FlowByActivity', 'B_2020'): 'b2'}
+    assert dependencies.changed_inputs(recorded, output_hashes) == [
+        'B_2020']
+
+    crosswalk.write_text('a,b\n1,2\n')
+    assert dependencies.changed_inputs(recorded, output_hashes) == [
+        dependencies.file_key(crosswalk), 'B_2020']
+
+
+def test_tracking_in_threads():
+    """Scopes opened in threads at once record only their own inputs, and
+    functions wrapped with in_context() record in the caller's scope"""
+    barrier = threading.Barrier(4)
+
+    def generate(name):
+        with dependencies.tracking() as inputs:
+            barrier.wait()
+            dependencies.record_dataset('FlowByActivity', name, name)
+            with dependencies.tracking():
+                barrier.wait()
+                dependencies.record_dataset('FlowByActivity', 'inner', name)
+            barrier.wait()
+        return inputs
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        scopes = list(executor.map(generate, 'abcd'))
+    assert scopes == [{'FlowByActivity': {name: name}} for name in 'abcd']
+
+    with dependencies.tracking() as inputs:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(dependencies.in_context(
+                lambda name: dependencies.record_dataset(
+                    'FlowBySector', name, name)), 'ab'))
+    assert inputs == {'FlowBySector': {'a': 'a', 'b': 'b'}}
+    assert dependencies.current() == {}
+
+
+def test_local_fba_names(tmp_path, monkeypatch):
+    """FBAs saved under table names are assigned to the longest matching
+    source"""
+    monkeypatch.setattr(backfill, 'fbaoutputpath', tmp_path)
+    monkeypatch.setattr(
+        flowsa.common, 'seeAvailableFlowByModels',
+        lambda *_, **__: {'GHG': [2020], 'GHG_T': [2020], 'Other': [2019]})
+    for name in ['GHG_T_2_1_2020', 'GHG_Annex_2020', 'Other_2019',
+                 'Other_2018']:
+        (tmp_path / f'{name}_v1.0.0.parquet').write_bytes(b'')
+    assert dependencies.local_fba_names() == {
+        'GHG_T_2_1_2020': ('GHG_T', '2020'),
+        'GHG_Annex_2020': ('GHG', '2020'),
+        'Other_2019': ('Other', '2019')}
+
+
+def test_rebuild_stale(tmp_path, monkeypatch):
+    """Stale datasets are regenerated once, upstream datasets first, and
+    downstream datasets are rebuilt when their upstream datasets change"""
+    method = tmp_path / 'method.yaml'
+    method.write_text('year: 2020\n')
+    with dependencies.tracking() as inputs:
+        dependencies.record_file('yaml', method)
+    fba = {'source': 'GHG', 'year': '2020'}
+    datasets = {
+        ('FlowBySector', 'Top'): (
+            meta('t0', FlowBySector={'Middle': 'm0'}), {'method': 'Top'}),
+        ('FlowBySector', 'Middle'): (
+            meta('m0', FlowByActivity={'GHG_T_1_2020': 'g0'}),
+            {'method': 'Middle'}),
+        ('FlowByActivity', 'GHG_T_1_2020'): (meta('g0', **inputs), fba),
+        ('FlowByActivity', 'GHG_T_2_2020'): (meta('g0', **inputs), fba),
+        ('FlowBySector', 'Unchanged'): (
+            meta('u0', FlowByActivity={'GHG_T_2_2020': 'g0'}),
+            {'method': 'Unchanged'}),
+        ('FlowBySector', 'Untracked'): ({}, {'method': 'Untracked'}),
+    }
+    saved = {name: m for (_, name), (m, _) in datasets.items()}
+    regenerated = []
+
+    def regenerate(category, kwargs):
+        regenerated.append((category, kwargs))
+        if category == 'FlowByActivity':
+            saved['GHG_T_1_2020'] = meta('g1', **inputs)
+        else:
+            saved[kwargs['method']] = meta(f'{kwargs["method"]}1')
+
+    monkeypatch.setattr(dependencies, 'local_datasets', lambda: datasets)
+    monkeypatch.setattr(dependencies, 'regenerate', regenerate)
+    monkeypatch.setattr(esupy.processed_data_mgmt, 'read_source_metadata',
+                        lambda _, fb_meta: saved.get(fb_meta.name_data))
+
+    method.write_text('year: 2021\n')
+    assert dependencies.rebuild_stale(dry_run=True) == [
+        ('FlowByActivity', 'GHG_T_1_2020'),
+        ('FlowByActivity', 'GHG_T_2_2020')]
+    assert regenerated == []
+
+    stale = dependencies.rebuild_stale()
+    assert set(stale) == {('FlowByActivity', 'GHG_T_1_2020'),
+                          ('FlowByActivity', 'GHG_T_2_2020'),
+                          ('FlowBySector', 'Middle'),
+                          ('FlowBySector', 'Top')}
+    assert regenerated == [('FlowByActivity', fba),
+                           ('FlowBySector', {'method': 'Middle'}),
+                           ('FlowBySector', {'method': 'Top'})]
+
+    regenerated.clear()
+    dependencies.rebuild_stale(include_untracked=True)
+    assert ('FlowBySector', {'method': 'Untracked'}) in regenerated
+    assert ('FlowBySector', {'method': 'Unchanged'}) not in regenerated
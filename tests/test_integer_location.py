@@ -0,0 +1,41 @@
+"""
+Offline tests of FBS generation with integer-encoded Locations, see
+flowby.encode_location()
+"""
+from conftest import (NAICS_FBA, SYNTHETIC_FBAS, SYNTHETIC_METHOD,
+                      synthetic_fba)
+
+# a Census region source attributed to states by a clean function that
+# merges on 5 digit FIPS, loading a source with FIPS Locations
+METHOD = {
+    **SYNTHETIC_METHOD,
+    'source_names': {
+        **SYNTHETIC_METHOD['source_names'],
+        'Synth_Region': {
+            **NAICS_FBA, 'geoscale': 'state',
+            'attribution_method': 'direct',
+            'clean_fba_after_attribution':
+                '!script_function:EIA_MECS update_regions_to_states',
+            'clean_source': {'Synth_Emp': {
+                **NAICS_FBA, 'geoscale': 'state',
+                'attribution_method': 'direct'}}},
+    },
+}
+
+DATASETS = {
+    **SYNTHETIC_FBAS,
+    'Synth_Region_2015': synthetic_fba(
+        'Synth_Region', [('111110', '3', 8.0), ('221111', '4', 6.0)],
+        activity_col='ActivityConsumedBy', location_system='Census_Region'),
+}
+
+
+def test_integer_location(offline_fbs, assert_fbs_equal):
+    """FBS generated with integer-encoded Locations equal FBS generated
+    with 5 digit FIPS, including sources cleaned with functions merging on
+    FIPS"""
+    fbs = offline_fbs(METHOD, DATASETS)
+    assert fbs['Location'].str.len().eq(5).all()
+    assert set(fbs['MetaSources']) >= {'Synth_Region', 'Synth_National'}
+    assert_fbs_equal(fbs, offline_fbs({**METHOD, 'integer_location': True},
+                                      DATASETS))
@@ -0,0 +1,56 @@
+"""
+Offline tests of the out-of-core FlowBy backend, see flowsa/outofcore.py
+"""
+import pandas as pd
+from conftest import STATE_PROPORTIONAL_METHOD
+from flowsa import outofcore
+from flowsa.flowbysector import FlowBySector
+
+
+def outofcore_config(tmp_path):
+    """Config keys running every grouped step out of core"""
+    return {'flowby_backend': 'outofcore', 'outofcore_chunk_rows': 1,
+            'outofcore_path': str(tmp_path)}
+
+
+def test_outofcore_fbs(offline_fbs, assert_fbs_equal, tmp_path,
+                       monkeypatch):
+    """Aggregation and proportional attribution out of core equal
+    in-memory execution"""
+    collected = []
+
+    def collect(results, fb, directory=None):
+        collected.append(fb.full_name)
+        return outofcore_collect(results, fb, directory)
+
+    outofcore_collect = outofcore.collect
+    monkeypatch.setattr(outofcore, 'collect', collect)
+
+    fbs = offline_fbs(STATE_PROPORTIONAL_METHOD)
+    assert collected == []
+    assert_fbs_equal(fbs, offline_fbs({**STATE_PROPORTIONAL_METHOD,
+                                       **outofcore_config(tmp_path)}))
+    # attribution of Synth_StateTotal, and aggregations
+    assert 'Synth_StateTotal' in collected
+    assert len(collected) > 1
+
+
+def test_outofcore_aggregate_flowby(offline_fbs, assert_fbs_equal,
+                                    tmp_path):
+    """aggregate_flowby() out of core equals in-memory execution, and
+    keeps all metadata"""
+    fbs = offline_fbs(STATE_PROPORTIONAL_METHOD)
+    duplicated = pd.concat([pd.DataFrame(fbs)] * 2, ignore_index=True)
+    diagnostics = pd.DataFrame({'FullName': ['Synth_StateTotal'],
+                                'PercentChange': [0.0]})
+    in_memory = FlowBySector(duplicated, full_name='Synth',
+                             config={}).aggregate_flowby()
+    out_of_core = FlowBySector(
+        duplicated, full_name='Synth', config=outofcore_config(tmp_path),
+        diagnostics=diagnostics).aggregate_flowby()
+
+    assert len(in_memory) == len(fbs)
+    assert_fbs_equal(in_memory, out_of_core)
+    assert out_of_core.full_name == 'Synth'
+    assert out_of_core.config == outofcore_config(tmp_path)
+    pd.testing.assert_frame_equal(out_of_core.diagnostics, diagnostics)
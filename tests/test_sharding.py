@@ -0,0 +1,125 @@
+"""
+Tests of the state sharding of FBS generation, see flowsa/sharding.py
+"""
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from conftest import STATE_PROPORTIONAL_METHOD, SYNTHETIC_METHOD
+from flowsa import sharding
+from flowsa.common import load_yaml_dict
+from flowsa.flowbysector import FlowBySector
+
+METHOD = {
+    'geoscale': 'state',
+    'source_names': {
+        'national': {
+            'geoscale': 'national',
+            'attribution_method': 'proportional',
+            'attribute_on': ['SectorProducedBy'],
+            'fill_columns': 'Location',
+            'attribution_source': {'state_attribution': {}}},
+        'state': {
+            'attribution_method': 'proportional',
+            'attribution_source': {'state_attribution': {}}},
+    }
+}
+
+SHARDED = {'shard_by_state': True, 'shard_workers': 2, 'shard_count': 3}
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    """Run shards in threads, which see the stubbed data store of
+    offline_fbs, and record the prepared sources of
+    FlowBySector.prepare_sources() (unsharded) and
+    sharding.prepare_sharded_sources(), and the shards prepared"""
+    prepared = {'shards': []}
+    prepare_sources = FlowBySector.prepare_sources.__func__
+    prepare_sharded_sources = sharding.prepare_sharded_sources
+    prepare_shard = sharding.prepare_shard
+
+    def record_sources(cls, method, method_config, **kwargs):
+        shard = method_config.get('shard')
+        fbs = prepare_sources(cls, method, method_config, **kwargs)
+        if shard is None:
+            prepared.setdefault('unsharded', pd.DataFrame(fbs))
+        return fbs
+
+    def record_sharded_sources(*args, **kwargs):
+        prepared['sharded'] = prepare_sharded_sources(*args, **kwargs)
+        return prepared['sharded']
+
+    def record_shard(method, states, source_names, **kwargs):
+        prepared['shards'].append((states, source_names))
+        return prepare_shard(method, states, source_names, **kwargs)
+
+    monkeypatch.setattr(sharding, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(FlowBySector, 'prepare_sources',
+                        classmethod(record_sources))
+    monkeypatch.setattr(sharding, 'prepare_sharded_sources',
+                        record_sharded_sources)
+    monkeypatch.setattr(sharding, 'prepare_shard', record_shard)
+    return prepared
+
+
+@pytest.mark.parametrize('method', [SYNTHETIC_METHOD,
+                                    STATE_PROPORTIONAL_METHOD],
+                         ids=['national', 'state'])
+def test_sharded_sources_match_unsharded(method, recorded, offline_fbs,
+                                         assert_fbs_equal):
+    """Sources prepared by shard, with barrier sources unsharded, equal the
+    sources prepared unsharded, as does the FBS"""
+    fbs = offline_fbs(method)
+    unsharded = recorded.pop('unsharded')
+    sharded_fbs = offline_fbs({**method, **SHARDED})
+    assert_fbs_equal(unsharded, recorded['sharded'])
+    assert_fbs_equal(fbs, sharded_fbs)
+
+    shards = [states for states, _ in recorded['shards']
+              if states is not None]
+    assert len(shards) == 3
+    assert sorted(s for states in shards for s in states) == sorted(
+        sharding.state_shards(1)[0])
+    sharded_sources = {name for _, names in recorded['shards']
+                       for name in names}
+    assert sharded_sources == set(method['source_names'])
+
+
+def test_barriers_conserve_national_totals(recorded, offline_fbs,
+                                           monkeypatch):
+    """National sources attributed to states in each shard would be
+    counted once per shard, so they are prepared unsharded"""
+    total = offline_fbs(SYNTHETIC_METHOD)['FlowAmount'].sum()
+    assert [names for states, names in recorded['shards']] == []
+    assert offline_fbs({**SYNTHETIC_METHOD, **SHARDED})[
+        'FlowAmount'].sum() == pytest.approx(total)
+    assert (None, ['Synth_National']) in recorded['shards']
+
+    # shards of the states with data
+    monkeypatch.setattr(sharding, 'state_shards', lambda _: [
+        ['01000', '06000'], ['13000', '48000']])
+    monkeypatch.setattr(sharding, 'barrier_sources', lambda _: [])
+    assert offline_fbs({**SYNTHETIC_METHOD, **SHARDED})[
+        'FlowAmount'].sum() > total
+
+
+def test_barrier_sources():
+    """Only sources using national data, barrier functions or barrier
+    cached sources are prepared unsharded"""
+    assert sharding.barrier_sources(METHOD) == ['national']
+    method_config = {
+        'sources_to_cache': {'national_cache': {'geoscale': 'national'},
+                             'state_cache': {'geoscale': 'state'}},
+        'source_names': {
+            'a': {'attribution_source': {'national_cache': {}}},
+            'b': {'attribution_source': {'state_cache': {}}},
+            'c': {'geoscale': 'state'},
+        }}
+    assert sharding.barrier_sources(method_config) == ['a']
+
+
+def test_national_to_state_methods_are_barriers():
+    """National sources attributed to states are prepared unsharded"""
+    method_config = load_yaml_dict('Employment_state_2017', 'FBS')
+    assert sharding.barrier_sources(method_config) == [
+        'Employment_national_2017']